@@ -0,0 +1,118 @@
+"""Tracking which answers of an .anx file the converter used, for the -v report.
+
+- `Coverage_Tracker` records the names of the answers `ANX_Parser` hands out, and which section of `Knackly_Writer.create()` read each one.
+- `Exclusions` compiles the answer names passed to -e/--exclude once, so checking an answer against them doesn't scan a list.
+- `Batch_Coverage` adds up the coverage of many files, for -v in batch mode.
+"""
+
+import fnmatch
+import re
+from collections import Counter
+from collections.abc import Iterable
+
+GLOB_PREFIX = "glob:"
+REGEX_PREFIX = "re:"
+
+
+class Exclusions:
+    """A set of answer names to leave out of the -v report, compiled once.
+
+    Each pattern is one of:
+        - an answer name, matched exactly, even if it contains `*`, `?` or `[` (HotDocs names such as "Borrower [1] Name TE" do)
+        - a glob pattern prefixed with `glob:`, for example `"glob:Unused * TE"`
+        - a regular expression prefixed with `re:`, for example `"re:^Vesting .* MC$"`, matched against the whole name
+    """
+
+    def __init__(self, patterns: Iterable[str] = None) -> None:
+        """Compile the patterns.
+
+        Raises:
+            ValueError: If a `re:` pattern isn't a valid regular expression.
+        """
+        self.names = set()
+        expressions = []
+        for pattern in patterns or ():
+            if pattern.startswith(REGEX_PREFIX):
+                expression = pattern[len(REGEX_PREFIX) :]
+                try:
+                    re.compile(expression)
+                except re.error as e:
+                    raise ValueError(f"Invalid regular expression '{pattern}': {e}") from e
+                expressions.append(f"(?:{expression})")
+            elif pattern.startswith(GLOB_PREFIX):
+                expressions.append(fnmatch.translate(pattern[len(GLOB_PREFIX) :]))
+            else:
+                self.names.add(pattern)
+        # Every pattern is folded into a single regular expression, so matching a name is one call however many patterns there are
+        self.expression = re.compile("|".join(expressions)) if expressions else None
+
+    def __contains__(self, name: str) -> bool:
+        if name in self.names:
+            return True
+        return self.expression is not None and name is not None and self.expression.fullmatch(name) is not None
+
+    def __bool__(self) -> bool:
+        return bool(self.names) or self.expression is not None
+
+
+class Coverage_Tracker:
+    """Records which answers were used, and by which section of the writer.
+
+    `Knackly_Writer.section()` sets `section` while each section runs. Answers used outside of a section are attributed to None.
+    """
+
+    def __init__(self) -> None:
+        self.touched = {}  # answer name -> set of the sections that read it
+        self.section = None
+
+    def touch(self, name: str) -> None:
+        """Record that the answer `name` was used by the current section."""
+        sections = self.touched.get(name)
+        if sections is None:
+            self.touched[name] = {self.section}
+        else:
+            sections.add(self.section)
+
+    def touch_many(self, names: Iterable[str]) -> None:
+        for name in names:
+            self.touch(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.touched
+
+    def by_section(self) -> dict[str, list[str]]:
+        """Get the names of the answers each section used, sorted. An answer used by several sections is listed under each of them."""
+        sections = {}
+        for name, readers in self.touched.items():
+            for section in readers:
+                sections.setdefault(section, []).append(name)
+        return {section: sorted(names) for section, names in sections.items()}
+
+
+class Batch_Coverage:
+    """Adds up the coverage of every file in a batch, from the summaries returned by `ANX_Parser.coverage_summary()`."""
+
+    def __init__(self) -> None:
+        self.files = 0
+        self.present = Counter()  # answer name -> number of files containing it
+        self.unused = Counter()  # answer name -> number of files where it wasn't used
+
+    def add(self, summary: dict[str, list[str]]) -> None:
+        self.files += 1
+        self.present.update(summary["answers"])
+        self.unused.update(summary["unused"])
+
+    def unused_answers(self, exclusions: Exclusions = None) -> list[tuple[str, int, int]]:
+        """Get every answer that went unused in at least one file.
+
+        Args:
+            exclusions (Exclusions, optional): Answers to leave out. Defaults to None.
+
+        Returns:
+            list[tuple[str, int, int]]: The name of each answer, the number of files it went unused in, and the number of files it was in.
+            The answers unused in the most files come first.
+        """
+        if exclusions is None:
+            exclusions = Exclusions()
+        unused = [(name, count, self.present[name]) for name, count in self.unused.items() if name not in exclusions]
+        return sorted(unused, key=lambda entry: (-entry[1], entry[0]))
@@ -1,41 +1,337 @@
+import copy
+import io
+import mmap
+import os
 import xml.etree.ElementTree as ET
-from datetime import datetime
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import lru_cache, wraps
+
+from answer_coverage import Coverage_Tracker, Exclusions
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # lxml is optional, the standard library's ElementTree is used without it
+    lxml_etree = None
+
+ENGINES = ("auto", "lxml", "stdlib")
+BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)  # The in-memory inputs `ANX_Parser` parses directly
+MMAP_THRESHOLD = 1024 * 1024  # Input files of at least this many bytes are memory-mapped instead of read into memory
+# Value elements whose contents are other value elements rather than text
+CONTAINER_TYPES = ("RptValue", "MCValue")
+# One shared string per value type, so that records don't each hold their own copy of the tag (lxml creates a new string on every access)
+VALUE_TYPES = {tag: tag for tag in ("TextValue", "DateValue", "NumValue", "TFValue", "SelValue", "MCValue", "RptValue")}
+NOT_DECODED = object()  # The `value` of an `Answer_Record` that hasn't been parsed yet
+DECODE_CACHE_SIZE = 4096  # How many distinct raw strings `decode_date()` and `decode_number()` each remember
+
+
+def copy_parsed_value(value):
+    """Copy a parsed value so that callers can't modify a cached one. Only lists (RptValue, multi-select MCValue) need copying."""
+    if isinstance(value, list):
+        return [copy_parsed_value(item) for item in value]
+    return value
+
+
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
+def decode_date(raw: str) -> str:
+    """Turn the text of a DateValue, in the DD/MM/YYYY format, into the YYYY-MM-DD format that Knackly expects.
+
+    Zero padded dates are rearranged directly, after checking that the date exists. Anything else (single digit days or months, years
+    before 1000) goes through `datetime.strptime()`, which also raises the ValueError for text that isn't a date.
+    """
+    if len(raw) == 10 and raw[2] == "/" and raw[5] == "/" and raw[6] != "0":
+        day, month, year = raw[:2], raw[3:5], raw[6:]
+        digits = day + month + year
+        if digits.isascii() and digits.isdigit():
+            try:
+                date(int(year), int(month), int(day))
+            except ValueError:
+                pass  # Let strptime raise its own error
+            else:
+                return f"{year}-{month}-{day}"
+    return datetime.strptime(raw, "%d/%m/%Y").strftime("%Y-%m-%d")
+
+
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
+def decode_number(raw: str) -> int | float:
+    """Turn the text of a NumValue into an int, or a float if it has a fractional part.
+
+    Integers go through `float()` as well, since parsing with `int()` first turned out slower than `float()` and `is_integer()`, which
+    both run in C. The time saved comes from caching amounts that repeat.
+    """
+    f = float(raw)
+    if f.is_integer():
+        return int(f)
+    return f
+
+
+def memoize_answer(value_type: str) -> Callable:
+    """Decorator for the `ANX_Parser.parse_*` methods that caches what they return in the `value` of each record.
+
+    Only records of the decorated method's own value type are cached, so every value is decoded at most once no matter how many sections
+    read it, while asking for the wrong type still raises (or returns None) every time. Lists are copied on the way out, since some
+    callers modify what they get back.
+
+    Args:
+        value_type (str): The value type that the decorated method parses, for example "TextValue".
+    """
+
+    def decorator(parse: Callable) -> Callable:
+        @wraps(parse)
+        def wrapper(self, record):
+            if record is None or record.value_type != value_type:
+                return parse(self, record)
+
+            if record.value is NOT_DECODED:
+                record.value = parse(self, record)
+            else:
+                self.parse_cache_hits += 1
+            return copy_parsed_value(record.value)
+
+        return wrapper
+
+    return decorator
+
+
+class Answer_Record:
+    """A compact copy of a value element of an .anx file, which `ANX_Parser` keeps instead of the XML tree.
+
+    Each answer is one record holding its top level value, and the items of a RptValue or the selections of a MCValue are records nested
+    in it. Records are created by `from_answer()` / `from_element()` and read through the `ANX_Parser.parse_*` methods.
+
+    Attributes:
+        name (str | None): The name of the answer, or None for a nested record.
+        value_type (str | None): The tag of the value element, for example "TextValue", or None if the answer has no value element.
+        unanswered (bool): Whether the value element has the `unans` attribute.
+        raw (str | tuple[Answer_Record, ...] | None): The text of the value element, or the records nested in a RptValue or MCValue.
+        value: The decoded value, or `NOT_DECODED` until it has been parsed.
+    """
+
+    __slots__ = ("name", "value_type", "unanswered", "raw", "value")
+
+    def __init__(self, name: str | None, value_type: str | None, unanswered: bool, raw) -> None:
+        self.name = name
+        self.value_type = value_type
+        self.unanswered = unanswered
+        self.raw = raw
+        self.value = NOT_DECODED
+
+    @classmethod
+    def from_element(cls, element, name: str = None) -> "Answer_Record":
+        """Create the record of a value element, along with the records of everything nested in it."""
+        value_type = VALUE_TYPES.get(element.tag, element.tag)
+        if value_type in CONTAINER_TYPES:
+            raw = tuple(cls.from_element(child) for child in element)
+        else:
+            raw = element.text
+        return cls(name, value_type, "unans" in element.attrib, raw)
+
+    @classmethod
+    def from_answer(cls, answer) -> "Answer_Record":
+        """Create the record of an `<Answer>` element from its value element."""
+        name = answer.get("name")
+        if len(answer) == 0:
+            return cls(name, None, False, None)
+        return cls.from_element(answer[0], name)
+
+    def __repr__(self) -> str:
+        return f"Answer_Record(name={self.name!r}, value_type={self.value_type!r}, unanswered={self.unanswered!r})"
 
 
 class ANX_Parser:
     """Class with capabilities to parse HotDocs .anx files."""
 
-    def __init__(self, infile):
-        """Initialize the ANX_Parser with a provided file-like object
+    def __init__(self, infile, answer_names: Iterable[str] = None, engine: str = "auto"):
+        """Initialize the ANX_Parser with a provided .anx file
+
+        Args:
+            infile (str | os.PathLike | bytes | file): The .anx file to be parsed, as a path, as its bytes (or any other object in
+                `BUFFER_TYPES`), or as a file-like object. Paths and bytes are handed to the XML parser as they are, so the encoding is
+                taken from the byte order mark or the XML declaration (UTF-8 and UTF-16 both work), and the text of the file is never
+                copied into a Python string. A file of at least `MMAP_THRESHOLD` bytes is memory-mapped rather than read.
+            answer_names (Iterable[str], optional): Opt-in streaming mode. When provided, the file is read with `iterparse` and only the
+                answers with these names are kept in memory; every other answer is discarded as soon as it has been read. Defaults to None,
+                which keeps the whole answer set.
+            engine (str, optional): The XML library to parse with, one of `ENGINES`. "lxml" parses in C and is noticeably faster on large
+                answer files, "stdlib" uses `xml.etree.ElementTree`, and "auto" picks lxml if it is installed. Both engines produce the
+                same values. Defaults to "auto".
+        """
+        self.engine = self.resolve_engine(engine)
+        if answer_names is None and isinstance(infile, (str, os.PathLike)):
+            with read_input(infile) as buffer:
+                answer_set = self.parse_buffer(buffer)
+        elif answer_names is None and isinstance(infile, BUFFER_TYPES):
+            answer_set = self.parse_buffer(infile)
+        else:
+            if isinstance(infile, BUFFER_TYPES):
+                # Both iterparse functions read from a file, and take paths as they are
+                infile = infile if isinstance(infile, mmap.mmap) else io.BytesIO(infile)
+            if self.engine == "lxml":
+                if answer_names is None:
+                    answer_set = lxml_etree.parse(infile, lxml_parser()).getroot()
+                else:
+                    answer_set = self.stream_answer_set_lxml(infile, answer_names)
+            elif answer_names is None:
+                answer_set = ET.parse(infile).getroot()
+            else:
+                answer_set = self.stream_answer_set(infile, answer_names)
+
+        # Only the records are kept, and the XML tree is dropped as soon as this returns
+        self.answers = [Answer_Record.from_answer(answer) for answer in answer_set if answer.tag == "Answer"]
+        self.answer_index = self.build_answer_index(self.answers)
+        self.coverage = Coverage_Tracker()  # Which answers have been used, and by which section of the writer
+        self.parse_cache_hits = 0  # How many parses were answered from the `value` of a record
+        self.answer_lookups = 0  # How many answers have been read through `find_answer()` or `mark_visited()`
+        # When set, the names of the answers asked for, whether or not they were found. See `incremental.Revision_Tracker`.
+        self.requested = None
+
+    def parse_buffer(self, buffer):
+        """Parse a whole answer set from its bytes, without copying them.
 
         Args:
-            infile (file): The .anx file to be parsed.
+            buffer (bytes | bytearray | memoryview | mmap.mmap): The .anx file.
+
+        Returns:
+            ET.Element | lxml.etree._Element: The root `<AnswerSet>` element.
         """
-        self.tree = ET.parse(infile)
-        self.answer_set = self.tree.getroot()
+        if self.engine == "lxml":
+            return lxml_etree.fromstring(buffer, lxml_parser())
+        parser = ET.XMLParser()
+        parser.feed(buffer)
+        return parser.close()
+
+    @staticmethod
+    def stream_answer_set(infile, answer_names: Iterable[str]) -> ET.Element:
+        """Incrementally parse an answer set, keeping only the answers that are actually needed.
 
-    def find_answer(self, name_tag: str) -> ET.Element:
-        """Search for an element with a specific name tag in the XML tree.
+        Each `<Answer>` is inspected as soon as its closing tag has been read. Answers that are in `answer_names` are moved to a fresh
+        `<AnswerSet>` element, and everything else (including repeats of a name that was already kept) is dropped from the tree being built,
+        so peak memory depends on the answers that are kept rather than on the size of the file.
 
         Args:
-            name_tag (str): The name of the answer you want to find.
+            infile (str | file): The path of the .anx file to be parsed, or the file.
+            answer_names (Iterable[str]): The names of the answers to keep.
 
         Returns:
-            Element: the Element object if found, otherwise None.
+            ET.Element: A root `<AnswerSet>` element containing only the kept answers.
         """
-        xpath = f"./Answer[@name='{name_tag}']"
-        answer_element = self.answer_set.find(xpath)
-        if answer_element is not None:
-            answer_element.set("visited", "true")
-            return answer_element[0]
-        else:
-            return None
+        wanted = set(answer_names)
+        streamed_root = None
+        answer_set = None
+
+        for event, element in ET.iterparse(infile, events=("start", "end")):
+            if event == "start":
+                if streamed_root is None:
+                    streamed_root = element
+                    answer_set = ET.Element(element.tag, element.attrib)
+                continue
+            if element.tag != "Answer":
+                continue
+
+            name = element.get("name")
+            if name in wanted:
+                wanted.discard(name)  # Only the first occurrence of a name is kept
+                answer_set.append(element)
+            else:
+                element.clear()
+            # iterparse reads ahead, so answers that haven't produced their "end" event yet may also be detached here. That's fine: the
+            # events still hold on to them, and they are kept or dropped when their own "end" event comes around.
+            del streamed_root[:]
+
+        return answer_set
+
+    @staticmethod
+    def stream_answer_set_lxml(infile, answer_names: Iterable[str]):
+        """The lxml version of `stream_answer_set()`, returning the same answers.
+
+        lxml filters the events down to `<Answer>` elements itself. Kept answers are copied out, and every answer that has been read is
+        removed from the tree being built, which is the pattern lxml recommends (detaching the element of the current event is not safe).
+
+        Args:
+            infile (str | file): The path of the .anx file to be parsed, or the file.
+            answer_names (Iterable[str]): The names of the answers to keep.
+
+        Returns:
+            lxml.etree._Element: A root `<AnswerSet>` element containing only the kept answers.
+        """
+        wanted = set(answer_names)
+        kept = []
+
+        events = lxml_etree.iterparse(
+            binary_file(infile), events=("end",), tag="Answer", remove_comments=True, remove_pis=True, huge_tree=True
+        )
+        for _, element in events:
+            name = element.get("name")
+            if name in wanted:
+                wanted.discard(name)  # Only the first occurrence of a name is kept
+                kept.append(copy.deepcopy(element))
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+        answer_set = lxml_etree.Element(events.root.tag, dict(events.root.attrib))
+        answer_set.extend(kept)
+        return answer_set
+
+    @staticmethod
+    def resolve_engine(engine: str) -> str:
+        """Check the `engine` given to `ANX_Parser`, and turn "auto" into the engine that will actually be used.
+
+        Raises:
+            ValueError: If `engine` isn't one of `ENGINES`.
+            ImportError: If "lxml" was asked for, but lxml isn't installed.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expecting one of: {', '.join(ENGINES)}")
+        if engine == "auto":
+            return "stdlib" if lxml_etree is None else "lxml"
+        if engine == "lxml" and lxml_etree is None:
+            raise ImportError("The lxml engine was requested, but lxml isn't installed. Install it with `pip install lxml`.")
+        return engine
+
+    @staticmethod
+    def build_answer_index(answers: list[Answer_Record]) -> dict[str, Answer_Record]:
+        """Build a lookup table from answer name to its record.
+
+        If an answer set contains the same name more than once, the first occurrence wins. This matches what
+        `answer_set.find("./Answer[@name='...']")` used to return.
+
+        Args:
+            answers (list[Answer_Record]): The record of every answer, in the order of the file.
 
-    def parse_TextValue(self, element: ET.Element) -> str:
+        Returns:
+            dict[str, Answer_Record]: A dictionary where each key is the name of an answer, and each value is its record.
+        """
+        index = {}
+        for answer in answers:
+            if answer.name is not None and answer.name not in index:
+                index[answer.name] = answer
+        return index
+
+    def find_answer(self, name_tag: str) -> Answer_Record:
+        """Search for the answer with a specific name.
+
+        Args:
+            name_tag (str): The name of the answer you want to find.
+
+        Returns:
+            Answer_Record: The record of the answer's value if found, otherwise None.
+        """
+        self.answer_lookups += 1
+        if self.requested is not None:
+            self.requested.add(name_tag)
+        answer = self.answer_index.get(name_tag)
+        if answer is not None:
+            self.coverage.touch(name_tag)
+        return answer
+
+    @memoize_answer("TextValue")
+    def parse_TextValue(self, element: Answer_Record) -> str:
         """Parse the contents of a TextValue element in the .anx file.
 
         Args:
-            element (ET.Element): The actual TextValue element object.
+            element (Answer_Record): The record of the TextValue element.
 
         Returns:
             str: The Knackly acceptable version of the text if present, otherwise None.
@@ -43,18 +339,19 @@ class ANX_Parser:
         if element is None:
             return None
         # Raise an error if the element is not actually a TextValue element
-        if element.tag != "TextValue":
-            raise ANXTagError("TextValue", element.tag)
-        elif "unans" in element.attrib:
+        if element.value_type != "TextValue":
+            raise ANXTagError("TextValue", element.value_type)
+        elif element.unanswered:
             return None
 
-        return element.text
+        return element.raw
 
-    def parse_DateValue(self, element: ET.Element) -> str:
+    @memoize_answer("DateValue")
+    def parse_DateValue(self, element: Answer_Record) -> str:
         """Parse the contents of a DateValue element in the .anx file.
 
         Args:
-            element (ET.Element): The actual DateValue element object.
+            element (Answer_Record): The record of the DateValue element.
 
         Returns:
             str: The date as a string in the YYYY-MM-DD format that Knackly expects if present, otherwise None.
@@ -62,19 +359,19 @@ class ANX_Parser:
         if element is None:
             return None
         # Raise an error if the element is not actually a DateValue element
-        if element.tag != "DateValue":
-            raise ANXTagError("DateValue", element.tag)
-        elif "unans" in element.attrib:
+        if element.value_type != "DateValue":
+            raise ANXTagError("DateValue", element.value_type)
+        elif element.unanswered:
             return None
 
-        datetime_object = datetime.strptime(element.text, "%d/%m/%Y")
-        return datetime_object.strftime("%Y-%m-%d")
+        return decode_date(element.raw)
 
-    def parse_TFValue(self, element: ET.Element) -> bool:
+    @memoize_answer("TFValue")
+    def parse_TFValue(self, element: Answer_Record) -> bool:
         """Parse the contents of a TFValue element in the .anx file.
 
         Args:
-            element (ET.Element): The actual TFValue element object.
+            element (Answer_Record): The record of the TFValue element.
 
         Returns:
             bool: The boolean value of the element's text if present, otherwise None.
@@ -82,18 +379,19 @@ class ANX_Parser:
         if element is None:
             return None
         # Raise an error if the element is not actually a TFValue element
-        if element.tag != "TFValue":
-            raise ANXTagError("TFValue", element.tag)
-        elif "unans" in element.attrib:
+        if element.value_type != "TFValue":
+            raise ANXTagError("TFValue", element.value_type)
+        elif element.unanswered:
             return None
 
-        return element.text == "true"
+        return element.raw == "true"
 
-    def parse_NumValue(self, element: ET.Element) -> int | float:
+    @memoize_answer("NumValue")
+    def parse_NumValue(self, element: Answer_Record) -> int | float:
         """Parse the contents of a NumValue element in the .anx file.
 
         Args:
-            element (ET.Element): The actual NumValue element object.
+            element (Answer_Record): The record of the NumValue element.
 
         Returns:
             int | float: The integer (or float, if decimal places are relevant) value of the element's text if present, otherwise None.
@@ -101,21 +399,19 @@ class ANX_Parser:
         if element is None:
             return None
         # Raise an error if the element is not actually a NumValue element
-        if element.tag != "NumValue":
-            raise ANXTagError("NumValue", element.tag)
-        elif "unans" in element.attrib:
+        if element.value_type != "NumValue":
+            raise ANXTagError("NumValue", element.value_type)
+        elif element.unanswered:
             return None
 
-        f = float(element.text)
-        if f.is_integer():
-            return int(f)
-        return f
+        return decode_number(element.raw)
 
-    def parse_SelValue(self, element: ET.Element) -> str:
+    @memoize_answer("SelValue")
+    def parse_SelValue(self, element: Answer_Record) -> str:
         """Parse the contents of a SelValue element in the .anx file. This is nearly identical to self.parse_TextValue().
 
         Args:
-            element (ET.Element): The actual SelValue element object.
+            element (Answer_Record): The record of the SelValue element.
 
         Returns:
             str: The element's text if present, otherwise None.
@@ -123,18 +419,19 @@ class ANX_Parser:
         if element is None:
             return None
         # Raise an error if the element is not actually a SelValue element
-        if element.tag != "SelValue":
-            raise ANXTagError("SelValue", element.tag)
-        elif "unans" in element.attrib:
+        if element.value_type != "SelValue":
+            raise ANXTagError("SelValue", element.value_type)
+        elif element.unanswered:
             return None
 
-        return element.text
+        return element.raw
 
-    def parse_MCValue(self, element: ET.Element) -> str | int | float | list[str] | list[int] | list[float]:
+    @memoize_answer("MCValue")
+    def parse_MCValue(self, element: Answer_Record) -> str | int | float | list[str] | list[int] | list[float]:
         """Parse the contents of a MCValue element in the .anx file.
 
         Args:
-            element (ET.Element): The actual MCValue element object.
+            element (Answer_Record): The record of the MCValue element.
 
         Raises:
             ANXTagError: _description_
@@ -146,22 +443,22 @@ class ANX_Parser:
         if element is None:
             return None
         # Raise an error if the element is not actually a MCValue element
-        if element.tag != "MCValue":
-            raise ANXTagError("MCValue", element.tag)
-        elif "unans" in element.attrib:
+        if element.value_type != "MCValue":
+            raise ANXTagError("MCValue", element.value_type)
+        elif element.unanswered:
             return None
 
-        result = [self.parse_SelValue(child) for child in element]
+        result = [self.parse_SelValue(child) for child in element.raw]
         if len(result) == 0:
             return None  # Weird edge case for Vesting Help MC being blank
-        if len(element) == 1:
+        if len(result) == 1:
             return result[0]
-        elif len(element) > 1:  # This doesn't happen often. Represents the "Select All that Apply"
+        elif len(result) > 1:  # This doesn't happen often. Represents the "Select All that Apply"
             return result
         else:
             raise ValueError("`result` list is empty. This really shouldn't happen here.")
 
-    def parse_Primitive(self, element: ET.Element) -> str | int | float:
+    def parse_Primitive(self, element: Answer_Record) -> str | int | float:
         """Parse the contents of any primitive element type in the .anx file.
         Primitive element types are:
         - TextValue
@@ -172,29 +469,22 @@ class ANX_Parser:
         - MCValue
 
         Args:
-            element (ET.Element): The actual element object.
+            element (Answer_Record): The record of the element.
 
         Returns:
             str | int | float: The parsed representation of the element if possible, otherwise None.
         """
-        mapping = {
-            "TextValue": self.parse_TextValue,
-            "DateValue": self.parse_DateValue,
-            "NumValue": self.parse_NumValue,
-            "TFValue": self.parse_TFValue,
-            "SelValue": self.parse_SelValue,
-            "MCValue": self.parse_MCValue,
-        }
-
-        if element.tag not in mapping:
-            raise ANXTagError(" | ".join(mapping.keys()), element.tag)
-        return mapping[element.tag](element)
-
-    def parse_RptValue(self, element: ET.Element) -> list:
+        parse = PRIMITIVE_PARSERS.get(element.value_type)
+        if parse is None:
+            raise ANXTagError(" | ".join(PRIMITIVE_PARSERS), element.value_type)
+        return parse(self, element)
+
+    @memoize_answer("RptValue")
+    def parse_RptValue(self, element: Answer_Record) -> list:
         """Parse the contents of any RptValue element type in the .anx file.
 
         Args:
-            element (ET.Element): The actual RptValue element object.
+            element (Answer_Record): The record of the RptValue element.
 
         Returns:
             list: The parsed representation of the element if possible, otherwise None.
@@ -202,41 +492,51 @@ class ANX_Parser:
         if element is None:
             return None
         # Raise an error if the element is not actually a RptValue element
-        if element.tag != "RptValue":
-            if "unans" in element.attrib:
+        if element.value_type != "RptValue":
+            if element.unanswered:
                 return None
-            raise ANXTagError("RptValue", element.tag)
-        elif "unans" in element.attrib:
+            raise ANXTagError("RptValue", element.value_type)
+        elif element.unanswered:
             return None
 
         # Recursively search through each sub element and call either parse_RptValue or parse_Primitive
         results = []
-        for idx, child in enumerate(element):
-            if child.tag == "RptValue":
+        for child in element.raw:
+            if child.value_type == "RptValue":
                 results.append(self.parse_RptValue(child))
             else:
                 results.append(self.parse_Primitive(child))
 
         return results
 
-    def parse_field(self, field_name: str):
-        """Helper method that encapsulates finding and parsing an answer from the .anx file.
+    def parse_element(self, element: Answer_Record):
+        """Parse the contents of any value element in the .anx file, whether it is a RptValue or a primitive.
 
         Args:
-            field_name (str): The name of the answer you want to parse. For example, "Cannabis Loan TF", or "Guarantor Name TE".
+            element (Answer_Record): The record of the element.
 
         Returns:
             list | str | int | float: The parsed representation of the element if possible, otherwise None.
         """
-        element = self.find_answer(field_name)
         if element is None:
             return None
 
-        if element.tag == "RptValue":
+        if element.value_type == "RptValue":
             return self.parse_RptValue(element)
         else:
             return self.parse_Primitive(element)
 
+    def parse_field(self, field_name: str):
+        """Helper method that encapsulates finding and parsing an answer from the .anx file.
+
+        Args:
+            field_name (str): The name of the answer you want to parse. For example, "Cannabis Loan TF", or "Guarantor Name TE".
+
+        Returns:
+            list | str | int | float: The parsed representation of the element if possible, otherwise None.
+        """
+        return self.parse_element(self.find_answer(field_name))
+
     def parse_multiple(self, *answers: str) -> list:
         """Helper method to parse multiple answers from the .anx file at once.
 
@@ -249,26 +549,151 @@ class ANX_Parser:
         else:
             return result
 
-    def get_unvisited_elements(self, excluded_elements: list[str] = None) -> list[ET.Element]:
-        """Get a list of all elements that have not been used / visited.
+    def extract(self, plan) -> dict[str, list[tuple[str, str | None, Answer_Record]]]:
+        """Find the answers of an extraction plan (see `field_mapping.Extraction_Plan`) in a single pass, instead of one lookup per key.
+
+        The answers are only grouped by section here, not parsed or marked as visited, because the writer might never use some of the
+        sections (for example, the variable rate terms of a fixed rate loan), and answers left over in those shouldn't fail the
+        conversion. Pass a section's matches to `decode_section()` once it is actually built.
 
         Args:
-            excluded_elements (list[str], optional): A list of all elements that you purposely don't care about the 'visitedness' of. Defaults to None.
+            plan (Extraction_Plan): The compiled plan describing which answers fill in which keys of which sections.
 
         Returns:
-            list[ET.Element]: A list of all elements that have not been used / visited.
+            dict[str, list[tuple[str, str | None, Answer_Record]]]: For each section, the (Knackly key, value type, answer) of every
+            answer found for it.
         """
-        if excluded_elements is None:
-            excluded_elements = []
+        matches = {section: [] for section in plan.templates}
+        for answer, targets in self.plan_matches(plan):
+            for section, key, value_type in targets:
+                matches[section].append((key, value_type, answer))
+        return matches
+
+    def decode_section(self, plan, section: str, matches: list[tuple[str, str | None, Answer_Record]]) -> dict:
+        """Parse the answers `extract()` found for one section, and mark them as visited.
+
+        Args:
+            plan (Extraction_Plan): The plan that was passed to `extract()`.
+            section (str): The name of the section.
+            matches (list[tuple[str, str | None, Answer_Record]]): The section's matches, as returned by `extract()`.
+
+        Returns:
+            dict: The section's Knackly keys and parsed values, in table order, with `None` for anything not found.
+        """
+        values = dict(plan.templates[section])
+        for key, value_type, answer in matches:
+            values[key] = PLAN_PARSERS[value_type](self, answer)
+        self.mark_visited([answer for _, _, answer in matches])
+        return values
+
+    def plan_matches(self, plan):
+        """Pair each answer the plan asks for with its targets, walking whichever of the answer set or the plan is smaller.
+
+        Most answer files hold more answers than the plan reads (history blobs, answers for other templates), so the plan's names are
+        usually looked up in the index. Small answer files are walked directly instead.
+
+        Args:
+            plan (Extraction_Plan): The compiled plan.
+
+        Yields:
+            tuple[Answer_Record, list[tuple]]: The record of an answer, and the (section, key, value type) targets it fills in.
+        """
+        if len(plan.targets) < len(self.answer_index):
+            for name, targets in plan.targets.items():
+                answer = self.answer_index.get(name)
+                if answer is not None:
+                    yield answer, targets
+        else:
+            for answer in self.answers:
+                targets = plan.targets.get(answer.name)
+                # Skip anything the plan doesn't ask for, as well as repeats of a name (the index decides which occurrence counts)
+                if targets is not None and self.answer_index.get(answer.name) is answer:
+                    yield answer, targets
+
+    def mark_visited(self, answers: list[Answer_Record]) -> None:
+        """Mark answers as visited, the same way `find_answer()` does.
+
+        Args:
+            answers (list[Answer_Record]): The answers that were used.
+        """
+        self.answer_lookups += len(answers)
+        self.coverage.touch_many(answer.name for answer in answers)
+
+    def get_unvisited_elements(self, excluded_elements: Iterable[str] | Exclusions = None) -> list[Answer_Record]:
+        """Get a list of all answers that have not been used / visited.
+
+        Args:
+            excluded_elements (Iterable[str] | Exclusions, optional): The answers that you purposely don't care about the 'visitedness'
+                of, as names or patterns (see `answer_coverage.Exclusions`). Defaults to None.
+
+        Returns:
+            list[Answer_Record]: A list of all answers that have not been used / visited, in the order of the file.
+        """
+        if not isinstance(excluded_elements, Exclusions):
+            excluded_elements = Exclusions(excluded_elements)
 
         unvisited_elements = []
 
-        for element in self.answer_set:
-            if element.get("name") not in excluded_elements and element.get("visited") != "true":
-                unvisited_elements.append(element)
+        for answer in self.answers:
+            # Only the first answer with a name can be visited, since that's the one `find_answer()` returns
+            visited = answer.name in self.coverage and self.answer_index[answer.name] is answer
+            if not visited and answer.name not in excluded_elements:
+                unvisited_elements.append(answer)
 
         return unvisited_elements
 
+    def coverage_summary(self) -> dict[str, list[str]]:
+        """Summarize which answers were used, in a form that can be sent back from a worker process and added up with
+        `answer_coverage.Batch_Coverage`.
+
+        Returns:
+            dict[str, list[str]]: The distinct names of every answer in the file under "answers", and of the unused ones under "unused".
+        """
+        unused = dict.fromkeys(answer.name for answer in self.get_unvisited_elements() if answer.name is not None)
+        return {"answers": list(self.answer_index), "unused": list(unused)}
+
+
+# The parse method for each value type, looked up once here instead of on every call. They are called as `parse(parser, record)`.
+PRIMITIVE_PARSERS = {
+    "TextValue": ANX_Parser.parse_TextValue,
+    "DateValue": ANX_Parser.parse_DateValue,
+    "NumValue": ANX_Parser.parse_NumValue,
+    "TFValue": ANX_Parser.parse_TFValue,
+    "SelValue": ANX_Parser.parse_SelValue,
+    "MCValue": ANX_Parser.parse_MCValue,
+}
+# The parse methods for the value types of an extraction plan, where None means the type isn't known in advance
+PLAN_PARSERS = {**PRIMITIVE_PARSERS, "RptValue": ANX_Parser.parse_RptValue, None: ANX_Parser.parse_element}
+
+
+def lxml_parser():
+    """Create the parser used by the lxml engine. Comments and processing instructions are left out of the tree, the same as
+    `xml.etree.ElementTree` does, so that every child of the `<AnswerSet>` is an element. `huge_tree` lifts lxml's limits on the size of
+    text nodes, which the answer file history can exceed."""
+    return lxml_etree.XMLParser(remove_comments=True, remove_pis=True, huge_tree=True)
+
+
+@contextmanager
+def read_input(path: str | os.PathLike) -> Iterator[bytes | mmap.mmap]:
+    """Get the bytes of the file at `path`. A file of at least `MMAP_THRESHOLD` bytes is memory-mapped, so that the parser reads it
+    from the page cache instead of from a copy, and a smaller one is read, which takes fewer system calls."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:  # Empty files can't be memory-mapped either
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
+def binary_file(infile):
+    """lxml's `iterparse` only reads bytes, so get the binary stream underneath a file opened in text mode."""
+    if not isinstance(infile, io.TextIOBase):
+        return infile
+    if hasattr(infile, "buffer"):
+        return infile.buffer
+    # In-memory text (io.StringIO) has no binary stream underneath it
+    return io.BytesIO(infile.read().encode("UTF-8"))
+
 
 class ANXTagError(Exception):
     """Error to be thrown when the xml tag of an element is not as expected"""
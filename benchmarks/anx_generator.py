@@ -0,0 +1,557 @@
+"""Generate synthetic HotDocs answer sets (.anx files) for benchmarking.
+
+The answer sets use the same answer names and repeat layout that `Knackly_Writer` reads, so every section of the converter does real
+work: borrowers with nested signers and owners (the s1 / s1s2 / s1s2s3 levels), properties, guarantors, lenders, settlement fees, loan
+terms, special loan features and the docs add pages. Values are random, but the same seed always gives the same file.
+
+Usage:
+    python benchmarks/anx_generator.py --borrowers 5 --depth 3 --properties 4 > synthetic.anx
+
+Or, as a library (see `bench_scaling.py`):
+    from anx_generator import generate
+    data = generate(borrowers=5, depth=3)
+"""
+
+import argparse
+import random
+import sys
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+
+# The value element each answer name suffix uses
+VALUE_TYPES = {
+    "TE": "TextValue",
+    "TX": "TextValue",
+    "NU": "NumValue",
+    "NM": "NumValue",
+    "TF": "TFValue",
+    "DT": "DateValue",
+    "MC": "MCValue",
+    "DMC": "MCValue",
+}
+STATES = ["CA", "NV", "AZ", "TX", "FL"]
+BORROWER_ENTITY_TYPES = ["limited liability company", "individual", "trust", "corporation", "joint venture"]
+GUARANTOR_ENTITY_TYPES = ["individual", "limited liability company", "trust"]
+COLLATERAL_TYPES = ["1-4 Single Family Residence", "Commercial Property", "Vacant Land", "5+ Multi-Family Property"]
+FEE_COMMENTS = ["to be net funded", "Wire Instructions to be Provided", "Deliver to Loan Servicer"]
+
+# Answer names of each level of a borrower's signers and owners
+SIGNER_1 = {
+    "name": "B signature underlying entity 1 name TX",
+    "type": "B signature underlying entity 1 entity type MC",
+    "state": "B signature underlying entity 1 org state MC",
+    "title": "B signature underlying entity 1 title TX",
+}
+SIGNER_1_SIGNER_2 = {
+    "name": "B signature underlying entity 2 name TX",
+    "type": "B signature underlying entity 2 entity type MC",
+    "state": "B signature underlying entity 2 org state MC",
+    "title": "B signature underlying entity 2 title TX",
+}
+SIGNER_1_SIGNER_2_SIGNER_3 = {
+    "name": "B signature underlying entity 3 name TX",
+    "title": "B signature underlying entity 3 title TX",
+}
+SIGNER_1_SIGNER_2_OWNER_1 = {
+    "name": "Borrower Owner Signer Underlying 2 Name TE",
+    "title": "Borrower Owner Signer Underlying 2 Title TE",
+}
+SIGNER_1_OWNER_1 = {
+    "name": "Borrower Owner Signer Underlying 1 Name TE",
+    "type": "Borrower Owner Signer Underlying 1 Entity Type MC",
+    "state": "Borrower Owner Signer Underlying 1 State MC",
+    "title": "Borrower Owner Signer Underlying 1 Title TE",
+}
+SIGNER_1_OWNER_1_OWNER_2 = {
+    "name": "Borrower Owner Underlying 1 Individual Name TE",
+    "title": "Borrower Owner Underlying 1 Individual Title TE",
+}
+OWNER_1 = {
+    "name": "Borrower Owner Signer Name TE",
+    "type": "Borrower Owner Entity Type MC",
+    "state": "Borrower Owner Organization State MC",
+    "title": "Borrower Owner Signer Title TE",
+}
+OWNER_1_OWNER_2 = {
+    "name": "Borrower Owner Individual Name TE",
+    "title": "Borrower Owner Individual Title TE",
+}
+
+
+def value_type(name: str) -> str:
+    """Get the value element used by an answer, based on the suffix of its name."""
+    return VALUE_TYPES.get(name.rsplit(" ", 1)[-1], "TFValue")
+
+
+def value_element(value_type: str, value) -> ET.Element:
+    """Build the value element of an answer.
+
+    Args:
+        value_type (str): For example "TextValue" or "MCValue".
+        value: The value. Lists become (nested) RptValues, `None` becomes an unanswered value, and tuples are multiple MC selections.
+
+    Returns:
+        ET.Element: The value element.
+    """
+    if isinstance(value, list):
+        element = ET.Element("RptValue")
+        for item in value:
+            element.append(value_element(value_type, item))
+        return element
+    if value is None:
+        return ET.Element(value_type, unans="true")
+
+    element = ET.Element(value_type)
+    if value_type == "MCValue":
+        for selection in value if isinstance(value, tuple) else (value,):
+            ET.SubElement(element, "SelValue").text = selection
+    elif value_type == "TFValue":
+        element.text = "true" if value else "false"
+    else:
+        element.text = str(value)
+    return element
+
+
+def answer_set(answers: dict) -> bytes:
+    """Serialize a dictionary of answer names and values as an .anx file."""
+    root = ET.Element("AnswerSet", title="", version="1.1")
+    for name, value in answers.items():
+        answer = ET.SubElement(root, "Answer", name=name)
+        answer.append(value_element(value_type(name), value))
+    return b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n' + ET.tostring(root)
+
+
+class Answer_Set_Builder:
+    """Collects the answers of a synthetic answer set. Single answers go in `answers`, and repeated answers get one value per row."""
+
+    def __init__(self, seed: int):
+        self.random = random.Random(seed)
+        self.answers = {}
+        self.rows = defaultdict(list)
+
+    def text(self, prefix: str) -> str:
+        return f"{prefix} {self.random.randint(1, 9999)}"
+
+    def date(self) -> str:
+        return f"{self.random.randint(1, 28):02d}/{self.random.randint(1, 12):02d}/{self.random.randint(2000, 2030)}"
+
+    def state(self) -> str:
+        return self.random.choice(STATES)
+
+    def add(self, values: dict) -> None:
+        """Add one row's value to each of the repeated answers in `values`."""
+        for name, value in values.items():
+            self.rows[name].append(value)
+
+    def signer_levels(self, width: int, depth: int) -> dict:
+        """Build the signer / owner columns of a single complex borrower, `width` entries wide at every level and `depth` levels deep."""
+        columns = defaultdict(list)
+
+        def add_column(names: dict, key: str, values: list) -> None:
+            columns[names[key]].append(values or None)
+
+        for _ in range(width):
+            columns[SIGNER_1["name"]].append(self.text("Signer1"))
+            columns[SIGNER_1["type"]].append("limited liability company" if depth > 1 else "individual")
+            columns[SIGNER_1["state"]].append(self.state())
+            columns[SIGNER_1["title"]].append("Manager")
+
+            # The signers and owners of this signer, one level down
+            signers_2 = defaultdict(list)
+            owners_2 = defaultdict(list)
+            if depth > 1:
+                for _ in range(width):
+                    signers_2["name"].append(self.text("Signer2"))
+                    signers_2["type"].append("corporation")
+                    signers_2["state"].append(self.state())
+                    signers_2["title"].append("Member")
+                    signers_2["signer_names"].append([self.text("Signer3") for _ in range(width)] if depth > 2 else None)
+                    signers_2["signer_titles"].append(["President"] * width if depth > 2 else None)
+                    signers_2["owner_names"].append([self.text("Owner3")] if depth > 2 else None)
+                    signers_2["owner_titles"].append(["Owner"] if depth > 2 else None)
+
+                    owners_2["name"].append(self.text("Owner2"))
+                    owners_2["type"].append("individual")
+                    owners_2["state"].append(self.state())
+                    owners_2["title"].append("Member")
+                    owners_2["owner_names"].append([self.text("Owner3")] if depth > 2 else None)
+                    owners_2["owner_titles"].append(["Member"] if depth > 2 else None)
+
+            for key in ("name", "type", "state", "title"):
+                add_column(SIGNER_1_SIGNER_2, key, signers_2[key])
+                add_column(SIGNER_1_OWNER_1, key, owners_2[key])
+            add_column(SIGNER_1_SIGNER_2_SIGNER_3, "name", signers_2["signer_names"])
+            add_column(SIGNER_1_SIGNER_2_SIGNER_3, "title", signers_2["signer_titles"])
+            add_column(SIGNER_1_SIGNER_2_OWNER_1, "name", signers_2["owner_names"])
+            add_column(SIGNER_1_SIGNER_2_OWNER_1, "title", signers_2["owner_titles"])
+            add_column(SIGNER_1_OWNER_1_OWNER_2, "name", owners_2["owner_names"])
+            add_column(SIGNER_1_OWNER_1_OWNER_2, "title", owners_2["owner_titles"])
+
+        for _ in range(width):
+            columns[OWNER_1["name"]].append(self.text("BOwner"))
+            columns[OWNER_1["type"]].append("individual")
+            columns[OWNER_1["state"]].append(self.state())
+            columns[OWNER_1["title"]].append("Member")
+            columns[OWNER_1_OWNER_2["name"]].append([self.text("BOwner2")] if depth > 1 else None)
+            columns[OWNER_1_OWNER_2["title"]].append(["Member"] if depth > 1 else None)
+
+        return columns
+
+    def add_borrowers(self, count: int, depth: int, width: int) -> list[str]:
+        """Add `count` borrowers, cycling through the entity types. Returns the borrowers' keys."""
+        for name in (
+            "Borrower Notice MC",
+            "Borrower Delivery To Notice TE",
+            "Temple Email Address TX",
+            "Temple Phone Num TE",
+            "Borrower Street Address TE",
+            "Borrower City TE",
+            "Borrower Zip Code TE",
+        ):
+            self.answers[name] = self.text("Notice")
+        self.answers["Borrower State MC"] = "CA"
+
+        keys = []
+        signer_names = [*SIGNER_1.values(), *SIGNER_1_SIGNER_2.values(), *SIGNER_1_SIGNER_2_SIGNER_3.values()]
+        signer_names += [*SIGNER_1_SIGNER_2_OWNER_1.values(), *SIGNER_1_OWNER_1.values(), *SIGNER_1_OWNER_1_OWNER_2.values()]
+        signer_names += [*OWNER_1.values(), *OWNER_1_OWNER_2.values()]
+        for i in range(count):
+            key = f"$${i + 3:04d}%%"
+            keys.append(key)
+            entity_type = BORROWER_ENTITY_TYPES[i % len(BORROWER_ENTITY_TYPES)]
+            self.add(
+                {
+                    "Borrower Key TX": key,
+                    "Third Party Borrower TF": i % 4 == 3,
+                    "Borrower Name TE": self.text("Borrower"),
+                    "Borrower Entity Type MC": entity_type,
+                    "Borrower Organization State MC": self.state(),
+                    "Trust Name TE": self.text("Trust") if entity_type == "trust" else None,
+                    "B signature trustee name TX": [self.text("Trustee"), self.text("Trustee")] if entity_type == "trust" else None,
+                    "B signature joint venturer name TX": [self.text("Venturer")] if entity_type == "joint venture" else None,
+                    "B signature attorney in fact TF": False,
+                }
+            )
+
+            columns = self.signer_levels(width, depth) if entity_type not in ("individual", "trust", "joint venture") else {}
+            self.add({name: columns.get(name) or None for name in signer_names})
+        return keys
+
+    def add_properties(self, count: int, borrower_keys: list[str]) -> None:
+        self.answers.update(
+            {
+                "Schedule of Properties TF": count > 1,
+                "Partial Release Advanced MC": "Release Price",
+                "Legal Description TX": self.text("Legal"),
+                "Note Governing Law State MC": "CA",
+                "Arbitration County MC": "Orange CA",
+                "Confession of Judgment TF": False,
+            }
+        )
+        for i in range(count):
+            self.add(
+                {
+                    "Property Key TX": f"$$P{i:04d}%%",
+                    "Property Collatoral Release NU": self.random.randint(1000, 90000),
+                    "Property Street Address TE": self.text("Street"),
+                    "Property State MC": "CA",
+                    "Property County MC": "Orange CA",
+                    "Property City TX": self.text("City"),
+                    "Property Zip Code TE": str(self.random.randint(10000, 99999)),
+                    "Property APN TE": self.text("APN"),
+                    "Lien Position MC": "1st",
+                    "Property Purchase Money TF": i % 2 == 0,
+                    "Property Collateral Type MC": COLLATERAL_TYPES[i % len(COLLATERAL_TYPES)],
+                    "Property Rental TF": i % 2 == 1,
+                    "Leasehold Mortgage TF": False,
+                    "Leasehold Mortgage Lessor TE": None,
+                    "Trustee Name MC": "Other",
+                    "TrusteeName TE": self.text("Trustee"),
+                    "Trustee Address TE": self.text("Address"),
+                    "Tennessee County TE": None,
+                    "Property Borrower DMC": borrower_keys[i % len(borrower_keys)] if borrower_keys else None,
+                    "Vesting Help MC": ["sole"],
+                    "Owner Occupied TF": False,
+                    "Junior Lien Beneficiary TE": [self.text("Senior")],
+                    "Junior Lien Recorded On DT": [self.date()],
+                    "Junior Lien Instrument Number TE": [self.text("Instrument")],
+                    "Junior Lien Trustor Name TE": [self.text("Trustor")],
+                    "Junior Lien Trustee TE": [self.text("Trustee")],
+                    "Property Collatoral Value NU": self.random.randint(100000, 900000) + 0.5,
+                    "Property Include PUD TF": True,
+                }
+            )
+
+    def add_guarantors(self, count: int, depth: int, width: int) -> None:
+        self.answers["Guarantor TF"] = True
+        for i in range(count):
+            entity_type = GUARANTOR_ENTITY_TYPES[i % len(GUARANTOR_ENTITY_TYPES)]
+            is_entity = entity_type == "limited liability company"
+            is_nested = is_entity and depth > 1
+            self.add(
+                {
+                    "Guarantor Name TE": self.text("Guarantor"),
+                    "Guarantor Type Select MC": "Full",
+                    "Guarantor Address MC": "Other",
+                    "Guarantor Street Address TE": self.text("Street"),
+                    "Guarantor City TE": self.text("City"),
+                    "Guarantor State MC": "CA",
+                    "Guarantor Zip Code TE": "90000",
+                    "Guarantor Entity Type MC": entity_type,
+                    "Guarantor Spousal Consent MC": "Yes",
+                    "Guarantor Organization State MC": "CA",
+                    "Guarantor Trust Name TE": self.text("Guarantor Trust") if entity_type == "trust" else None,
+                    "G signature trustee name TX": [self.text("Guarantor Trustee")] if entity_type == "trust" else None,
+                    "G signature underlying entity 1 name TX": [self.text("GSigner1") for _ in range(width)] if is_entity else None,
+                    "G signature underlying entity 1 entity type MC": ["limited liability company"] * width if is_entity else None,
+                    "G signature underlying entity 1 org state MC": ["NV"] * width if is_entity else None,
+                    "G signature underlying entity 1 title TX": ["Manager"] * width if is_entity else None,
+                    "Guarantor Owner Signer Underlying 1 Name TE": [[self.text("GSigner2")] for _ in range(width)] if is_nested else None,
+                    "Guarantor Owner Signer Underlying 1 Role MC": [["Member"] for _ in range(width)] if is_nested else None,
+                    "Guarantor Owner Signer Underlying 1 Title TE": [["Member"] for _ in range(width)] if is_nested else None,
+                    "Guarantor Owner Signer Name TE": [self.text("GOwner1")] if is_entity else None,
+                    "Guarantor Owner Entity Type MC": ["individual"] if is_entity else None,
+                    "Guarantor Owner Organization State MC": ["CA"] if is_entity else None,
+                    "Guarantor Owner Signer Title TE": ["Member"] if is_entity else None,
+                    "Guarantor Owner Individual Name TE": [[self.text("GOwner2")]] if is_nested else None,
+                    "Guarantor Owner Individual Title TE": [["Member"]] if is_nested else None,
+                }
+            )
+
+    def add_lenders(self, count: int) -> None:
+        for _ in range(count):
+            self.add({"Lender Name TE": self.text("Lender"), "Lender Invest Amount NU": self.random.randint(10000, 500000)})
+        self.answers["Exhibit A Lender List TF"] = [count > 3]
+        for name in (
+            "Lender Care Of MC",
+            "Lender Street Address TE",
+            "Lender City TE",
+            "Lender Zip Code TE",
+            "Temple Lender Email Address TX",
+            "Lender CFL License Number TE",
+        ):
+            self.answers[name] = self.text("Lender")
+        self.answers.update({"Lender State MC": "CA", "seth_Multiple Lenders TF": count > 1, "CA CFL License TF": True})
+
+    def add_fees(self, count: int) -> None:
+        """Add `count` rows of each type of settlement fee."""
+        for fee_type in ("Broker", "Lender", "Other"):
+            for _ in range(count):
+                row = {
+                    f"{fee_type} Fee NU": self.random.randint(100, 5000),
+                    f"{fee_type} Fee Description TE": self.text("Fee"),
+                    f"{fee_type} Delivery Fee Comment MC": self.random.choice(FEE_COMMENTS),
+                }
+                if fee_type == "Other":
+                    row[f"{fee_type} Paid To Fee TE"] = self.text("Payee")
+                self.add(row)
+        self.answers.update({"Geraci Fee NU": [1500], "Geraci Fee Delivery MC": ["Wire"], "Per Diem interest Delivery MC": "Escrow"})
+
+    def add_loan_terms(self) -> None:
+        """Add the loan terms and special loan features, with most optional features switched on."""
+        self.answers.update(
+            {
+                "Document Date DT": self.date(),
+                "Loan Number TE": self.text("Loan"),
+                "Loan Term NU": 12,
+                "Loan Amount NU": 750000,
+                "First Payment DT": self.date(),
+                "Loan Type Interest Only TF": True,
+                "Amortization Period NU": 360,
+                "Interest Rate NU": 10.5,
+                "Default Interest Rate NU": 24,
+                "Interest Calc Type MC": "360/360",
+                "Loan Type Variable TF": True,
+                "Variable Margin NM": 2.5,
+                "Rate Adjust Daily TF": False,
+                "Variable Interest Rate Index MC": "Prime",
+                "Interest Step TF": True,
+                "Interest Step Rate NU": [9, 10.25, 11],
+                "Interest Step Duration NU": [6, 6, 12],
+                "MERS TF": False,
+                "Maturity DT": self.date(),
+                "Payment in Advance TF": True,
+                "Credit Line TF": False,
+                "Construction Holdback TF": True,
+                "Holdback Amount NU": 100000,
+                "Construction Type MC": "Ground Up",
+                "Assignment of Permits TF": True,
+                "Construction Contract TF": True,
+                "Construction Contractor TE": self.text("Contractor"),
+                "Contractor Street Address TE": self.text("Street"),
+                "Contractor City TE": self.text("City"),
+                "Contractor State MC": "CA",
+                "Contractor Zip TE": "90001",
+                "Construction Contract Percent NU": [10, 50, 40],
+                "Construction Contract Days NU": [30, 60, 90],
+                "Construction Guaranty Name TX": [self.text("Construction Guarantor")],
+                "Impound Accounts TF": True,
+                "Impound Tax NU": 1200,
+                "Tax Payment NU": 100,
+                "Insurance Payment NU": 80,
+                "Prepay MC": "Yes",
+                "Prepay Term NU": 6,
+                "Prepay Non Percent NU": [3, 2, None, 1],
+                "Cannabis Loan TF": True,
+                "Extension TF": True,
+                "Extension Number NU": 2,
+                "Extension Months NU": 6,
+                "Deferred Broker Fees MC": "Percent",
+                "Deferred Broker Fee Percent NU": 1,
+                "Lender Holdback TF": True,
+                "Lender Holdback NU": 5000,
+                "Interest Reserve TF": True,
+                "Interest Reserve Months TF": True,
+                "Interest Reserve Months NU": 6,
+                "Damage Deadline DT": self.date(),
+            }
+        )
+
+    def add_pledges(self) -> None:
+        """Add two equity pledge agreements and two collateral security agreements."""
+        self.answers.update(
+            {"Membership Pledge TF": True, "Collateral Security Agreement TF": True, "CSA Debtor TF": True, "UCC Personal Property TF": True}
+        )
+        for _ in range(2):
+            self.add(
+                {
+                    "Membership Pledgor Name TE": self.text("Pledgor"),
+                    "Membership Pledgor Ind TF": False,
+                    "Membership Pledgor Signer 1 TE": self.text("Signer"),
+                    "Membership Pledgor Title TE": "Manager",
+                    "Membership Pledgor State MC": "CA",
+                    "CSA Debtor Name TE": self.text("Debtor"),
+                    "CSA Debtor Ind TF": True,
+                    "CSA Debtor Signer 1 TE": self.text("Signer"),
+                    "CSA Debtor Signer 1 Title TE": "Manager",
+                    "CSA Debtor State MC": "CA",
+                }
+            )
+
+    def add_closing(self, properties: int) -> None:
+        """Add the servicer, broker, title, escrow, preparer and docs add answers. The docs add pages get one row per property."""
+        self.answers.update(
+            {
+                "ACH Delivery of Payments TF": True,
+                "Loan Servicer MC": "Other",
+                "Loan Servicer Name TE": self.text("Servicer"),
+                "Loan Servicer State MC": "CA",
+                "CA Broker TF": True,
+                "CA Broker Name TE": self.text("Broker"),
+                "Broker State MC": "CA",
+                "Title Company Name TE": self.text("Title"),
+                "Title Officer State MC": "CA",
+                "Title Order Number TE": self.text("Order"),
+                "Title Report Effective Date DT": self.date(),
+                "Escrow and Title Select MC": "Escrow and Title",
+                "Escrow Company Name TE": self.text("Escrow"),
+                "Kass Schuler TF": False,
+                "Loan Prepared By TE": self.text("Preparer"),
+                "Preparer Address MC": "Other",
+                "Loan Prepared By Street Address TE": self.text("Street"),
+                "Loan Prepared By State MC": "CA",
+                "Closing Contact Name TE": self.text("Closer"),
+                "Assignment of Property Management TF": True,
+                "W9 TF": True,
+                "seth_isForSale": True,
+                "Assignment and Allonge Concurrent MC": "Yes",
+                "Assignment and Allonge Street TE": self.text("Street"),
+                "Assignment and Allonge CSZ TE": "Irvine, CA, 92618",
+                "seth_isSubordinations": True,
+                "seth_isIntercreditor": True,
+                "Borrower AKA Required TF": True,
+                "Remove Arbitration TF": True,
+                "Master Guaranty DT": self.date(),
+                "Loan Documents MC": ("Note", "Deed of Trust", "Guaranty"),
+            }
+        )
+        for i in range(properties):
+            property_key = f"$$P{i:04d}%%"
+            self.add(
+                {
+                    "PDM Property DMC": property_key,
+                    "Property Manager TE": self.text("Manager"),
+                    "Property Manager Signing DT": self.date(),
+                    "Property Manager State MC": "CA",
+                    "Subordination Doc Type MC": "Lease",
+                    "PDS Property DMC": property_key,
+                    "Subordination Post Closing TF": False,
+                    "Tenant Name TE": [self.text("Tenant")],
+                    "Subordination Rep Options MC": "A",
+                    "PDIA Property DMC": property_key,
+                    "Subordinate Debt Amount NU": 50000,
+                    "Junior Loan Beneficiary TE": [self.text("Junior Lender"), self.text("Junior Lender")],
+                    "Subordinate Lender Invest Amount NU": [100, 200],
+                    "Subordinate Lender State MC": "CA",
+                }
+            )
+        self.add({"Borrower AKA Name MC": "Someone", "Borrower AKA TX": [self.text("AKA"), self.text("AKA")]})
+
+
+def generate(
+    borrowers: int = 3,
+    depth: int = 3,
+    width: int = 2,
+    properties: int = 2,
+    lenders: int = 2,
+    fees: int = 3,
+    padding: int = 0,
+    seed: int = 0,
+) -> bytes:
+    """Generate a synthetic answer set.
+
+    Args:
+        borrowers (int, optional): How many borrowers. Entity types cycle through LLC, individual, trust, corporation and joint
+            venture, so only the LLCs and corporations have signers and owners. Defaults to 3.
+        depth (int, optional): How many levels of signers / owners complex borrowers have (1 to 3: s1, s1s2, s1s2s3). Defaults to 3.
+        width (int, optional): How many signers / owners there are at each level. Defaults to 2.
+        properties (int, optional): How many properties. Defaults to 2.
+        lenders (int, optional): How many lenders. Defaults to 2.
+        fees (int, optional): How many rows of each type of settlement fee (broker, lender and other). Defaults to 3.
+        padding (int, optional): How many extra answers that the converter doesn't read. Defaults to 0.
+        seed (int, optional): Seed for the random values. Defaults to 0.
+
+    Returns:
+        bytes: The .anx file.
+    """
+    builder = Answer_Set_Builder(seed)
+    builder.answers.update(
+        {
+            "(ANSWER FILE HISTORY)": "x" * 2000,
+            "Client Specific Pass Store TX": "trans",
+            "Client MC": "DLP",
+            "DLP Product MC": "Bridge",
+        }
+    )
+    borrower_keys = builder.add_borrowers(borrowers, depth, width)
+    builder.add_properties(properties, borrower_keys)
+    builder.add_guarantors(max(1, borrowers - 1), depth, width)
+    builder.add_lenders(lenders)
+    builder.add_fees(fees)
+    builder.add_loan_terms()
+    builder.add_pledges()
+    builder.add_closing(properties)
+
+    answers = {**builder.answers, **builder.rows}
+    for i in range(padding):
+        answers[f"Unused Padding {i} TE"] = builder.text("Padding")
+    return answer_set(answers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic .anx file to stdout.")
+    parser.add_argument("--borrowers", type=int, default=3)
+    parser.add_argument("--depth", type=int, default=3, help="levels of borrower signers / owners (1-3)")
+    parser.add_argument("--width", type=int, default=2, help="signers / owners at each level")
+    parser.add_argument("--properties", type=int, default=2)
+    parser.add_argument("--lenders", type=int, default=2)
+    parser.add_argument("--fees", type=int, default=3, help="rows of each type of settlement fee")
+    parser.add_argument("--padding", type=int, default=0, help="extra answers that the converter doesn't read")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sys.stdout.buffer.write(generate(**vars(args)))
+
+
+if __name__ == "__main__":
+    main()
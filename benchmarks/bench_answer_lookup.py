@@ -0,0 +1,151 @@
+"""Benchmark answer lookups in ANX_Parser as the number of answers in a file grows.
+
+Two comparisons are made between the old `answer_set.find("./Answer[@name='...']")` scan on the XML tree ("xpath") and the name
+index behind `ANX_Parser.find_answer()` ("index"):
+
+- "lookups": every answer in a synthetic answer set of plain text answers is looked up once, which mirrors how
+  `Knackly_Writer.create()` consumes a file.
+- "conversion": whole conversions, `ANX_Parser(...)` construction followed by `Knackly_Writer.create()`, on answer sets from
+  `anx_generator.py` with increasing numbers of borrowers (and, with them, properties, lenders and fee rows), padded with increasing
+  numbers of answers the converter doesn't read, the way real answer files are. Every row of a repeated answer is in the same
+  `<Answer>`, so it is mostly the padding that grows the number of answers the XPath scan goes through. The median per-file time is reported in the same "parse" and "create" stages
+  as `bench_scaling.py`, so the results can be compared with the other benchmarks. The xpath column runs the same writer against a
+  parser whose `find_answer()` scans the XML tree; the mapped sections are read through `ANX_Parser.extract()` in both columns (see
+  `bench_extraction_plan.py`), so they only differ in the answers that are looked up one at a time.
+
+Usage:
+    python benchmarks/bench_answer_lookup.py [--sizes 1 4 16] [--padding 0 1000 4000] [--repeats 7]
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from anx_generator import generate  # noqa: E402
+
+from anx_parser import ANX_Parser, Answer_Record  # noqa: E402
+from knackly_writer import Knackly_Writer  # noqa: E402
+
+
+class XPath_Parser(ANX_Parser):
+    """A parser whose `find_answer()` scans the XML tree with XPath, the way it did before the name index.
+
+    `ANX_Parser` no longer keeps the XML tree, so it is parsed once ahead of the timing and handed in as `answer_set`. The element that
+    XPath finds is mapped back to its record, so the writer gets the same values from either parser.
+    """
+
+    def __init__(self, infile, answer_set: ET.Element):
+        super().__init__(infile)
+        self.answer_set = answer_set
+        self.records = {id(element): record for element, record in zip(answer_set.iterfind("Answer"), self.answers)}
+
+    def find_answer(self, name_tag: str) -> Answer_Record:
+        self.answer_lookups += 1
+        if self.requested is not None:
+            self.requested.add(name_tag)
+        answer_element = self.answer_set.find(f"./Answer[@name='{name_tag}']")
+        if answer_element is None:
+            return None
+        self.coverage.touch(name_tag)
+        return self.records[id(answer_element)]
+
+
+def synthetic_answer_set(answer_count: int) -> bytes:
+    """Create an answer set containing `answer_count` text answers."""
+    answer_set = ET.Element("AnswerSet", title="", version="1.1")
+    for i in range(answer_count):
+        answer = ET.SubElement(answer_set, "Answer", name=f"Synthetic Answer {i} TE")
+        ET.SubElement(answer, "TextValue").text = f"value {i}"
+    return ET.tostring(answer_set, encoding="UTF-8", xml_declaration=True)
+
+
+def xpath_find_answer(answer_set: ET.Element, name_tag: str) -> str:
+    """The pre-index lookup, kept here for comparison. `ANX_Parser` no longer keeps the XML tree, so this reads the text directly."""
+    answer_element = answer_set.find(f"./Answer[@name='{name_tag}']")
+    if answer_element is not None:
+        answer_element.set("visited", "true")
+        return answer_element[0].text
+    return None
+
+
+def index_find_answer(anx: ANX_Parser, name_tag: str) -> str:
+    return anx.parse_TextValue(anx.find_answer(name_tag))
+
+
+def time_lookups(source, names: list[str], lookup) -> float:
+    start = time.perf_counter()
+    for name in names:
+        lookup(source, name)
+    return time.perf_counter() - start
+
+
+def time_conversion(data: bytes, new_parser, repeats: int) -> dict:
+    """Convert `data` `repeats` times, and get the median time of each stage in milliseconds."""
+    parse_times, create_times = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        anx = new_parser(data)
+        parsed = time.perf_counter()
+        Knackly_Writer(anx).create()
+        created = time.perf_counter()
+        parse_times.append(parsed - start)
+        create_times.append(created - parsed)
+
+    return {
+        "parse": statistics.median(parse_times) * 1000,
+        "create": statistics.median(create_times) * 1000,
+        "lookups": anx.answer_lookups,
+    }
+
+
+def compare_lookups():
+    print(f"{'answers':>8} {'xpath (ms)':>12} {'index (ms)':>12} {'speedup':>9}")
+    for answer_count in (250, 500, 1000, 2000, 4000, 8000):
+        data = synthetic_answer_set(answer_count)
+        anx = ANX_Parser(io.BytesIO(data))
+        names = list(anx.answer_index)
+
+        xpath_time = time_lookups(ET.fromstring(data), names, xpath_find_answer)
+        index_time = time_lookups(anx, names, index_find_answer)
+        print(f"{answer_count:>8} {xpath_time * 1000:>12.2f} {index_time * 1000:>12.2f} {xpath_time / index_time:>8.0f}x")
+
+
+def compare_conversions(sizes: list[int], paddings: list[int], repeats: int):
+    print(
+        f"{'borrowers':>9} {'answers':>8} {'kB':>6} {'lookups':>8} {'xpath parse':>12} {'xpath create':>13} {'index parse':>12} "
+        f"{'index create':>13} {'speedup':>8}   (ms)"
+    )
+    for size, padding in ((size, padding) for padding in paddings for size in sizes):
+        data = generate(borrowers=size, properties=size, lenders=size, fees=size, padding=padding, seed=size)
+        answer_set = ET.fromstring(data)
+        xpath = time_conversion(data, lambda data: XPath_Parser(data, answer_set), repeats)
+        index = time_conversion(data, ANX_Parser, repeats)
+        xpath_total = xpath["parse"] + xpath["create"]
+        index_total = index["parse"] + index["create"]
+        print(
+            f"{size:>9} {len(answer_set):>8} {len(data) / 1024:>6.0f} {index['lookups']:>8} {xpath['parse']:>12.2f} {xpath['create']:>13.2f} "
+            f"{index['parse']:>12.2f} {index['create']:>13.2f} {xpath_total / index_total:>7.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare answer lookups through the name index against the old XPath scan.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16], help="numbers of borrowers to generate")
+    parser.add_argument("--padding", type=int, nargs="+", default=[0, 1000, 4000], help="extra answers the converter doesn't read")
+    parser.add_argument("--repeats", type=int, default=7, help="conversions per size; the median is reported")
+    args = parser.parse_args()
+
+    print("lookups")
+    compare_lookups()
+    print("\nconversion (median per file)")
+    compare_conversions(args.sizes, args.padding, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark the ways `ANX_Parser` can be given an .anx file.
+
+Synthetic answer sets of increasing size (grown through `padding`) are written to a temporary folder, and parsed with each engine from:
+
+- a file opened in text mode as UTF-8, which is how `main.py` used to open its input. The parser decodes it to str, and then encodes it
+  back to bytes for the XML parser.
+- its path, with the file read into memory, or memory-mapped (forced here by lowering `MMAP_THRESHOLD`, which is 1 MB by default)
+- the same answer set saved as UTF-16, by path. Opened as text, it can't be read at all.
+
+Only `ANX_Parser(...)` is timed, taking the median of several runs, and every input is checked to give the same answers.
+
+Usage:
+    python benchmarks/bench_binary_input.py [--padding 0 10000 100000] [--repeats 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from anx_generator import generate  # noqa: E402
+
+import anx_parser  # noqa: E402
+from anx_parser import ANX_Parser, lxml_etree  # noqa: E402
+
+ENGINES = ("stdlib", "lxml")
+DEFAULT_THRESHOLD = anx_parser.MMAP_THRESHOLD
+
+
+def parse_text(path: str, engine: str) -> ANX_Parser:
+    with open(path, "r", encoding="UTF-8") as f:
+        return ANX_Parser(f, engine=engine)
+
+
+def parse_path(path: str, engine: str, threshold: int) -> ANX_Parser:
+    anx_parser.MMAP_THRESHOLD = threshold
+    try:
+        return ANX_Parser(path, engine=engine)
+    finally:
+        anx_parser.MMAP_THRESHOLD = DEFAULT_THRESHOLD
+
+
+def median_ms(function, repeats: int) -> tuple[float, ANX_Parser]:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, result
+
+
+def answers(anx: ANX_Parser) -> list:
+    """The answers of an answer set as plain values, for comparing."""
+
+    def plain(record):
+        raw = tuple(plain(child) for child in record.raw) if isinstance(record.raw, tuple) else record.raw
+        return record.name, record.value_type, record.unanswered, raw
+
+    return [plain(answer) for answer in anx.answers]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare reading .anx files as text, by path, memory-mapped and as UTF-16.")
+    parser.add_argument("--padding", type=int, nargs="+", default=[0, 10000, 100000], help="extra answers to generate")
+    parser.add_argument("--repeats", type=int, default=5, help="runs per case; the median is reported")
+    args = parser.parse_args()
+
+    engines = ENGINES
+    if lxml_etree is None:
+        print("lxml isn't installed, so only the stdlib engine is timed. Install it with `pip install lxml`.\n")
+        engines = ("stdlib",)
+
+    print(f"{'padding':>8} {'MB':>6} {'engine':>7} {'text':>8} {'read':>8} {'mmap':>8} {'UTF-16':>8}   (ms)")
+    with tempfile.TemporaryDirectory() as folder:
+        for padding in args.padding:
+            data = generate(borrowers=8, properties=8, lenders=8, fees=8, padding=padding, seed=padding)
+            path = os.path.join(folder, f"loan_{padding}.anx")
+            with open(path, "wb") as f:
+                f.write(data)
+            utf16_path = os.path.join(folder, f"loan_{padding}.utf16.anx")
+            with open(utf16_path, "wb") as f:
+                f.write(data.decode("UTF-8").replace('encoding="UTF-8"', 'encoding="UTF-16"', 1).encode("UTF-16"))
+
+            for engine in engines:
+                cases = (
+                    lambda: parse_text(path, engine),
+                    lambda: parse_path(path, engine, threshold=float("inf")),
+                    lambda: parse_path(path, engine, threshold=0),
+                    lambda: parse_path(utf16_path, engine, threshold=DEFAULT_THRESHOLD),
+                )
+                results = [median_ms(case, args.repeats) for case in cases]
+                expected = answers(results[0][1])
+                if any(answers(anx) != expected for _, anx in results[1:]):
+                    print(f"{padding:>8} {engine:>7} the inputs give different answers!")
+                times = " ".join(f"{ms:>8.1f}" for ms, _ in results)
+                print(f"{padding:>8} {len(data) / 1e6:>6.1f} {engine:>7} {times}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark converting files through `conversion_server.py` against running `main.py` once per file.
+
+Synthetic answer sets of a few sizes are written to a temporary folder. Each one is converted by starting `python main.py -i ... -o ...`,
+which pays for starting Python, importing the converter and parsing arguments every time, and by posting it to a conversion server
+that was started once, on a Unix socket. Both use the same `--id-seed`, so their outputs must be byte-identical. The median latency of
+one file is reported, then the throughput of converting a batch of files through the server with several requests in flight at once.
+
+Usage:
+    python benchmarks/bench_conversion_server.py [--borrowers 1 4 16] [--repeats 10] [--workers 4] [--files 64]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from anx_generator import generate  # noqa: E402
+
+from conversion_server import Unix_HTTP_Connection  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SEED = "benchmark"
+
+
+def run_main(input_path: str, output_path: str) -> bytes:
+    command = [sys.executable, "main.py", "-i", input_path, "-o", output_path, "--id-seed", SEED]
+    subprocess.run(command, cwd=ROOT, check=True, capture_output=True)
+    with open(output_path, "rb") as f:
+        return f.read()
+
+
+def post(socket_path: str, data: bytes) -> bytes:
+    connection = Unix_HTTP_Connection(socket_path)
+    try:
+        connection.request("POST", f"/convert?id_seed={SEED}", body=data)
+        response = connection.getresponse()
+        body = response.read()
+    finally:
+        connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"The server responded {response.status}: {body.decode()}")
+    return body
+
+
+def wait_for_server(socket_path: str, server: subprocess.Popen, timeout: float = 30) -> None:
+    """Wait until the server answers its health check."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"The server exited with code {server.returncode}")
+        try:
+            connection = Unix_HTTP_Connection(socket_path)
+            connection.request("GET", "/health")
+            connection.getresponse().read()
+            connection.close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError("The server didn't start in time")
+
+
+def median_ms(function, repeats: int) -> tuple[float, bytes]:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare running main.py per file against posting files to a warm conversion server.")
+    parser.add_argument("--borrowers", type=int, nargs="+", default=[1, 4, 16], help="sizes of the generated answer sets")
+    parser.add_argument("--repeats", type=int, default=10, help="runs per case; the median is reported")
+    parser.add_argument("--workers", type=int, default=4, help="worker processes of the server, and requests in flight at once")
+    parser.add_argument("--files", type=int, default=64, help="files posted in the throughput test")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        socket_path = os.path.join(folder, "server.sock")
+        command = [sys.executable, "conversion_server.py", "--socket", socket_path, "-w", str(args.workers)]
+        server = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_server(socket_path, server)
+
+            print(f"{'borrowers':>9} {'main.py (ms)':>13} {'server (ms)':>12} {'speedup':>8}")
+            for borrowers in args.borrowers:
+                data = generate(borrowers=borrowers, depth=2, width=2, properties=borrowers, fees=borrowers)
+                input_path = os.path.join(folder, f"loan_{borrowers}.anx")
+                with open(input_path, "wb") as f:
+                    f.write(data)
+                output_path = os.path.join(folder, f"loan_{borrowers}.json")
+
+                main_ms, expected = median_ms(lambda: run_main(input_path, output_path), args.repeats)
+                post(socket_path, data)  # The first request to a worker still fills its caches
+                server_ms, output = median_ms(lambda: post(socket_path, data), args.repeats)
+                if output != expected:
+                    print(f"{borrowers:>9} the server's output is different!")
+                print(f"{borrowers:>9} {main_ms:>13.1f} {server_ms:>12.1f} {main_ms / server_ms:>7.1f}x")
+
+            files = [generate(borrowers=1 + i % 4, depth=2, width=2) for i in range(args.files)]
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.workers) as executor:
+                list(executor.map(lambda data: post(socket_path, data), files))
+            elapsed = time.perf_counter() - start
+            print(f"\n{args.files} files through the server, {args.workers} at a time: {elapsed:.2f}s ({args.files / elapsed:.1f} files/s)")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark the single-pass extraction plan against looking up each mapped key on its own.
+
+Two comparisons are made on a synthetic answer set that answers every key in `field_mapping.SECTIONS`:
+
+- "extract": `ANX_Parser.extract(EXTRACTION_PLAN)` and decoding every section, against one `find_answer()` + `parse_*()` call per
+  row of the tables.
+- "create": `Knackly_Writer.create()` as it is now, against a writer whose `mapped_section()` does one lookup per key (which is how every
+  one of those sections used to be written).
+
+Usage:
+    python benchmarks/bench_extraction_plan.py
+"""
+
+import io
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from anx_parser import ANX_Parser  # noqa: E402
+from field_mapping import EXTRACTION_PLAN, SECTIONS  # noqa: E402
+from knackly_writer import Knackly_Writer  # noqa: E402
+
+SAMPLE_VALUES = {
+    "TextValue": "Sample text",
+    "DateValue": "15/06/2024",
+    "NumValue": "1250.5",
+    "TFValue": "true",
+    "MCValue": "Sample selection",
+}
+REPEATS = 200
+
+
+class Per_Key_Writer(Knackly_Writer):
+    """A writer that fills in the mapped sections the old way: one lookup and parse per key."""
+
+    def mapped_section(self, section: str) -> dict:
+        result = {}
+        for key, answer_name, value_type in SECTIONS[section]:
+            if answer_name is None:
+                result[key] = None
+            elif value_type is None:
+                result[key] = self.anx.parse_field(answer_name)
+            else:
+                result[key] = getattr(self.anx, f"parse_{value_type}")(self.anx.find_answer(answer_name))
+        return result
+
+
+def add_answer(answer_set: ET.Element, name: str, value_type: str, text: str) -> None:
+    answer = ET.SubElement(answer_set, "Answer", name=name)
+    if value_type == "MCValue":
+        ET.SubElement(ET.SubElement(answer, "MCValue"), "SelValue").text = text
+    elif value_type == "RptValue":
+        ET.SubElement(ET.SubElement(answer, "RptValue"), "TextValue").text = text
+    else:
+        ET.SubElement(answer, value_type).text = text
+
+
+def synthetic_answer_set(padding: int) -> bytes:
+    """Create an answer set that answers every mapped key, plus `padding` answers that nothing reads."""
+    answer_set = ET.Element("AnswerSet", title="", version="1.1")
+    add_answer(answer_set, "Client Specific Pass Store TX", "TextValue", "trans")
+    add_answer(answer_set, "Client MC", "MCValue", "DLP")
+    answer = ET.SubElement(answer_set, "Answer", name="Exhibit A Lender List TF")
+    ET.SubElement(ET.SubElement(answer, "RptValue"), "TFValue").text = "false"
+
+    for answer_name, targets in EXTRACTION_PLAN.targets.items():
+        value_type = targets[0][2] or "TFValue"
+        add_answer(answer_set, answer_name, value_type, SAMPLE_VALUES.get(value_type, "Sample text"))
+    for i in range(padding):
+        add_answer(answer_set, f"Unused Answer {i} TE", "TextValue", f"value {i}")
+
+    return ET.tostring(answer_set, encoding="UTF-8", xml_declaration=True)
+
+
+def time_it(func) -> float:
+    """Average time of `func()` in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        func()
+    return (time.perf_counter() - start) * 1000 / REPEATS
+
+
+def per_key_extract(anx: ANX_Parser) -> None:
+    writer = Per_Key_Writer(anx)
+    for section in SECTIONS:
+        writer.mapped_section(section)
+
+
+def plan_extract(anx: ANX_Parser) -> None:
+    matches = anx.extract(EXTRACTION_PLAN)
+    for section in SECTIONS:
+        anx.decode_section(EXTRACTION_PLAN, section, matches[section])
+
+
+def create(writer_class: type, data: bytes) -> None:
+    writer_class(ANX_Parser(io.BytesIO(data))).create()
+
+
+def main():
+    print(f"{'answers':>8} {'per-key extract':>16} {'plan extract':>13} {'per-key create':>15} {'plan create':>12}   (ms)")
+    for padding in (0, 250, 1000):
+        data = synthetic_answer_set(padding)
+        anx = ANX_Parser(io.BytesIO(data))
+
+        per_key_extract_time = time_it(lambda: per_key_extract(anx))
+        plan_extract_time = time_it(lambda: plan_extract(anx))
+        per_key_create_time = time_it(lambda: create(Per_Key_Writer, data))
+        plan_create_time = time_it(lambda: create(Knackly_Writer, data))
+        print(
+            f"{len(anx.answer_index):>8} {per_key_extract_time:>16.3f} {plan_extract_time:>13.3f} "
+            f"{per_key_create_time:>15.3f} {plan_create_time:>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
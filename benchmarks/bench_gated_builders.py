@@ -0,0 +1,86 @@
+"""Benchmark skipping the gated sub-builders of `Knackly_Writer` (see `Knackly_Writer.is_gate_open()`).
+
+Two versions of a synthetic loan from `anx_generator.py` are converted: the generated one, where every feature is switched on, and a
+typical plain loan, where "Interest Step TF", "Credit Line TF", "Construction Holdback TF" and "Impound Accounts TF" are false and the
+answers behind them aren't in the file. Each is converted by `Knackly_Writer` as it is now, and by a writer that runs every sub-builder
+regardless of its gate (which is how `create()` used to work). For both, the answer lookups, the "id$" placeholders handed out and the
+median time of `create()` are reported, and the outputs are checked to be the same.
+
+Usage:
+    python benchmarks/bench_gated_builders.py [--repeats 200]
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from anx_generator import generate  # noqa: E402
+
+from anx_parser import ANX_Parser  # noqa: E402
+from knackly_writer import GATED_ANSWERS, Knackly_Writer  # noqa: E402
+
+GATES = ("Interest Step TF", "Credit Line TF", "Construction Holdback TF", "Impound Accounts TF")
+OBJECT_ID = re.compile(r'"[0-9a-f]{24}"')
+
+
+class Ungated_Writer(Knackly_Writer):
+    """A writer that runs every gated sub-builder, the way `create()` used to."""
+
+    def is_gate_open(self, builder: str, gate) -> bool:
+        return True
+
+
+def plain_loan(data: bytes) -> bytes:
+    """Switch every gate off, and remove the answers behind them."""
+    answer_set = ET.fromstring(data)
+    gated = {name for names in GATED_ANSWERS.values() for name in names}
+    for answer in list(answer_set):
+        name = answer.get("name")
+        if name in GATES:
+            answer[0].text = "false"
+        elif name in gated:
+            answer_set.remove(answer)
+    return ET.tostring(answer_set, encoding="UTF-8", xml_declaration=True)
+
+
+def measure(writer_class: type, data: bytes, repeats: int) -> tuple[int, int, float, str]:
+    """Get the answer lookups, the ids requested, the median milliseconds of `create()` and the output (with its ids blanked out)."""
+    times = []
+    for _ in range(repeats):
+        writer = writer_class(ANX_Parser(io.BytesIO(data)))
+        start = time.perf_counter()
+        writer.create()
+        times.append(time.perf_counter() - start)
+    output = OBJECT_ID.sub('"id"', json.dumps(writer.json))
+    return writer.anx.answer_lookups, writer.ids.requested, statistics.median(times) * 1000, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare create() with and without skipping gated sub-builders.")
+    parser.add_argument("--repeats", type=int, default=200, help="runs per case; the median is reported")
+    args = parser.parse_args()
+
+    generated = generate()
+    loans = {"all features": generated, "plain loan": plain_loan(generated)}
+
+    print(f"{'loan':>13} {'writer':>8} {'lookups':>8} {'ids':>5} {'create (ms)':>12}")
+    for label, data in loans.items():
+        outputs = set()
+        for writer_label, writer_class in (("ungated", Ungated_Writer), ("gated", Knackly_Writer)):
+            lookups, ids, create_ms, output = measure(writer_class, data, args.repeats)
+            outputs.add(output)
+            print(f"{label:>13} {writer_label:>8} {lookups:>8} {ids:>5} {create_ms:>12.3f}")
+        if len(outputs) > 1:
+            print(f"{'':>13} the outputs are different!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark re-converting a revised answer file against the output of the previous revision (see `incremental.py`).
+
+For synthetic answer sets of increasing size, a first revision is converted while recording a snapshot. A second revision changes a
+single answer (by default the loan amount, which only the loan terms read) and is converted twice: from scratch, and incrementally
+against the first revision's output and snapshot. Reading the answer file costs the same either way, so only `Knackly_Writer.create()`
+is timed. The incremental output must be the same as the full one once ids are ignored. The median times, the number of sections copied
+and the share of ids kept are reported.
+
+Usage:
+    python benchmarks/bench_incremental.py [--borrowers 1 4 16 64] [--answer "Loan Amount NU"] [--repeats 20]
+"""
+
+import argparse
+import copy
+import io
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from anx_generator import generate  # noqa: E402
+
+from anx_parser import ANX_Parser  # noqa: E402
+from incremental import Revision_Tracker  # noqa: E402
+from knackly_writer import Knackly_Writer  # noqa: E402
+
+ID = re.compile(r'"[0-9a-f]{24}"')
+
+
+def revise(data: bytes, answer: str) -> bytes:
+    """Change the value of every text or number in one answer."""
+    root = ET.fromstring(data)
+    for element in root.iter():
+        if element.tag == "Answer" and element.get("name") == answer:
+            for value in element.iter():
+                if value.tag == "NumValue" and value.text:
+                    value.text = str(float(value.text) + 1)
+                elif value.tag == "TextValue" and value.text:
+                    value.text += " (revised)"
+    return ET.tostring(root)
+
+
+def convert(anx: ANX_Parser, revision: Revision_Tracker = None) -> Knackly_Writer:
+    writer = Knackly_Writer(anx, revision=revision)
+    writer.create()
+    return writer
+
+
+def without_ids(document: dict) -> str:
+    """The document as JSON, with each id replaced by the order it first appears in."""
+    ids = {}
+    return ID.sub(lambda match: ids.setdefault(match.group(0), f'"{len(ids)}"'), json.dumps(document))
+
+
+def median_ms(function, arguments: list[tuple]) -> tuple[float, object]:
+    """Call `function` once with each of `arguments`, made up front so that only the calls are timed."""
+    times = []
+    for argument in arguments:
+        start = time.perf_counter()
+        result = function(*argument)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare converting a revised answer file from scratch and incrementally.")
+    parser.add_argument("--borrowers", type=int, nargs="+", default=[1, 4, 16, 64], help="sizes of the generated answer sets")
+    parser.add_argument("--answer", default="Loan Amount NU", help="the answer that changes between the two revisions")
+    parser.add_argument("--repeats", type=int, default=20, help="runs per case; the median is reported")
+    args = parser.parse_args()
+
+    print(f"{'borrowers':>9} {'full create (ms)':>17} {'incremental create (ms)':>24} {'sections copied':>16} {'ids kept':>9}")
+    for borrowers in args.borrowers:
+        first = generate(borrowers=borrowers, depth=3, width=3, properties=borrowers, fees=borrowers)
+        second = revise(first, args.answer)
+        recorded = Revision_Tracker()
+        # Round tripped through JSON, the same as reading them back from disk
+        document = json.loads(json.dumps(convert(ANX_Parser(io.BytesIO(first)), recorded).json))
+        snapshot = json.loads(json.dumps(recorded.snapshot()))
+
+        # A fresh parser for every run, since parsed values are kept on the answer records
+        full_ms, full = median_ms(convert, [(ANX_Parser(io.BytesIO(second)),) for _ in range(args.repeats)])
+        # The tracker moves sections out of the document, so each run gets its own copy
+        runs = [(ANX_Parser(io.BytesIO(second)), Revision_Tracker(copy.deepcopy(document), snapshot)) for _ in range(args.repeats)]
+        incremental_ms, writer = median_ms(convert, runs)
+        if without_ids(writer.json) != without_ids(full.json):
+            print(f"{borrowers:>9} the incremental output is different!")
+
+        previous_ids = set(ID.findall(json.dumps(document)))
+        ids = set(ID.findall(json.dumps(writer.json)))
+        copied = f"{len(writer.revision.reused)} of {len(writer.revision.sections)}"
+        kept = len(ids & previous_ids) / len(ids) if ids else 1
+        print(f"{borrowers:>9} {full_ms:>17.2f} {incremental_ms:>24.2f} {copied:>16} {kept:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark the ways `json_output` can write a converted document.
+
+A synthetic answer set from `anx_generator.py` is converted, and the document is written into memory with each combination of encoder
+(the standard library's json, and orjson if it is installed) and layout (indented or compact). Streamed output is timed as `create()`
+plus writing, against `create()` followed by writing the whole document. The median of several runs is reported, along with the size
+of the output.
+
+Usage:
+    python benchmarks/bench_json_output.py [--borrowers 32] [--repeats 7]
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from anx_generator import generate  # noqa: E402
+
+from anx_parser import ANX_Parser  # noqa: E402
+from json_output import Object_Stream, Output_Format, load_orjson, write_json  # noqa: E402
+from knackly_writer import Knackly_Writer  # noqa: E402
+
+
+def time_write(data: bytes, output_format: Output_Format, repeats: int) -> tuple[float, float, int]:
+    """Get the median milliseconds spent writing and spent in `create()` plus writing, and the size of the output in bytes."""
+    write_times = []
+    total_times = []
+    for _ in range(repeats):
+        writer = Knackly_Writer(ANX_Parser(io.BytesIO(data)))
+        out = io.BytesIO()
+        start = time.perf_counter()
+        if output_format.stream:
+            output = Object_Stream(out, output_format)
+            writer.create(output)
+            created = time.perf_counter()
+            output.close()
+        else:
+            writer.create()
+            created = time.perf_counter()
+            write_json(writer.json, out, output_format)
+        end = time.perf_counter()
+        write_times.append(end - created)
+        total_times.append(end - start)
+    return statistics.median(write_times) * 1000, statistics.median(total_times) * 1000, len(out.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the JSON encoders and layouts of json_output.")
+    parser.add_argument("--borrowers", type=int, default=32, help="size of the generated answer set")
+    parser.add_argument("--repeats", type=int, default=7, help="runs per case; the median is reported")
+    args = parser.parse_args()
+
+    encoders = ("json", "orjson")
+    if load_orjson() is None:
+        print("orjson isn't installed, so only the json encoder is timed. Install it with `pip install orjson`.\n")
+        encoders = ("json",)
+
+    data = generate(borrowers=args.borrowers, properties=args.borrowers, lenders=args.borrowers, fees=args.borrowers)
+    print(f"{'encoder':>8} {'layout':>9} {'mode':>7} {'write':>9} {'create+write':>13} {'kB':>7}   (ms)")
+    for encoder in encoders:
+        for compact in (False, True):
+            for stream in (False, True):
+                write_ms, total_ms, size = time_write(data, Output_Format(compact, encoder, stream), args.repeats)
+                layout = "compact" if compact else "indented"
+                mode = "stream" if stream else "whole"
+                print(f"{encoder:>8} {layout:>9} {mode:>7} {write_ms:>9.2f} {total_ms:>13.2f} {size / 1024:>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark generating the "id$" values of a document.
+
+Four ways of getting `COUNT` ids are compared:
+
+- "bson": `str(ObjectId())` once per id, which is how `Knackly_Writer` used to do it.
+- "object_ids": `object_ids.new_object_id()` once per id.
+- "allocator": `Id_Allocator.new()` once per id, then `resolve()` on a tree where only some of the placeholders survived clean up,
+  which is what `Knackly_Writer` does now.
+- "allocator with a seed": the same, with deterministic ids derived from a seed and each object's path (`--id-seed`).
+
+Usage:
+    python benchmarks/bench_object_ids.py
+"""
+
+import os
+import sys
+import time
+
+from bson import ObjectId
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from object_ids import Id_Allocator, new_object_id  # noqa: E402
+
+COUNT = 5000
+REPEATS = 20
+
+
+def time_it(func) -> float:
+    """Average time of `func()` in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        func()
+    return (time.perf_counter() - start) * 1000 / REPEATS
+
+
+def bson_ids() -> list[dict]:
+    return [{"id$": str(ObjectId())} for _ in range(COUNT)]
+
+
+def object_ids() -> list[dict]:
+    return [{"id$": new_object_id()} for _ in range(COUNT)]
+
+
+def allocator_ids(survival: float, seed: str = None) -> list[dict]:
+    ids = Id_Allocator(seed)
+    tree = [{"id$": ids.new()} for _ in range(COUNT)]
+    # Clean up throws away the dictionaries that only had an id
+    tree = tree[: int(COUNT * survival)]
+    return ids.resolve(tree, ids.root_path())
+
+
+def main():
+    bson_time = time_it(bson_ids)
+    object_ids_time = time_it(object_ids)
+    print(f"{COUNT} ids (ms): bson {bson_time:.2f}, object_ids {object_ids_time:.2f} ({bson_time / object_ids_time:.1f}x)")
+    for survival in (1.0, 0.5, 0.25):
+        allocator_time = time_it(lambda: allocator_ids(survival))
+        print(f"  allocator with {survival:.0%} surviving clean up: {allocator_time:.2f} ({bson_time / allocator_time:.1f}x)")
+    seeded_time = time_it(lambda: allocator_ids(1.0, seed="benchmark"))
+    print(f"  allocator with a seed, all surviving clean up: {seeded_time:.2f} ({bson_time / seeded_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
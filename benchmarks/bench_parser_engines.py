@@ -0,0 +1,74 @@
+"""Benchmark the lxml and standard library engines of `ANX_Parser` against each other.
+
+Synthetic answer sets from `anx_generator.py` are parsed with each engine, in both the default mode (the whole answer set is kept) and
+streaming mode (only the answers the converter reads are kept). Large answer files are mostly answers the converter never reads, so the
+sizes grow through `padding`. Each case is timed as `ANX_Parser(...)` construction followed by `Knackly_Writer.create()`, taking the
+median of several runs, and the outputs of both engines are checked to be the same.
+
+The lxml engine is skipped with a message if lxml isn't installed.
+
+Usage:
+    python benchmarks/bench_parser_engines.py [--padding 0 1000 10000 50000] [--repeats 5]
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from anx_generator import generate  # noqa: E402
+
+from anx_parser import ANX_Parser, lxml_etree  # noqa: E402
+from knackly_writer import Knackly_Writer, consumed_answer_names  # noqa: E402
+
+ENGINES = ("stdlib", "lxml")
+OBJECT_ID = re.compile(r'"[0-9a-f]{24}"')
+
+
+def convert(data: bytes, engine: str, answer_names) -> tuple[float, float, str]:
+    """Convert `data` once, and get the parse and create times in milliseconds, along with the output with its ids blanked out."""
+    start = time.perf_counter()
+    anx = ANX_Parser(io.BytesIO(data), answer_names, engine=engine)
+    parsed = time.perf_counter()
+    writer = Knackly_Writer(anx)
+    writer.create()
+    created = time.perf_counter()
+    # Every run generates new ids, so leave them out of the comparison
+    output = OBJECT_ID.sub('"id"', json.dumps(writer.json))
+    return (parsed - start) * 1000, (created - parsed) * 1000, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the lxml and stdlib engines of ANX_Parser.")
+    parser.add_argument("--padding", type=int, nargs="+", default=[0, 1000, 10000, 50000], help="extra answers to generate")
+    parser.add_argument("--repeats", type=int, default=5, help="runs per case; the median is reported")
+    args = parser.parse_args()
+
+    engines = ENGINES
+    if lxml_etree is None:
+        print("lxml isn't installed, so only the stdlib engine is timed. Install it with `pip install lxml`.\n")
+        engines = ("stdlib",)
+
+    print(f"{'padding':>8} {'kB':>7} {'mode':>7} {'engine':>7} {'parse':>9} {'create':>9}   (ms)")
+    for padding in args.padding:
+        data = generate(borrowers=8, properties=8, lenders=8, fees=8, padding=padding, seed=padding)
+        for mode, answer_names in (("full", None), ("stream", consumed_answer_names())):
+            outputs = {}
+            for engine in engines:
+                runs = [convert(data, engine, answer_names) for _ in range(args.repeats)]
+                parse_ms = statistics.median(run[0] for run in runs)
+                create_ms = statistics.median(run[1] for run in runs)
+                outputs[engine] = runs[0][2]
+                print(f"{padding:>8} {len(data) / 1024:>7.0f} {mode:>7} {engine:>7} {parse_ms:>9.2f} {create_ms:>9.2f}")
+            if len(set(outputs.values())) > 1:
+                print(f"{'':>8} the engines produced different output for padding={padding}, mode={mode}")
+
+
+if __name__ == "__main__":
+    main()
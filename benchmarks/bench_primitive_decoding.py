@@ -0,0 +1,104 @@
+"""Microbenchmarks for decoding the primitive values of an .anx file.
+
+Each value type is timed the way `ANX_Parser` used to decode it against the way it does now:
+
+- DateValue: `datetime.strptime()` + `strftime()`, against the DD/MM/YYYY fast path of `decode_date()`, uncached and cached.
+- NumValue: `float()` + `is_integer()`, against `decode_number()` uncached and cached, for integers and decimals. Uncached, the two are the
+  same code (an `int()` fast path for integers was tried, and was slower), so the difference comes from the cache.
+- Dispatch: `parse_Primitive()` building its dictionary of bound methods on every call, against the module level `PRIMITIVE_PARSERS`.
+
+The raw strings are drawn from a small pool, like the dates and amounts that repeat throughout a real answer file. Every new decoder is
+checked to give the same result as the old code on the whole pool before it is timed.
+
+Usage:
+    python benchmarks/bench_primitive_decoding.py [--values 10000] [--distinct 200] [--repeats 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from anx_parser import ANX_Parser, Answer_Record, ANXTagError, decode_date, decode_number  # noqa: E402
+
+
+def old_decode_date(raw: str) -> str:
+    return datetime.strptime(raw, "%d/%m/%Y").strftime("%Y-%m-%d")
+
+
+def old_decode_number(raw: str) -> int | float:
+    f = float(raw)
+    if f.is_integer():
+        return int(f)
+    return f
+
+
+def old_parse_Primitive(self: ANX_Parser, element: Answer_Record):
+    mapping = {
+        "TextValue": self.parse_TextValue,
+        "DateValue": self.parse_DateValue,
+        "NumValue": self.parse_NumValue,
+        "TFValue": self.parse_TFValue,
+        "SelValue": self.parse_SelValue,
+        "MCValue": self.parse_MCValue,
+    }
+
+    if element.value_type not in mapping:
+        raise ANXTagError(" | ".join(mapping.keys()), element.value_type)
+    return mapping[element.value_type](element)
+
+
+def best_ms(function, values: list, repeats: int) -> float:
+    """The fastest of `repeats` runs of decoding every value, in milliseconds."""
+    return min(timeit.repeat(lambda: [function(value) for value in values], number=1, repeat=repeats)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the old and new decoding of primitive .anx values.")
+    parser.add_argument("--values", type=int, default=10000, help="values decoded per run")
+    parser.add_argument("--distinct", type=int, default=200, help="distinct raw strings the values are drawn from")
+    parser.add_argument("--repeats", type=int, default=5, help="runs per case; the fastest is reported")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pools = {
+        "dates": [f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(1990, 2040)}" for _ in range(args.distinct)],
+        "integers": [str(rng.randint(0, 5_000_000)) for _ in range(args.distinct)],
+        "decimals": [f"{rng.uniform(0, 100):.3f}" for _ in range(args.distinct)],
+    }
+    values = {kind: [rng.choice(pool) for _ in range(args.values)] for kind, pool in pools.items()}
+    cases = (
+        ("dates", old_decode_date, decode_date),
+        ("integers", old_decode_number, decode_number),
+        ("decimals", old_decode_number, decode_number),
+    )
+
+    print(f"{'values':>10} {'old (ms)':>9} {'uncached':>10} {'cached':>8}")
+    for kind, old, new in cases:
+        if [old(value) for value in pools[kind]] != [new.__wrapped__(value) for value in pools[kind]]:
+            print(f"{kind:>10} the new decoder gives different results!")
+        old_ms = best_ms(old, values[kind], args.repeats)
+        uncached_ms = best_ms(new.__wrapped__, values[kind], args.repeats)
+        new(values[kind][0])  # Make sure the cache is in use
+        cached_ms = best_ms(new, values[kind], args.repeats)
+        print(f"{kind:>10} {old_ms:>9.2f} {uncached_ms:>10.2f} {cached_ms:>8.2f}")
+
+    # Dispatch, on records whose values are already decoded so that only the lookup of the parse method is timed
+    anx = ANX_Parser.__new__(ANX_Parser)
+    anx.parse_cache_hits = 0
+    raw_values = (("TextValue", "text"), ("NumValue", "12"), ("TFValue", "true"))
+    records = [Answer_Record(None, value_type, False, raw) for value_type, raw in raw_values]
+    for record in records:
+        anx.parse_Primitive(record)
+    dispatched = [rng.choice(records) for _ in range(args.values)]
+    old_ms = best_ms(lambda record: old_parse_Primitive(anx, record), dispatched, args.repeats)
+    new_ms = best_ms(anx.parse_Primitive, dispatched, args.repeats)
+    print(f"\n{'dispatch':>10} {old_ms:>9.2f} {new_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
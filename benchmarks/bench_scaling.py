@@ -0,0 +1,136 @@
+"""Benchmark how each stage of a conversion scales with the size of the answer set.
+
+Synthetic answer sets from `anx_generator.py` are converted with increasing numbers of borrowers (and, with them, properties, lenders
+and fee rows). Three stages are timed separately, taking the median of several runs:
+
+- "parse": `ANX_Parser(...)` construction, reading the .anx file from memory
+- "create": `Knackly_Writer.create()`
+- "dump": `json.dump(writer.json, ..., indent=2)` into memory, as `main.py` does
+
+The results are printed as a table, followed by a text chart of each stage against the number of values in the answer set. With
+`--plot`, the chart is also saved as an image (this needs matplotlib, which isn't a requirement of the converter). With `--save`, the
+raw results are written as JSON, so runs from before and after a change can be compared.
+
+Usage:
+    python benchmarks/bench_scaling.py [--sizes 1 2 4 8 16 32] [--repeats 7] [--plot scaling.png] [--save results.json]
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from anx_generator import generate  # noqa: E402
+
+from anx_parser import ANX_Parser  # noqa: E402
+from knackly_writer import Knackly_Writer  # noqa: E402
+
+STAGES = ("parse", "create", "dump")
+VALUE_TAGS = {"TextValue", "NumValue", "TFValue", "DateValue", "MCValue"}
+CHART_WIDTH = 50
+
+
+def count_values(data: bytes) -> int:
+    """Count the values in an answer set. Every row of a repeated answer is its own value, unlike `len(anx.answer_index)`."""
+    return sum(1 for element in ET.fromstring(data).iter() if element.tag in VALUE_TAGS)
+
+
+def time_stages(data: bytes, repeats: int) -> dict:
+    """Convert `data` `repeats` times, and get the median time of each stage in milliseconds."""
+    timings = {stage: [] for stage in STAGES}
+    for _ in range(repeats):
+        start = time.perf_counter()
+        anx = ANX_Parser(io.BytesIO(data))
+        parsed = time.perf_counter()
+        writer = Knackly_Writer(anx)
+        writer.create()
+        created = time.perf_counter()
+        json.dump(writer.json, io.StringIO(), indent=2)
+        dumped = time.perf_counter()
+
+        timings["parse"].append(parsed - start)
+        timings["create"].append(created - parsed)
+        timings["dump"].append(dumped - created)
+
+    result = {stage: statistics.median(values) * 1000 for stage, values in timings.items()}
+    result["values"] = count_values(data)
+    result["bytes"] = len(data)
+    return result
+
+
+def text_chart(results: list[dict]) -> str:
+    """Draw one horizontal bar per stage and size, all on the same scale."""
+    longest = max(result[stage] for result in results for stage in STAGES)
+    lines = []
+    for result in results:
+        for stage in STAGES:
+            bar = "#" * max(1, round(result[stage] / longest * CHART_WIDTH))
+            label = f"{result['values']} values" if stage == STAGES[0] else ""
+            lines.append(f"{label:>14} {stage:>6} |{bar} {result[stage]:.2f}ms")
+    return "\n".join(lines)
+
+
+def save_plot(results: list[dict], path: str) -> None:
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print(f"matplotlib isn't installed, so {path} wasn't created. Install it with `pip install matplotlib`.")
+        return
+
+    values = [result["values"] for result in results]
+    figure, axes = plt.subplots()
+    for stage in STAGES:
+        axes.plot(values, [result[stage] for result in results], marker="o", label=stage)
+    axes.set_xlabel("values in the .anx file")
+    axes.set_ylabel("median time (ms)")
+    axes.set_title("anx2json conversion time by stage")
+    axes.legend()
+    figure.savefig(path)
+    print(f"Saved plot to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time parsing, create() and json.dump against the size of the answer set.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32], help="numbers of borrowers to generate")
+    parser.add_argument("--repeats", type=int, default=7, help="runs per size; the median is reported")
+    parser.add_argument("--depth", type=int, default=3, help="levels of borrower signers / owners (1-3)")
+    parser.add_argument("--width", type=int, default=2, help="signers / owners at each level")
+    parser.add_argument("--plot", help="also save a chart to this image file (needs matplotlib)")
+    parser.add_argument("--save", help="also save the results to this .json file")
+    args = parser.parse_args()
+
+    print(f"{'borrowers':>9} {'values':>8} {'kB':>7} {'parse':>8} {'create':>8} {'dump':>8} {'total':>8}   (ms)")
+    results = []
+    for size in args.sizes:
+        data = generate(borrowers=size, depth=args.depth, width=args.width, properties=size, lenders=size, fees=size, seed=size)
+        result = time_stages(data, args.repeats)
+        result["borrowers"] = size
+        results.append(result)
+        total = sum(result[stage] for stage in STAGES)
+        print(
+            f"{size:>9} {result['values']:>8} {result['bytes'] / 1024:>7.0f} "
+            f"{result['parse']:>8.2f} {result['create']:>8.2f} {result['dump']:>8.2f} {total:>8.2f}"
+        )
+
+    print()
+    print(text_chart(results))
+
+    if args.plot:
+        save_plot(results, args.plot)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved results to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark how long `main.py` takes to start, with `python -X importtime`.
+
+Each case runs `main.py` in a fresh interpreter, the way the upload portal and scripts call it:
+
+- `--help`, and an argument error, which shouldn't import the converter at all
+- converting a small generated answer file, with and without streaming (-s)
+
+For each case, the median wall time and the time spent importing modules beyond what a bare `python -c pass` imports are reported,
+along with the heaviest modules imported at the top level, by `main.py` or by a function that runs (argparse imports shutil when it
+formats the help, for instance). The time `--help` spends importing is checked against `--budget` (in ms), and the script exits with
+status 1 when it is over, so the budget can be tracked in CI.
+
+Import times depend on whether the bytecode of each module is up to date: where it can't be written (`PYTHONDONTWRITEBYTECODE`, a read
+only install), run `python -m compileall .` first, or every module is compiled again on every run.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeats 10] [--budget 60] [--top 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from anx_generator import generate  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+DEFAULT_BUDGET_MS = 60  # Import time of `main.py --help`, beyond that of the bare interpreter
+
+
+def import_times(arguments: list[str]) -> tuple[float, dict[str, float]]:
+    """Run `python -X importtime` with `arguments`.
+
+    Returns:
+        tuple[float, dict[str, float]]: Milliseconds spent importing in total, and the cumulative milliseconds of each module imported
+        at the top level (not by another module).
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", *arguments], cwd=ROOT, capture_output=True, text=True)
+    total = 0
+    top_level = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        total += int(own)
+        if not name[1:].startswith(" "):
+            top_level[name.strip()] = int(cumulative) / 1000
+    return total / 1000, top_level
+
+
+def median_wall_ms(arguments: list[str], repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *arguments], cwd=ROOT, capture_output=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the startup time of main.py with python -X importtime.")
+    parser.add_argument("--repeats", type=int, default=10, help="runs per case; the median is reported")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_MS, help="import time allowed for --help, in ms")
+    parser.add_argument("--top", type=int, default=5, help="how many of the heaviest imports to list for each case")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        input_path = os.path.join(folder, "loan.anx")
+        output_path = os.path.join(folder, "loan.json")
+        with open(input_path, "wb") as f:
+            f.write(generate(borrowers=1, depth=1, width=1))
+
+        cases = {
+            "--help": ["main.py", "--help"],
+            "argument error": ["main.py", "-i", input_path],
+            "convert": ["main.py", "-i", input_path, "-o", output_path],
+            "convert -s": ["main.py", "-s", "-i", input_path, "-o", output_path],
+        }
+        # Warm up the file system cache and any bytecode the first run writes
+        for arguments in cases.values():
+            subprocess.run([sys.executable, *arguments], cwd=ROOT, capture_output=True)
+
+        baseline_wall = median_wall_ms(["-c", "pass"], args.repeats)
+        baseline_runs = [import_times(["-c", "pass"]) for _ in range(args.repeats)]
+        baseline_imports = statistics.median(total for total, _ in baseline_runs)
+        print(f"python -c pass: {baseline_wall:.1f} ms, of which {baseline_imports:.1f} ms importing\n")
+
+        print(f"{'case':>15} {'wall (ms)':>10} {'imports (ms)':>13}  heaviest imports (ms)")
+        help_imports = None
+        for case, arguments in cases.items():
+            wall = median_wall_ms(arguments, args.repeats) - baseline_wall
+            runs = [import_times(arguments) for _ in range(args.repeats)]
+            imports = statistics.median(total for total, _ in runs) - baseline_imports
+            # The modules the interpreter imports on its own (site, encodings, ...) are left out
+            top_level = {name: ms for name, ms in runs[-1][1].items() if name not in baseline_runs[-1][1]}
+            heaviest = sorted(top_level, key=top_level.get, reverse=True)[: args.top]
+            print(f"{case:>15} {wall:>10.1f} {imports:>13.1f}  {', '.join(f'{name} {top_level[name]:.1f}' for name in heaviest)}")
+            if case == "--help":
+                help_imports = imports
+
+    print("\nWall and import times are beyond those of python -c pass.")
+    if help_imports > args.budget:
+        print(f"--help spends {help_imports:.1f} ms importing, over the budget of {args.budget:g} ms")
+        sys.exit(1)
+    print(f"--help spends {help_imports:.1f} ms importing, within the budget of {args.budget:g} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,196 @@
+import multiprocessing
 import os
-from time import sleep
+import queue
+import threading
+from time import time
+from typing import NamedTuple
 
 import main
+from conversion_cache import DEFAULT_MAX_BYTES, PARTIAL_SUFFIX, Conversion_Cache
+from folder_watcher import Arrival, watch_folder
 
+INPUT_FOLDER_PATH = "user_experience/input"
+OUTPUT_FOLDER_PATH = "user_experience/output"
+DEAD_LETTER_FOLDER_PATH = "user_experience/dead_letter"
+CACHE_FOLDER_PATH = "user_experience/cache"
 
-class Args:
-    """Convenience class to simulate the Namespace object provided to `main.main()`"""
-
-    def __init__(self, input_path, output_path):
-        self.input = input_path
-        self.output = output_path
-        self.verbose = None
-        self.exclude = None
-
-
-def continuous():
-    """Main function to continuously look at the input folder and convert + move any .anx files found into the output folder."""
-    input_folder_path = "user_experience/input"
-    output_folder_path = "user_experience/output"
-    iteration = 1
-    while True:
-        # Look at each file in the input folder
-        files = os.listdir(input_folder_path)
-        out_files = os.listdir(output_folder_path)
-        for file in files:
-            # If the file is not .anx, just skip it
-            base_name, extension = os.path.splitext(file)
-            if extension != ".anx":
-                continue
-            # If the .anx file already exists in the output folder, also skip it. We don't want to allow overwriting files.
-            if file in out_files:
-                print(f"Refusing to convert {file} as there already exists a file with the same name in {output_folder_path}")
-                continue
-
-            # call main.py for the file, directing the converted file to the output folder
-            with open(
-                f"user_experience/input/{base_name}{extension}",
-                mode="r",
-                encoding="UTF-8",
-            ) as in_file:
-                with open(f"user_experience/output/{base_name}.json", mode="w") as out_file:
-                    args = Args(in_file, out_file)
-
-                    try:
-                        main.main(args)
-                    except Exception as e:
-                        print(f"Something went wrong with {base_name}: {e}")
-                        continue
-
-                    # move the .anx file into the output folder as well
-                    os.rename(f"{input_folder_path}/{file}", f"{output_folder_path}/{file}")
-
-        # Delay the program for 30 seconds
-        print(f"Finished iteration {iteration}")
-        sleep(15)
-        iteration += 1
+
+class Job(NamedTuple):
+    """A file waiting to be converted, and how many times that has already been tried."""
+
+    arrival: Arrival
+    attempt: int = 1
+
+
+def run_conversion(input_path: str, output_path: str, cache: Conversion_Cache | None, sender) -> None:
+    """Entry point of the child process that converts one file. Sends the result of `main.convert_file()` back through `sender`."""
+    sender.send(main.convert_file(input_path, output_path, cache=cache))
+    sender.close()
+
+
+def convert_with_timeout(input_path: str, output_path: str, timeout: float, cache: Conversion_Cache = None) -> str | None:
+    """Convert a file in its own process, killing that process if it takes longer than `timeout` seconds.
+
+    Returns:
+        str | None: A description of the error if the conversion failed or timed out, otherwise None.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=run_conversion, args=(input_path, output_path, cache, sender), daemon=True)
+    process.start()
+    sender.close()
+
+    try:
+        if receiver.poll(timeout):
+            return receiver.recv()
+        process.terminate()
+        error = f"Timed out after {timeout:g}s"
+    except EOFError:
+        # The process died (e.g. it ran out of memory) without sending anything back
+        process.join()
+        error = f"Conversion process exited with code {process.exitcode}"
+    finally:
+        process.join()
+        receiver.close()
+
+    # A process that was killed leaves whatever it had written of the output behind, under its temporary name
+    try:
+        os.remove(f"{output_path}{PARTIAL_SUFFIX}")
+    except OSError:
+        pass
+    return error
+
+
+class Conversion_Pool:
+    """Converts the files pushed onto a bounded queue with a pool of worker processes, retrying failures with exponential backoff.
+
+    Files that still fail after `max_attempts` are moved into the dead-letter folder, next to a .txt file describing the last error.
+    With a `cache`, a file whose exact contents were converted before is copied from there instead of being converted again.
+    """
+
+    def __init__(
+        self,
+        output_folder_path: str,
+        dead_letter_folder_path: str,
+        workers: int,
+        queue_size: int,
+        timeout: float,
+        max_attempts: int,
+        backoff: float,
+        cache: Conversion_Cache = None,
+    ):
+        self.output_folder_path = output_folder_path
+        self.dead_letter_folder_path = dead_letter_folder_path
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.cache = cache
+
+        # When the queue is full, `submit()` blocks, so the watcher falls behind instead of memory growing without limit
+        self.jobs = queue.Queue(maxsize=queue_size)
+        # Names of files that are queued, converting or waiting to be retried, so a file reported twice is only converted once
+        self.in_flight = set()
+        self.lock = threading.Lock()
+
+        for i in range(workers):
+            threading.Thread(target=self.work, name=f"conversion-worker-{i + 1}", daemon=True).start()
+
+    def submit(self, arrival: Arrival) -> None:
+        """Queue a newly arrived file for conversion, unless it isn't an .anx file or is already being handled."""
+        # If the file is not .anx, just skip it
+        if os.path.splitext(arrival.name)[1] != ".anx":
+            return
+        with self.lock:
+            if arrival.name in self.in_flight:
+                return
+            self.in_flight.add(arrival.name)
+        self.jobs.put(Job(arrival))
+
+    def work(self) -> None:
+        """Body of each worker thread. Each job is converted in its own process, so a slow or crashing file only ties up one worker."""
+        while True:
+            job = self.jobs.get()
+            try:
+                self.convert(job)
+            except Exception as e:
+                print(f"Something went wrong with {job.arrival.name}: {e}")
+                self.finish(job)
+
+    def convert(self, job: Job) -> None:
+        arrival = job.arrival
+        base_name = os.path.splitext(arrival.name)[0]
+
+        # A file can be reported more than once (e.g. written again, or listed while its event was pending), but only converted once
+        if not os.path.exists(arrival.path):
+            self.finish(job)
+            return
+        # If the .anx file already exists in the output folder, also skip it. We don't want to allow overwriting files.
+        if os.path.exists(f"{self.output_folder_path}/{arrival.name}"):
+            print(f"Refusing to convert {arrival.name} as there already exists a file with the same name in {self.output_folder_path}")
+            self.finish(job)
+            return
+
+        error = convert_with_timeout(arrival.path, f"{self.output_folder_path}/{base_name}.json", self.timeout, self.cache)
+        if error is None:
+            # End-to-end latency: from the file finishing arriving in the input folder to its JSON being written and closed
+            print(f"Converted {arrival.name} (attempt {job.attempt}). Latency: {time() - arrival.arrived_at:.3f}s")
+            # move the .anx file into the output folder as well
+            os.rename(arrival.path, f"{self.output_folder_path}/{arrival.name}")
+            self.finish(job)
+        elif job.attempt < self.max_attempts:
+            delay = self.backoff * 2 ** (job.attempt - 1)
+            print(f"Attempt {job.attempt} at {arrival.name} failed ({error}). Retrying in {delay:g}s")
+            retry = threading.Timer(delay, self.jobs.put, args=(job._replace(attempt=job.attempt + 1),))
+            retry.daemon = True
+            retry.start()
+        else:
+            print(f"Giving up on {arrival.name} after {job.attempt} attempts ({error}). Moving it to {self.dead_letter_folder_path}")
+            self.dead_letter(job, error)
+            self.finish(job)
+
+    def dead_letter(self, job: Job, error: str) -> None:
+        """Move a file that can't be converted into the dead-letter folder, along with a .txt file saying why."""
+        os.makedirs(self.dead_letter_folder_path, exist_ok=True)
+        base_name = os.path.splitext(job.arrival.name)[0]
+        with open(f"{self.dead_letter_folder_path}/{base_name}.txt", mode="w") as f:
+            f.write(f"{job.arrival.name} failed {job.attempt} times. Last error: {error}\n")
+        os.replace(job.arrival.path, f"{self.dead_letter_folder_path}/{job.arrival.name}")
+
+    def finish(self, job: Job) -> None:
+        with self.lock:
+            self.in_flight.discard(job.arrival.name)
+
+
+def continuous(
+    workers: int = os.cpu_count(),
+    queue_size: int = 100,
+    timeout: float = 60,
+    max_attempts: int = 3,
+    backoff: float = 5,
+    cache_folder_path: str | None = CACHE_FOLDER_PATH,
+    cache_size: int = DEFAULT_MAX_BYTES,
+):
+    """Main function to watch the input folder and convert + move each .anx file into the output folder as soon as it arrives.
+
+    Args:
+        workers (int, optional): How many files to convert at once. Defaults to the number of CPUs.
+        queue_size (int, optional): How many files can wait to be converted before the watcher stops taking more. Defaults to 100.
+        timeout (float, optional): Seconds a single conversion may take before it is killed and counted as failed. Defaults to 60.
+        max_attempts (int, optional): How many times to try a file before moving it to the dead-letter folder. Defaults to 3.
+        backoff (float, optional): Seconds to wait before the first retry. Each later retry waits twice as long. Defaults to 5.
+        cache_folder_path (str | None, optional): Folder of the cache of converted outputs (see `conversion_cache`), which saves
+            converting the same file twice when it's sent again. None turns the cache off. Defaults to `CACHE_FOLDER_PATH`.
+        cache_size (int, optional): Size limit of the cache in bytes. Defaults to `conversion_cache.DEFAULT_MAX_BYTES`.
+    """
+    cache = None if cache_folder_path is None else Conversion_Cache(cache_folder_path, cache_size)
+    pool = Conversion_Pool(OUTPUT_FOLDER_PATH, DEAD_LETTER_FOLDER_PATH, workers, queue_size, timeout, max_attempts, backoff, cache)
+
+    watcher = watch_folder(INPUT_FOLDER_PATH)
+    print(f"Watching {INPUT_FOLDER_PATH} for .anx files ({type(watcher).__name__}, {workers} workers)")
+    try:
+        for arrival in watcher:
+            pool.submit(arrival)
+    finally:
+        watcher.close()
 
 
 if __name__ == "__main__":
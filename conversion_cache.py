@@ -0,0 +1,185 @@
+"""A content-addressed, on-disk cache of converted files, so that an .anx file sent again costs one hash and one file copy.
+
+Entries are keyed by the SHA-256 of the input's bytes together with the converter version (a hash of the source of the modules that
+produce the output, see `converter_version()`) and the output format. Editing the converter therefore never serves stale output, and
+the ids in a cached document are the ones handed out the first time that input was converted.
+
+Each entry is a `<key>.json` file holding the output, plus a `<key>.coverage.json` file with the answer coverage summary that batch -v
+adds up. The modification time of an entry records when it was last used, and once the folder grows past its size limit the least
+recently used files are deleted. Every file is written under a temporary name and renamed into place, so several processes can share a
+cache folder.
+
+The folder is only scanned when a cache is opened, and again when a process's running total of its size goes over the limit, rather than
+on every store. Eviction then brings the folder down to `EVICT_TO` of its limit, so that a full cache isn't scanned again by the next
+store. Temporary files that are older than `STALE_PARTIAL_SECONDS` (left behind by a process that was killed) are deleted by the scan.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import shutil
+import time
+from functools import cache
+
+from json_output import Output_Format, resolve_encoder
+
+# The modules whose source decides the output of a conversion
+CONVERTER_MODULES = ("anx_parser", "answer_coverage", "field_mapping", "incremental", "json_output", "knackly_writer", "object_ids")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+OUTPUT_SUFFIX = ".json"
+COVERAGE_SUFFIX = ".coverage.json"
+PARTIAL_SUFFIX = ".part"
+EVICT_TO = 0.9  # The share of `max_bytes` that eviction brings the folder down to
+STALE_PARTIAL_SECONDS = 60 * 60  # How old a temporary file has to be before a scan deletes it
+
+# The size of each cache folder, as far as this process knows: its size at the last scan, plus what this process stored since. It lives
+# outside of `Conversion_Cache`, since batch workers get a new copy of the cache object with every file, and the total has to add up
+# across all of them.
+FOLDER_SIZES = {}
+
+
+@cache
+def converter_version() -> str:
+    """Get a hash of the source of `CONVERTER_MODULES`, which changes whenever the converter does."""
+    digest = hashlib.sha256()
+    for name in CONVERTER_MODULES:
+        with open(importlib.import_module(name).__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class Conversion_Cache:
+    """A folder of converted outputs, keyed by `key()`, holding at most `max_bytes` bytes."""
+
+    def __init__(self, folder: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.folder = folder
+        self.max_bytes = max_bytes
+        os.makedirs(folder, exist_ok=True)
+        self.evict()
+
+    def key(self, input_path: str, output_format: Output_Format = Output_Format(), id_seed: str = None) -> str:
+        """Get the key of converting the file at `input_path` with `output_format`, and with deterministic ids from `id_seed` if given.
+
+        The file is hashed in chunks rather than read into memory, so that streaming mode (-s) still works on very large files. Whether
+        the output is streamed doesn't change its bytes, so only the layout and the encoder are part of the key.
+        """
+        digest = hashlib.sha256()
+        seed = "" if id_seed is None else f"seed:{id_seed}"
+        digest.update(f"{converter_version()}|{output_format.compact}|{resolve_encoder(output_format.encoder)}|{seed}|".encode())
+        with open(input_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def path(self, key: str, suffix: str = OUTPUT_SUFFIX) -> str:
+        return os.path.join(self.folder, f"{key}{suffix}")
+
+    def fetch(self, key: str, output_path: str, coverage: bool = False) -> tuple[bool, dict | None]:
+        """Copy the cached output of `key` to `output_path`, if there is one.
+
+        Args:
+            key (str): The key of the conversion.
+            output_path (str): Where to write the output. It is replaced in one step, so it is never left half written.
+            coverage (bool, optional): Whether the coverage summary is needed too. An entry without one counts as a miss. Defaults to False.
+
+        Returns:
+            tuple[bool, dict | None]: Whether the output was found, and its coverage summary if `coverage` is True.
+        """
+        summary = None
+        try:
+            if coverage:
+                with open(self.path(key, COVERAGE_SUFFIX), "r", encoding="UTF-8") as f:
+                    summary = json.load(f)
+                os.utime(self.path(key, COVERAGE_SUFFIX))
+            partial_path = f"{output_path}{PARTIAL_SUFFIX}"
+            shutil.copyfile(self.path(key), partial_path)
+        except FileNotFoundError:  # Never stored, or evicted since
+            return False, None
+        os.replace(partial_path, output_path)
+        try:
+            os.utime(self.path(key))
+        except FileNotFoundError:  # Evicted by another process while it was being copied
+            pass
+        return True, summary
+
+    def store(self, key: str, output_path: str, summary: dict = None) -> None:
+        """Add the output of a conversion, already written to `output_path`, along with its coverage summary, then evict if the cache
+        has grown too big."""
+        added = self.write(self.path(key), lambda partial_path: shutil.copyfile(output_path, partial_path))
+        if summary is not None:
+
+            def write_summary(partial_path: str) -> None:
+                with open(partial_path, "w", encoding="UTF-8") as f:
+                    json.dump(summary, f)
+
+            added += self.write(self.path(key, COVERAGE_SUFFIX), write_summary)
+
+        size = FOLDER_SIZES.get(self.folder)
+        if size is None or size + added > self.max_bytes:
+            # Other processes may have stored (or evicted) files since, so the folder is scanned again before deleting anything
+            self.evict()
+        else:
+            FOLDER_SIZES[self.folder] = size + added
+
+    def write(self, path: str, write_partial) -> int:
+        """Write a file of the cache through `write_partial(partial_path)`, and rename it into place.
+
+        Returns:
+            int: How many bytes the folder grew by.
+        """
+        # The temporary name is unique to this process, since batch workers and watcher processes can store the same key at once
+        partial_path = f"{path}.{os.getpid()}{PARTIAL_SUFFIX}"
+        try:
+            write_partial(partial_path)
+            added = os.path.getsize(partial_path)
+            try:
+                added -= os.path.getsize(path)
+            except FileNotFoundError:
+                pass
+            os.replace(partial_path, path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        return added
+
+    def scan(self) -> list[tuple[float, int, str]]:
+        """List the files of the cache, deleting temporary files older than `STALE_PARTIAL_SECONDS` on the way.
+
+        Returns:
+            list[tuple[float, int, str]]: The modification time, size and path of each file.
+        """
+        entries = []
+        stale = time.time() - STALE_PARTIAL_SECONDS
+        with os.scandir(self.folder) as scan:
+            for entry in scan:
+                if not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                    if entry.name.endswith(PARTIAL_SUFFIX):
+                        # Still being written by another process, unless it's so old that the process must have been killed
+                        if stat.st_mtime < stale:
+                            os.remove(entry.path)
+                        continue
+                except FileNotFoundError:  # Evicted, or renamed into place, by another process
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self) -> None:
+        """Scan the folder, and if it is bigger than `max_bytes`, delete the least recently used files until it is within `EVICT_TO` of
+        that."""
+        entries = self.scan()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes * EVICT_TO:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+        FOLDER_SIZES[self.folder] = total
@@ -0,0 +1,329 @@
+"""A long running conversion server, so that converting a file doesn't pay for starting Python, importing the converter and parsing
+arguments every time, the way running `main.py` once per file does.
+
+The server speaks HTTP, on a localhost port or on a Unix socket:
+
+- `POST /convert`: the body is the .anx file, and the response is its JSON. Query parameters:
+    - `unused=1` responds with `{"document": ..., "unused": [...]}` instead, listing the answers the converter didn't use (the -v
+      report). `exclude=NAME` leaves answers out of that list, and can be given more than once (see `answer_coverage.Exclusions`).
+    - `stream=1` only keeps the answers the converter reads (-s). It cannot be combined with `unused`.
+    - `compact=1` leaves out the indentation (-c).
+    - `id_seed=SEED` derives the ids from SEED (--id-seed).
+- `GET /health`: `{"status": "ok", "workers": N}`.
+
+A file that can't be converted gets a 422 response of `{"error": "..."}`, and a malformed request a 400.
+
+Conversions run in a pool of worker processes. Each one imports the converter and builds its lookup tables (the extraction plan and
+`consumed_answer_names()`) once, when it starts, and then converts one request after another, keeping its caches of decoded values
+warm. Every connection is handled by its own thread, which hands the bytes to the pool and waits for the result, so up to `workers`
+files are converted at once and the rest wait their turn.
+
+Usage:
+    python conversion_server.py [--host 127.0.0.1] [--port 8642] [--socket SOCKET] [-w WORKERS] [--encoder {auto,orjson,json}]
+"""
+
+import argparse
+import errno
+import http.client
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple
+from urllib.parse import parse_qs, urlsplit
+
+from answer_coverage import Exclusions
+from anx_parser import ANX_Parser
+from json_output import ENCODERS, encode, load_orjson, resolve_encoder
+from knackly_writer import Knackly_Writer, consumed_answer_names
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8642
+DEFAULT_MAX_MB = 100
+FLAGS = ("unused", "stream", "compact")
+TRUE_VALUES = ("1", "true", "yes")
+
+
+class Request_Options(NamedTuple):
+    unused: bool = False  # Respond with the answers that weren't used as well as the document
+    exclude: tuple[str, ...] = ()  # Answers to leave out of the unused answers
+    stream: bool = False  # Only keep the answers the converter reads, see `ANX_Parser`
+    compact: bool = False  # Leave out the indentation of the JSON
+    id_seed: str | None = None  # Derive the ids from this seed, see `object_ids.Id_Allocator`
+
+
+class Server_Result(NamedTuple):
+    error: str | None  # A description of the error if the conversion failed, otherwise None
+    output: bytes | None  # The encoded response if the conversion succeeded
+
+
+def parse_options(query: str) -> Request_Options:
+    """Read the `Request_Options` from the query string of a `/convert` request.
+
+    Raises:
+        ValueError: If the query has an unknown parameter or an invalid `exclude` pattern, or asks for both `stream` and `unused`.
+    """
+    parameters = parse_qs(query, keep_blank_values=True)
+    unknown = set(parameters).difference(FLAGS, ("exclude", "id_seed"))
+    if unknown:
+        raise ValueError(f"Unknown query parameters: {', '.join(sorted(unknown))}")
+
+    flags = {flag: parameters[flag][-1].lower() in TRUE_VALUES for flag in FLAGS if flag in parameters}
+    options = Request_Options(exclude=tuple(parameters.get("exclude", ())), id_seed=parameters.get("id_seed", [None])[-1], **flags)
+    if options.stream and options.unused:
+        # Streaming throws away the answers that the unused report is about
+        raise ValueError("stream can't be combined with unused")
+    # The patterns are compiled again by the worker, but a bad one is the request's fault, not the file's
+    Exclusions(options.exclude)
+    return options
+
+
+def warm_up() -> None:
+    """Initializer of each worker process, so that the first request it gets doesn't pay for building the writer's lookup tables, or
+    for importing orjson."""
+    # Stopping is up to the server, which waits for the conversions that are running (Ctrl+C reaches every process in the terminal)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    consumed_answer_names()
+    load_orjson()
+
+
+def convert_bytes(data: bytes, options: Request_Options, encoder: str) -> Server_Result:
+    """Convert an .anx file held in memory. This is what each worker process runs.
+
+    Args:
+        data (bytes): The .anx file.
+        options (Request_Options): How to convert it.
+        encoder (str): The JSON encoder, one of `json_output.ENCODERS`.
+
+    Returns:
+        Server_Result: The error if the conversion failed, otherwise the encoded document, or the document and its unused answers.
+    """
+    try:
+        answer_names = consumed_answer_names() if options.stream else None
+        writer = Knackly_Writer(ANX_Parser(data, answer_names), id_seed=options.id_seed)
+        writer.create()
+        response = writer.json
+        if options.unused:
+            unused = [answer.name for answer in writer.anx.get_unvisited_elements(Exclusions(options.exclude))]
+            response = {"document": writer.json, "unused": unused}
+        return Server_Result(None, encode(response, options.compact, encoder))
+    except Exception as e:
+        # Exceptions are turned into strings here, since not every exception survives being sent back from a worker process
+        return Server_Result(f"{type(e).__name__}: {e}", None)
+
+
+class Worker_Pool:
+    """The worker processes that conversions run in, started again if one of them dies (e.g. it runs out of memory)."""
+
+    def __init__(self, workers: int, encoder: str) -> None:
+        self.workers = workers
+        self.encoder = resolve_encoder(encoder)
+        self.lock = threading.Lock()
+        self.executor = self.start()
+
+    def start(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=warm_up)
+
+    def restart(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """Replace a pool that a process has died in, which can't be used any more, unless another thread already has."""
+        with self.lock:
+            if self.executor is broken:
+                self.executor = self.start()
+            return self.executor
+
+    def convert(self, data: bytes, options: Request_Options) -> Server_Result:
+        executor = self.executor
+        try:
+            future = executor.submit(convert_bytes, data, options, self.encoder)
+        except BrokenProcessPool:  # A process died during an earlier request
+            executor = self.restart(executor)
+            future = executor.submit(convert_bytes, data, options, self.encoder)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            # Every conversion that was running in the pool fails along with the process that died
+            self.restart(executor)
+            return Server_Result("The conversion process exited unexpectedly", None)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+
+
+class Conversion_Handler(BaseHTTPRequestHandler):
+    """Handles the requests of one connection. The server it belongs to has a `pool` and a `max_bytes` limit on the size of a file."""
+
+    protocol_version = "HTTP/1.1"  # Keep connections open between requests
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path != "/health":
+            self.respond_error(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}")
+            return
+        self.respond(HTTPStatus.OK, json.dumps({"status": "ok", "workers": self.server.pool.workers}).encode())
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        length = self.headers.get("Content-Length")
+        if url.path != "/convert":
+            self.respond_error(HTTPStatus.NOT_FOUND, f"Unknown path {url.path}")
+            return
+        if length is None or not length.isdigit():
+            self.respond_error(HTTPStatus.LENGTH_REQUIRED, "The request needs a Content-Length header")
+            return
+        if int(length) > self.server.max_bytes:
+            self.respond_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Files over {self.server.max_bytes} bytes aren't accepted")
+            return
+        try:
+            options = parse_options(url.query)
+        except ValueError as e:
+            self.respond_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        result = self.server.pool.convert(self.rfile.read(int(length)), options)
+        if result.error is not None:
+            self.respond_error(HTTPStatus.UNPROCESSABLE_ENTITY, result.error, close=False)
+        else:
+            self.respond(HTTPStatus.OK, result.output)
+
+    def respond(self, status: HTTPStatus, body: bytes, close: bool = False) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if close:
+            self.close_connection = True
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def respond_error(self, status: HTTPStatus, error: str, close: bool = True) -> None:
+        """Respond with `{"error": error}`. By default the connection is closed afterwards, since the body of a refused request may not
+        have been read."""
+        self.respond(status, json.dumps({"error": error}).encode(), close)
+
+    def address_string(self) -> str:
+        # The client of a Unix socket has no address
+        return self.client_address[0] if self.client_address else "unix socket"
+
+
+class Unix_HTTP_Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """`ThreadingHTTPServer`, on a Unix socket instead of a TCP port."""
+
+    daemon_threads = True
+    bound = False  # Whether the socket file is this server's, and so has to be removed by `server_close()`
+
+    def server_bind(self) -> None:
+        # A socket file left behind by a server that was killed would stop this one from binding, but one that another server is still
+        # listening on is left alone
+        if os.path.exists(self.server_address) and not os.path.isfile(self.server_address):
+            if is_socket_in_use(self.server_address):
+                raise OSError(errno.EADDRINUSE, f"{self.server_address} is already in use by another server")
+            os.remove(self.server_address)
+        super().server_bind()
+        self.bound = True
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self.bound and os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+def is_socket_in_use(path: str) -> bool:
+    """Whether a server is listening on the Unix socket at `path`. Only a refused connection counts as nobody listening."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        return False
+    except OSError:
+        return True
+    finally:
+        probe.close()
+    return True
+
+
+class Unix_HTTP_Connection(http.client.HTTPConnection):
+    """An `http.client.HTTPConnection` to a server on a Unix socket, for converting files from Python.
+
+    Example:
+        connection = Unix_HTTP_Connection("/run/anx2json.sock")
+        connection.request("POST", "/convert?compact=1", body=anx_bytes)
+        document = json.loads(connection.getresponse().read())
+    """
+
+    def __init__(self, socket_path: str, timeout: float = None) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def create_server(
+    pool: Worker_Pool,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: str = None,
+    max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+) -> socketserver.BaseServer:
+    """Create a server that converts files with `pool`, listening on `socket_path` if given, and on `host`:`port` otherwise.
+
+    Call `serve_forever()` on the result to start handling requests, and `server_close()` once it has stopped.
+    """
+    if socket_path is not None:
+        server = Unix_HTTP_Server(socket_path, Conversion_Handler)
+    else:
+        server = ThreadingHTTPServer((host, port), Conversion_Handler)
+    server.pool = pool
+    server.max_bytes = max_bytes
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert .anx files sent over HTTP, with the converter kept loaded between requests.")
+    parser.add_argument(
+        "--host", default=DEFAULT_HOST, help="address to listen on. Defaults to %(default)s, which only this machine can reach"
+    )
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on. Defaults to %(default)s")
+    parser.add_argument("--socket", dest="socket_path", metavar="SOCKET", help="listen on this Unix socket instead of --host/--port")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=os.cpu_count(), help="number of files converted at once. Defaults to the number of CPUs"
+    )
+    parser.add_argument("--encoder", choices=ENCODERS, default="auto", help="JSON encoder to write the output with, see main.py")
+    parser.add_argument("--max-size", type=int, default=DEFAULT_MAX_MB, help="largest file accepted, in MB. Defaults to %(default)s")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("argument -w/--workers: must be at least 1")
+    if args.socket_path is not None and not hasattr(socket, "AF_UNIX"):
+        parser.error("argument --socket: Unix sockets aren't available on this system")
+
+    pool = Worker_Pool(args.workers, args.encoder)
+    where = f"the Unix socket {args.socket_path}" if args.socket_path is not None else f"http://{args.host}:{args.port}"
+    try:
+        server = create_server(pool, args.host, args.port, args.socket_path, args.max_size * 1024 * 1024)
+    except OSError as e:
+        pool.shutdown()
+        sys.exit(f"Can't listen on {where}: {e.strerror if e.errno == errno.EADDRINUSE else e}")
+    print(f"Converting .anx files posted to /convert on {where} ({args.workers} workers)", flush=True)
+    # Stop the same way on SIGTERM as on Ctrl+C, so the worker processes and the socket file aren't left behind
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
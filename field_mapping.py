@@ -0,0 +1,493 @@
+"""Declarative description of the flat sections of the Knackly json.
+
+Each section is a tuple of `(knackly key, .anx answer name, value type)` rows, listed in the order the keys appear in the output.
+
+- The value type is the name of the .anx element the answer holds (e.g. `"NumValue"`), which decides the `ANX_Parser.parse_*` method used.
+  A value type of `None` accepts any type of answer, the same way `ANX_Parser.parse_field()` does.
+- A row with an answer name of `None` is a placeholder for a key that `Knackly_Writer` computes itself. It keeps the key's position in the
+  output, but its extracted value is always `None`.
+
+The tables are compiled once, at import, into `EXTRACTION_PLAN`, which `ANX_Parser.extract()` fulfils in a single pass over the answer set.
+"""
+
+SECTIONS = {
+    "loanTerms": (
+        ("closingDate", "Document Date DT", "DateValue"),
+        ("loanNumber", "Loan Number TE", "TextValue"),
+        ("loanTerm", "Loan Term NU", "NumValue"),
+        ("loanAmount1", "Loan Amount NU", "NumValue"),
+        ("firstPaymentDate", "First Payment DT", "DateValue"),
+        ("isInterestOnly", "Loan Type Interest Only TF", "TFValue"),
+        ("interestOnlyMonths", "Variable Interest Rate Interest Only Period NM", "NumValue"),
+        ("amortizationMonths", "Amortization Period NU", "NumValue"),
+        ("interestRate", "Interest Rate NU", "NumValue"),
+        ("defaultInterestRate", "Default Interest Rate NU", "NumValue"),
+        ("interestCalcType", "Interest Calc Type MC", "MCValue"),
+        ("isVariableRate", "Loan Type Variable TF", "TFValue"),
+        ("isInterestStep", "Interest Step TF", "TFValue"),
+        ("interestStepSpreadsheet", None, None),
+        ("isMERSLoan", "MERS TF", "TFValue"),
+        ("mersNumber", "MERS Number TE", "TextValue"),
+        ("MaturityDate", "Maturity DT", "DateValue"),
+        ("paymentInAdvance", "Payment in Advance TF", "TFValue"),
+    ),
+    "variableRate": (
+        ("margin", "Variable Margin NM", "NumValue"),
+        ("isDailyFloatingRate", "Rate Adjust Daily TF", "TFValue"),
+        ("changeDate", "Variable Change Date NU", "NumValue"),
+        ("armAdjustmentPeriod", "Variable ARM Adjustment Period NM", "NumValue"),
+        ("firstInterestCap", "Variable First Interest Cap NM", "NumValue"),
+        ("subsequentInterestCap", "Variable Subsequent Interest Cap NM", "NumValue"),
+        ("floorRate", "Variable Floor Rate NM", "NumValue"),
+        ("maximumInterestRateCap", "Variable Maximum interest Rate Cap NM", "NumValue"),
+        ("interestRateIndex", "Variable Interest Rate Index MC", "MCValue"),
+    ),
+    "features": (
+        ("isLineOfCredit", "Credit Line TF", "TFValue"),
+        ("lineOfCreditPage", None, None),
+        ("penalties", None, None),
+        ("isConstructionReserve", "Construction Holdback TF", "TFValue"),
+        ("construction1", None, None),
+        ("loanFeatures", None, None),
+        ("reserves", None, None),
+        ("isImpounds1", "Impound Accounts TF", "TFValue"),
+        ("impounds1", None, None),
+    ),
+    "lineOfCredit": (
+        ("isRevolving", "Credit Line Revolving TF", "TFValue"),
+        ("minAdvanceRequest", "Credit Line Minimum Request NU", "NumValue"),
+        ("advanceRequestFee", "Credit Line Request Fee NU", "NumValue"),
+        ("maxDrawsPerMonth", "Credit Line Maximum Draws NU", "NumValue"),
+        ("minOutstandingPrincipalBal", "Credit Line Minimum Balance NU", "NumValue"),
+    ),
+    "penalties": (
+        ("PrepaymentPenalty", "Prepay MC", "MCValue"),
+        ("PrepayTerm", "Prepay Term NU", "NumValue"),
+        ("IsPrepay20Percent", "Prepay 20 Percent TF", "TFValue"),
+        ("PenatlyCalculatedFrom", "Prepay Lock Penalty MC", "MCValue"),
+        ("IsPrepayLockYield", "Prepay Lock Yield TF", "TFValue"),
+        ("PrepayNonlinear", None, None),
+        ("PrepayLockDollars", "Prepay Lock Dollars NU", "NumValue"),
+        ("PrepayLockMonths", "Prepay Lock Months NU", "NumValue"),
+        ("PrepayLockPercent", "Prepay Lock Percent NU", "NumValue"),
+        ("prepaymentPremiumMonths", "Prepayment Premium Months NU", "NumValue"),
+    ),
+    "construction": (
+        ("reserve", "Holdback Amount NU", "NumValue"),
+        ("IsNonDutch", "Non Dutch TF", "TFValue"),
+        ("Type", "Construction Type MC", "MCValue"),
+        ("IsExcludeSchedule", "Exclude Disbursement Schedule TF", "TFValue"),
+        ("IsRetainageRequired", "Retainage Required TF", "TFValue"),
+        ("IsThirdPartyFCA", "Construction Fund Control TF", "TFValue"),
+        ("isAssignmentOfPermits", "Assignment of Permits TF", "TFValue"),
+        ("isInspectionFee", "seth_Inspection Fee TF", "TFValue"),
+        ("inspectionFee", "Inspection Fee NU", "NumValue"),
+        ("IsConstructionContract", "Construction Contract TF", "TFValue"),
+        ("ContractorName", "Construction Contractor TE", "TextValue"),
+        ("IsDesignContract", "Construction Design Contract TF", "TFValue"),
+        ("DesignerName", "Construction Designer TE", "TextValue"),
+        ("isThirdPartyConstructionGuaranty", "Guaranty of Completion TF", "TFValue"),
+        ("completionGuarantors", "Construction Guaranty Name TX", "RptValue"),
+        ("doesConstructionBorrowerContribute", "Construction Borrower Contribution TF", "TFValue"),
+        ("constructionBorrowerContribution", "Construction Borrower Contribution NU", "NumValue"),
+    ),
+    "loanFeatures": (
+        ("insurancePayment", "Insurance Payment NU", "NumValue"),
+        ("isSBALoan", "SBA Loan TF", "TFValue"),
+        ("sba_ApprovalDate", "SBA Approval DT", "DateValue"),
+        ("sba_LoanNumber", "SBA Loan Number TX", "TextValue"),
+        ("isCannabisLoan", "Cannabis Loan TF", "TFValue"),
+        ("isAffiliateLoan", "Affiliate Loan TF", "TFValue"),
+        ("isSpecialPurposeEntity", "Special Purpose Entity TF", "TFValue"),
+        ("isRecycledSPE", "SPE Recycled TF", "TFValue"),
+        ("isDebtServiceCoverageRatio", "DSCR TF", "TFValue"),
+        ("ratio", "DSCR NU", "NumValue"),
+        ("isAutoExtension", "Auto Extension TF", "TFValue"),
+        ("isExtension", "Extension TF", "TFValue"),
+        ("extensionNum", "Extension Number NU", "NumValue"),
+        ("extensionMonths", "Extension Months NU", "NumValue"),
+        ("extensionType", "Extension Fee Type MC", "MCValue"),
+        ("extensionFeePercent", "Extension Fee NU", "NumValue"),
+        ("extensionFeeAmount", "Extension Fee Amount NU", "NumValue"),
+        ("isLockbox", "Rental Income LockBox TF", "TFValue"),
+        ("lockbox_Type", "Rental Income Lockbox MC", "MCValue"),
+        ("lockbox_Bank", "Rental Income Lockbox Bank TE", "TextValue"),
+        ("lockbox_FirstRentDate", "Rental Income Lockbox DT", "DateValue"),
+        ("isServicingFees", "Servicing Fees TF", "TFValue"),
+        ("servicingFee", "Servicing Fees Amount NU", "NumValue"),
+        ("isExit", "Exit Fee TF", "TFValue"),
+        ("exitDollars", "Exit Fee Amount NU", "NumValue"),
+        ("isTermination", "Termination Fee TF", "TFValue"),
+        ("terminationDollars", "Termination Fee AMT NU", "NumValue"),
+        ("deferredBrokerType", None, None),
+        ("deferredBrokerDollars", "Deferred Broker Fee NU", "NumValue"),
+        ("deferredBrokerPercent", "Deferred Broker Fee Percent NU", "NumValue"),
+        ("deferredOriginationType", "Deferred Origination Fees MC", "MCValue"),
+        ("deferredOriginationDollars", "Deferred Origination Fee NU", "NumValue"),
+        ("deferredOriginationPercent", "Deferred Origination Fee Percent NU", "NumValue"),
+        ("isDefaultFee", "Default Fee TF", "TFValue"),
+        ("defaultFeeAMT", "Default Fee AMT NU", "NumValue"),
+        ("iseResiLoan", "eResi Loan TF", "TFValue"),
+        ("isFStreetLoan", "F Street Loan TF", "TFValue"),
+        ("plDirectOriginationFeeNU", "PLDirect Origination Fee NU", "NumValue"),
+        ("plDirectOriginationFee", "PLDirect Origination Fee TF", "TFValue"),
+        ("isWallisLife", "Wallis Life Insurance TF", "TFValue"),
+        ("silverHillDeferredLoan", "Silver Hill Deferred Loan TF", "TFValue"),
+    ),
+    "reserves": (
+        ("IsLender", "Lender Holdback TF", "TFValue"),
+        ("LenderDollars", "Lender Holdback NU", "NumValue"),
+        ("isPropertyTax", "Real Property Tax Holdback TF", "TFValue"),
+        ("PropertyTaxDollars", "Real Property Tax Holdback NU", "NumValue"),
+        ("isPropertyInsurance", "Insurance Holdback TF", "TFValue"),
+        ("PropertyInsuranceDollars", "Insurance Holdback NU", "NumValue"),
+        ("IsCapEx", "Capex Holdback TF", "TFValue"),
+        ("CapExDollars", "Capex Holdback NU", "NumValue"),
+        ("IsAppraisal", "Appraisal Reserve TF", "TFValue"),
+        ("AppraisalDollars", "Appraisal Reserve Amount NU", "NumValue"),
+        ("appraisalARV", "Appraisal ARV NU", "NumValue"),
+        ("DefaultType", "Default Reserve MC", "MCValue"),
+        ("DefaultDollars", "Default Reserve Dollars NU", "NumValue"),
+        ("DefaultMonths", "Default Reserve Months NU", "NumValue"),
+        ("isOccupancy", "Damage Reserve TF", "TFValue"),
+        ("occupancyAmount", "Damage Reserve Amount NU", "NumValue"),
+        ("occupancyDeadline", "Damage Deadline DT", "DateValue"),
+        ("DebtServiceType", None, None),
+        ("DebtServiceDollars", "Interest Reserve Amount NU", "NumValue"),
+        ("DebtServiceMonths", "Interest Reserve Months NU", "NumValue"),
+    ),
+    "impounds": (
+        ("initialTax", "Impound Tax NU", "NumValue"),
+        ("initialInsurance", "Impound Insurance NU", "NumValue"),
+        ("initialFloodInsurance", "Impound Flood NU", "NumValue"),
+        ("monthlyTax", "Tax Payment NU", "NumValue"),
+        ("monthlyPropertyInsurance", "Insurance Payment NU", "NumValue"),
+        ("monthlyFloodInsurance", "First Payment Letter Flood NU", "NumValue"),
+        ("monthlyCapEx", "CapEx Impound NU", "NumValue"),
+    ),
+    "docsAdd": (
+        ("isAssignmentOfPropertyManagement", "Assignment of Property Management TF", None),
+        ("assignment_Spreadsheet_list", None, None),
+        ("isW9", "W9 TF", None),
+        ("isFirstPaymentLetter", "First Payment Letter TF", None),
+        ("firstPaymentAmount", "First Payment Letter Payment AMT NU", None),
+        ("isFirstPaymentLetterUseAmount", "First Payment Letter Use Amount TF", None),
+        ("isFirstPaymentIncludeEscrow", "Fay Escrow Reserves TF", None),
+        ("isForSale", "seth_isForSale", None),
+        ("loanSaleInformation", None, None),
+        ("isCollateralAssignment", "Collateral Assignment TF", None),
+        ("isSubordinations", "seth_isSubordinations", None),
+        ("isIntercreditor", "seth_isIntercreditor", None),
+        ("isLoanAdministrationAgreement", "Loan Administration Agreement TF", None),
+        ("impledServicingSpreadPercent", "Implied Servicing Spread Percent NU", None),
+        ("investorRatePercent", "Investor Rate Percent NU", None),
+        ("isPrincipalRepaymentAgreement", "Principal Repayment Agreement TF", None),
+        ("isPrincipalRepaymentProportional", "Principal Repayment Proportional TF", None),
+        ("principalRepaymentPercent", "Principal Repayment Percent NU", "NumValue"),
+        ("isThirdPartyAffiliate", "Renovo Third Party TF", None),
+        ("renovoThirdPartyName", "Renovo Third Party Name TX", None),
+        ("housemaxCreditCardAuthorization", "Housemax Credit Card Authorization TF", None),
+        ("akasRequired", "Borrower AKA Required TF", None),
+        ("isBorrowerCertification", "Borrower Certification TF", None),
+    ),
+    "docsCustomize": (
+        ("isRemoveArbitrationProvisions", "Remove Arbitration TF", None),
+        ("isRemoveLanguageCapacity", "Remove Language Capacity TF", None),
+        ("isRemoveInitialLines", "No Footer Initials TF", None),
+        ("isRemoveAllEntityCerts", "No Entity Certificates TF", None),
+        ("isIncludeEntityDocs", "Include Entity Documents TF", None),
+        ("isRemoveTitleInsurance", "No Title Policy TF", None),
+        ("isCoverpage", "Signing Instructions TF", None),
+        ("isMasterGuaranty", "Master Guaranty TF", None),
+        ("masterGuarantyDate", "Master Guaranty DT", None),
+        ("masterGuarantyName", "Master Guaranty Name TX", None),
+        ("isNoFillNonOwner", "No Fill Non Owner TF", None),
+        ("isNoFillBusinessPurpose", "No Fill Business Purpose TF", None),
+    ),
+}
+
+
+class Extraction_Plan:
+    """A compiled version of a set of section tables, ready to be fulfilled by `ANX_Parser.extract()`."""
+
+    def __init__(self, sections: dict[str, tuple]):
+        """Compile the section tables.
+
+        Args:
+            sections (dict[str, tuple]): A dictionary where each key is a section name and each value is a tuple of
+                `(knackly key, answer name, value type)` rows.
+        """
+        self.sections = sections
+        # The keys of each section, in output order. This is the starting point of every extraction.
+        self.templates = {section: dict.fromkeys(key for key, _, _ in rows) for section, rows in sections.items()}
+        # For each answer name, every (section, key, value type) that it fills in. Most answers only fill in one key.
+        self.targets = {}
+        for section, rows in sections.items():
+            for key, answer_name, value_type in rows:
+                if answer_name is not None:
+                    self.targets.setdefault(answer_name, []).append((section, key, value_type))
+
+    def answer_names(self) -> frozenset[str]:
+        """Get the names of every answer that the plan reads."""
+        return frozenset(self.targets)
+
+    def section_answer_names(self, section: str) -> tuple[str, ...]:
+        """Get the names of the answers that fill in one section, in table order."""
+        return tuple(answer_name for _, answer_name, _ in self.sections[section] if answer_name is not None)
+
+
+EXTRACTION_PLAN = Extraction_Plan(SECTIONS)
+
+# Every answer name written out in the source of `knackly_writer`: the string literals passed to `find_answer`, `parse_field` and
+# `parse_multiple`. `knackly_writer.consumed_answer_names()` adds them to the plan's answers for `ANX_Parser`'s streaming mode. Generated by `python regression/check_answer_names.py --update`, which
+# without `--update` fails if this is out of date.
+WRITER_ANSWER_NAMES = frozenset(
+    (
+        "ACH Delivery of Payments TF",
+        "ALTA Endorsements TE",
+        "Arbitration County MC",
+        "Assignee MC",
+        "Assignment and Allonge Assignee TE",
+        "Assignment and Allonge CSZ TE",
+        "Assignment and Allonge Concurrent MC",
+        "Assignment and Allonge Street TE",
+        "B signature attorney in fact TF",
+        "B signature joint venturer name TX",
+        "B signature trustee name TX",
+        "B signature underlying entity 1 entity type MC",
+        "B signature underlying entity 1 name TX",
+        "B signature underlying entity 1 org state MC",
+        "B signature underlying entity 1 title TX",
+        "B signature underlying entity 2 entity type MC",
+        "B signature underlying entity 2 name TX",
+        "B signature underlying entity 2 org state MC",
+        "B signature underlying entity 2 title TX",
+        "B signature underlying entity 3 name TX",
+        "B signature underlying entity 3 title TX",
+        "Borrower AKA Name MC",
+        "Borrower AKA TX",
+        "Borrower City TE",
+        "Borrower Delivery To Notice TE",
+        "Borrower Entity Type MC",
+        "Borrower Key TX",
+        "Borrower Name TE",
+        "Borrower Notice MC",
+        "Borrower Organization State MC",
+        "Borrower Owner Entity Type MC",
+        "Borrower Owner Individual Name TE",
+        "Borrower Owner Individual Title TE",
+        "Borrower Owner Organization State MC",
+        "Borrower Owner Signer Name TE",
+        "Borrower Owner Signer Title TE",
+        "Borrower Owner Signer Underlying 1 Entity Type MC",
+        "Borrower Owner Signer Underlying 1 Name TE",
+        "Borrower Owner Signer Underlying 1 State MC",
+        "Borrower Owner Signer Underlying 1 Title TE",
+        "Borrower Owner Signer Underlying 2 Name TE",
+        "Borrower Owner Signer Underlying 2 Title TE",
+        "Borrower Owner Underlying 1 Individual Name TE",
+        "Borrower Owner Underlying 1 Individual Title TE",
+        "Borrower State MC",
+        "Borrower Street Address TE",
+        "Borrower Zip Code TE",
+        "Broker City TE",
+        "Broker State MC",
+        "Broker Street Address TE",
+        "Broker Zip Code TE",
+        "CA Broker License Num TE",
+        "CA Broker Name TE",
+        "CA Broker TF",
+        "CA CFL License TF",
+        "CSA Debtor Ind TF",
+        "CSA Debtor Name TE",
+        "CSA Debtor Signer 1 TE",
+        "CSA Debtor Signer 1 Title TE",
+        "CSA Debtor State MC",
+        "CSA Debtor TF",
+        "Churchill Product MC",
+        "Client MC",
+        "Client Specific Pass Store TX",
+        "Closing Contact Email Address TX",
+        "Closing Contact Name TE",
+        "Collateral Assignment Assignee DT",
+        "Collateral Security Agreement TF",
+        "Confession of Judgment TF",
+        "Construction Contract Days NU",
+        "Construction Contract Percent NU",
+        "Contractor City TE",
+        "Contractor State MC",
+        "Contractor Street Address TE",
+        "Contractor Zip TE",
+        "DLP Loan Purpose MC",
+        "DLP Product MC",
+        "Deferred Broker Fee Percent NU",
+        "Deferred Broker Fees MC",
+        "Deferred Broker Fees TF",
+        "Designer City TE",
+        "Designer State MC",
+        "Designer Street Address TE",
+        "Designer Zip TE",
+        "Escrow Company Name TE",
+        "Escrow Officer City TE",
+        "Escrow Officer Contact Email TE",
+        "Escrow Officer State MC",
+        "Escrow Officer Street Address TE",
+        "Escrow Officer TE",
+        "Escrow Officer Zip Code TE",
+        "Escrow and Title Select MC",
+        "Exhibit A Lender List TF",
+        "FCI Disbursement Agreement TF",
+        "FinMe Borrower Email TE",
+        "FinMe Lender Email TE",
+        "G signature trustee name TX",
+        "G signature underlying entity 1 entity type MC",
+        "G signature underlying entity 1 name TX",
+        "G signature underlying entity 1 org state MC",
+        "G signature underlying entity 1 title TX",
+        "Geraci Fee Delivery MC",
+        "Geraci Fee NU",
+        "Guarantor Address MC",
+        "Guarantor City TE",
+        "Guarantor Entity Type MC",
+        "Guarantor Name TE",
+        "Guarantor Organization State MC",
+        "Guarantor Owner Entity Type MC",
+        "Guarantor Owner Individual Name TE",
+        "Guarantor Owner Individual Title TE",
+        "Guarantor Owner Organization State MC",
+        "Guarantor Owner Signer Name TE",
+        "Guarantor Owner Signer Title TE",
+        "Guarantor Owner Signer Underlying 1 Name TE",
+        "Guarantor Owner Signer Underlying 1 Role MC",
+        "Guarantor Owner Signer Underlying 1 Title TE",
+        "Guarantor Spousal Consent MC",
+        "Guarantor State MC",
+        "Guarantor Street Address TE",
+        "Guarantor TF",
+        "Guarantor Trust Name TE",
+        "Guarantor Type Select MC",
+        "Guarantor Zip Code TE",
+        "Interest Reserve Months TF",
+        "Interest Reserve TF",
+        "Interest Step Duration NU",
+        "Interest Step Rate NU",
+        "Junior Lien Beneficiary TE",
+        "Junior Lien Instrument Number TE",
+        "Junior Lien Recorded On DT",
+        "Junior Lien Trustee TE",
+        "Junior Lien Trustor Name TE",
+        "Junior Loan Beneficiary TE",
+        "Junior Loan Instrument Number TE",
+        "Junior Loan Recorded On DT",
+        "Junior Loan Signing DT",
+        "Junior Loan Trustee TE",
+        "Junior Loan Trustor Name TE",
+        "Kass Schuler TF",
+        "Leasehold Mortgage Lessor TE",
+        "Leasehold Mortgage TF",
+        "Legal Description TX",
+        "Lender CFL License Number TE",
+        "Lender Care Of MC",
+        "Lender City TE",
+        "Lender Delivery To Notice TE",
+        "Lender Invest Amount NU",
+        "Lender Name TE",
+        "Lender State MC",
+        "Lender Street Address TE",
+        "Lender Zip Code TE",
+        "Lien Position MC",
+        "Loan Documents MC",
+        "Loan Prepared By City TE",
+        "Loan Prepared By Email TE",
+        "Loan Prepared By State MC",
+        "Loan Prepared By Street Address TE",
+        "Loan Prepared By TE",
+        "Loan Prepared By Zip Code TE",
+        "Loan Servicer City TE",
+        "Loan Servicer MC",
+        "Loan Servicer Name TE",
+        "Loan Servicer State MC",
+        "Loan Servicer Street Address TE",
+        "Loan Servicer Zip Code TE",
+        "Membership Pledge TF",
+        "Membership Pledgor Ind TF",
+        "Membership Pledgor Name TE",
+        "Membership Pledgor Signer 1 TE",
+        "Membership Pledgor State MC",
+        "Membership Pledgor Title TE",
+        "Note Governing Law State MC",
+        "Owner Occupied TF",
+        "PDIA Property DMC",
+        "PDM Property DMC",
+        "PDS Property DMC",
+        "Partial Reconveyance TF",
+        "Partial Release Advanced MC",
+        "Per Diem interest Delivery MC",
+        "Preparer Address MC",
+        "Prepay Non Percent NU",
+        "Proforma Policy TF",
+        "Property APN TE",
+        "Property Borrower DMC",
+        "Property City TX",
+        "Property Collateral Type MC",
+        "Property Collatoral Release NU",
+        "Property Collatoral Value NU",
+        "Property County MC",
+        "Property Include PUD TF",
+        "Property Key TX",
+        "Property Manager City TE",
+        "Property Manager Signing DT",
+        "Property Manager State MC",
+        "Property Manager Street Address TE",
+        "Property Manager TE",
+        "Property Manager Zip Code TE",
+        "Property Purchase Money TF",
+        "Property Rental TF",
+        "Property State MC",
+        "Property Street Address TE",
+        "Property Zip Code TE",
+        "Remove ACH TF",
+        "Schedule of Properties TF",
+        "Subordinate Debt Amount NU",
+        "Subordinate Interest Rate NU",
+        "Subordinate Lender City TE",
+        "Subordinate Lender Invest Amount NU",
+        "Subordinate Lender State MC",
+        "Subordinate Lender Street Address TE",
+        "Subordinate Lender Zip Code TE",
+        "Subordination Doc Type MC",
+        "Subordination Existing Senior Doc MC",
+        "Subordination Lease Document DT",
+        "Subordination Lease Document TE",
+        "Subordination Lease Months NU",
+        "Subordination Post Closing TF",
+        "Subordination Rep Options MC",
+        "Subordination Senior Doc Options MC",
+        "Temple Email Address TX",
+        "Temple Lender Email Address TX",
+        "Temple Phone Num TE",
+        "Tenant Name TE",
+        "Tennessee County TE",
+        "Third Party Borrower TF",
+        "Title Company Name TE",
+        "Title Deletions TE",
+        "Title Insurance 100 TF",
+        "Title Officer City TE",
+        "Title Officer Contact Email TE",
+        "Title Officer Name TE",
+        "Title Officer State MC",
+        "Title Officer Street Address TE",
+        "Title Order Number TE",
+        "Title Policy Version MC",
+        "Title Report Effective Date DT",
+        "Title Zip Code TE",
+        "Trust Name TE",
+        "Trustee Address TE",
+        "Trustee Name MC",
+        "TrusteeName TE",
+        "UCC Personal Property TF",
+        "Vesting Help MC",
+        "_",
+        "seth_Multiple Lenders TF",
+    )
+)
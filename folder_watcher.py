@@ -0,0 +1,145 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import time
+from collections.abc import Iterator
+from typing import NamedTuple
+
+# inotify event flags, from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008  # A file opened for writing was closed
+IN_MOVED_TO = 0x00000080  # A file was moved into the watched folder
+IN_Q_OVERFLOW = 0x00004000  # The kernel's event queue overflowed, so some events were lost
+IN_ISDIR = 0x40000000  # The event refers to a directory
+INOTIFY_EVENT = struct.Struct("iIII")  # struct inotify_event {int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[];}
+
+
+class Arrival(NamedTuple):
+    """A file that has finished arriving in a watched folder."""
+
+    name: str  # The file name, relative to the watched folder
+    path: str  # The full path of the file
+    arrived_at: float  # When the file finished arriving, as a `time.time()` timestamp
+
+
+class Inotify_Watcher:
+    """Watches a folder with Linux's inotify, reporting each file as soon as it has been closed after writing (or moved in)."""
+
+    def __init__(self, folder: str):
+        """Start watching a folder.
+
+        Args:
+            folder (str): The folder to watch.
+
+        Raises:
+            OSError: If inotify isn't available on this system, or the folder can't be watched.
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.folder = folder
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(folder), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {folder}")
+
+    def __iter__(self) -> Iterator[Arrival]:
+        """Yield every file already in the folder, then each new file as it arrives. This blocks forever."""
+        # The watch is already in place, so nothing that arrives while listing can be missed (at worst a file is reported twice)
+        yield from list_folder(self.folder)
+
+        while True:
+            buffer = os.read(self.fd, 64 * 1024)
+            arrived_at = time.time()
+            offset = 0
+            while offset < len(buffer):
+                _, mask, _, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+                name = buffer[offset + INOTIFY_EVENT.size : offset + INOTIFY_EVENT.size + length].rstrip(b"\0")
+                offset += INOTIFY_EVENT.size + length
+
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped, so fall back to looking at everything in the folder
+                    yield from list_folder(self.folder)
+                elif name and not mask & IN_ISDIR:
+                    name = os.fsdecode(name)
+                    yield Arrival(name, os.path.join(self.folder, name), arrived_at)
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class Polling_Watcher:
+    """Watches a folder by listing it every `interval` seconds. Used wherever inotify isn't available."""
+
+    def __init__(self, folder: str, interval: float = 1.0):
+        """Start watching a folder.
+
+        Args:
+            folder (str): The folder to watch.
+            interval (float, optional): Seconds between listings. Defaults to 1.0.
+        """
+        self.folder = folder
+        self.interval = interval
+
+    def __iter__(self) -> Iterator[Arrival]:
+        """Yield each file once its size and modification time have stopped changing between two listings. This blocks forever.
+
+        Files already in the folder are reported after the first two listings, like any other file.
+        """
+        pending = {}  # name -> (size, mtime) from the previous listing, for files that haven't been reported yet
+        reported = set()
+
+        while True:
+            present = set()
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    present.add(entry.name)
+                    if entry.name in reported:
+                        continue
+
+                    stat = entry.stat()
+                    signature = (stat.st_size, stat.st_mtime)
+                    if pending.get(entry.name) == signature:
+                        del pending[entry.name]
+                        reported.add(entry.name)
+                        yield Arrival(entry.name, entry.path, stat.st_mtime)
+                    else:
+                        pending[entry.name] = signature
+
+            # Forget files that have left the folder, so that a new file with the same name is reported again
+            reported &= present
+            pending = {name: signature for name, signature in pending.items() if name in present}
+            time.sleep(self.interval)
+
+    def close(self) -> None:
+        pass
+
+
+def list_folder(folder: str) -> list[Arrival]:
+    """Report every file currently in a folder as an arrival, using its modification time as the arrival time."""
+    with os.scandir(folder) as entries:
+        return [Arrival(entry.name, entry.path, entry.stat().st_mtime) for entry in entries if entry.is_file()]
+
+
+def watch_folder(folder: str, poll_interval: float = 1.0) -> Inotify_Watcher | Polling_Watcher:
+    """Watch a folder for new files, using inotify where possible and polling otherwise.
+
+    Args:
+        folder (str): The folder to watch.
+        poll_interval (float, optional): Seconds between listings if polling has to be used. Defaults to 1.0.
+
+    Returns:
+        Inotify_Watcher | Polling_Watcher: An iterable of `Arrival`s.
+    """
+    try:
+        return Inotify_Watcher(folder)
+    except (OSError, AttributeError):
+        # AttributeError: the C library was found, but it has no inotify functions
+        return Polling_Watcher(folder, poll_interval)
@@ -0,0 +1,353 @@
+"""Re-converting a revised answer file for the same loan, reusing whatever the conversion of the previous revision already built.
+
+`Knackly_Writer.create()` is made of named sections (see `Knackly_Writer.section()`). With a `Revision_Tracker`, the writer records for
+each section a fingerprint of every answer it asked for (including the ones that weren't in the file), the ids in each `uuid_map`
+category it read, and the entries it added to `uuid_map`. Those records are the snapshot saved next to the output
+(`loan.json` -> `loan.snapshot.json`).
+
+When the next revision of the loan is converted against that output and its snapshot, a section whose answers all have the same
+fingerprints as before, and whose `uuid_map` categories hold the same ids, is copied from the previous output, ids included, instead
+of being built. Every other section is built as usual and then compared with its previous output: each object that hasn't changed
+apart from its id gets its previous id back, so only the objects that were actually edited get new ones.
+
+The result is the document a full conversion would produce, except for which ids the objects have. Nothing is copied if the snapshot
+was written by a different version of the converter (see `conversion_cache.converter_version()`); the ids are still reused.
+"""
+
+import copy
+import hashlib
+import json
+import marshal
+import os
+from typing import Any
+
+from anx_parser import Answer_Record
+from conversion_cache import converter_version
+from object_ids import Lazy_Id
+
+SNAPSHOT_SUFFIX = ".snapshot.json"
+
+
+def snapshot_path(output_path: str) -> str:
+    """Get the path of the snapshot written alongside an output file, e.g. `loan.json` -> `loan.snapshot.json`."""
+    if output_path == "-":
+        # Writing to stdout, so put the snapshot in the current directory instead
+        return "anx2json.snapshot.json"
+    return f"{os.path.splitext(output_path)[0]}{SNAPSHOT_SUFFIX}"
+
+
+def record_parts(record: Answer_Record) -> tuple:
+    """Get everything the `ANX_Parser.parse_*` methods read from a record, as nested tuples."""
+    raw = record.raw
+    if isinstance(raw, tuple):
+        raw = tuple(record_parts(item) for item in raw)
+    return (record.value_type, record.unanswered, raw)
+
+
+def answer_fingerprint(record: Answer_Record | None) -> str | None:
+    """Hash an answer's record, so that two revisions of an answer file can be compared answer by answer. A missing answer is None.
+
+    The record is serialized with `marshal`, which is about twice as fast as `repr()`. Should its format ever change between Python
+    versions, the fingerprints wouldn't match, and every section would be built.
+    """
+    if record is None:
+        return None
+    return hashlib.blake2b(marshal.dumps(record_parts(record)), digest_size=16).hexdigest()
+
+
+def category_ids(category: dict) -> list[list]:
+    """Get the keys of a `uuid_map` category and their ids (None for an id that hasn't been generated yet), in order."""
+    return [[key, value.value if isinstance(value, Lazy_Id) else value] for key, value in category.items()]
+
+
+def shape(data: Any, shapes: dict[int, int]) -> int:
+    """Hash a cleaned tree, leaving out the values of its "id$" keys, so two trees that only differ by ids have the same shape. The shape
+    of every dictionary and list in the tree is also kept in `shapes`, by `id()`, for `match_ids()`.
+
+    Shapes only decide which objects get their previous ids back, never what is in the output, so a hash is enough to compare them.
+    """
+    if isinstance(data, dict):
+        value = hash(("{", *[(key, shape(item, shapes)) for key, item in data.items() if key != "id$"]))
+    elif isinstance(data, list):
+        value = hash(("[", *[shape(item, shapes) for item in data]))
+    else:
+        # With the type, since 1, 1.0 and True hash the same
+        return hash((type(data), data))
+    shapes[id(data)] = value
+    return value
+
+
+def pair_ids(new: Any, old: Any, mapping: dict[str, str]) -> None:
+    """Map every id in `new` to the id at the same place in `old`. Both trees must have the same shape."""
+    if isinstance(new, dict):
+        if isinstance(new.get("id$"), str) and isinstance(old.get("id$"), str):
+            mapping[new["id$"]] = old["id$"]
+        for key, value in new.items():
+            if isinstance(value, (dict, list)):
+                pair_ids(value, old[key], mapping)
+    elif isinstance(new, list):
+        for item, old_item in zip(new, old):
+            if isinstance(item, (dict, list)):
+                pair_ids(item, old_item, mapping)
+
+
+def match_ids(new: Any, old: Any, shapes: dict[int, int], mapping: dict[str, str]) -> None:
+    """Find the objects of `new` that are unchanged in `old`, the previous revision of the same part of the document, and map their ids
+    to the previous ones.
+
+    A dictionary with the same shape as its previous version keeps all of its ids. Otherwise its values are matched key by key. The items
+    of a list are matched to a previous item of the same shape wherever they moved to, and the remaining items are matched in order.
+
+    Args:
+        new (Any): The cleaned tree that was just built.
+        old (Any): The same key of the previous output.
+        shapes (dict[int, int]): The shapes of both trees, see `shape()`.
+        mapping (dict[str, str]): Filled in with the new id -> previous id of every unchanged object.
+    """
+    if isinstance(new, dict) and isinstance(old, dict):
+        if shapes[id(new)] == shapes[id(old)]:
+            pair_ids(new, old, mapping)
+            return
+        for key, value in new.items():
+            if key != "id$" and key in old:
+                match_ids(value, old[key], shapes, mapping)
+    elif isinstance(new, list) and isinstance(old, list):
+        candidates = {}
+        for item in old:
+            if isinstance(item, (dict, list)):
+                candidates.setdefault(shapes[id(item)], []).append(item)
+        changed = []
+        matched = set()
+        for item in new:
+            if not isinstance(item, (dict, list)):
+                continue
+            same = candidates.get(shapes[id(item)])
+            if same:
+                old_item = same.pop(0)
+                matched.add(id(old_item))
+                pair_ids(item, old_item, mapping)
+            else:
+                changed.append(item)
+        left = [item for item in old if isinstance(item, (dict, list)) and id(item) not in matched]
+        for item, old_item in zip(changed, left):
+            match_ids(item, old_item, shapes, mapping)
+
+
+def rewrite_ids(data: Any, mapping: dict[str, str]) -> Any:
+    """Replace every id in `mapping` with the id it maps to, in place, both in "id$" keys and in references to other objects."""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(value, str):
+                if value in mapping:
+                    data[key] = mapping[value]
+            elif isinstance(value, (dict, list)):
+                rewrite_ids(value, mapping)
+    elif isinstance(data, list):
+        for i, value in enumerate(data):
+            if isinstance(value, str):
+                if value in mapping:
+                    data[i] = mapping[value]
+            elif isinstance(value, (dict, list)):
+                rewrite_ids(value, mapping)
+    elif isinstance(data, str):
+        return mapping.get(data, data)
+    return data
+
+
+class Revision_Tracker:
+    """Records the snapshot of a conversion, and copies the sections that haven't changed from the output of the previous revision.
+
+    `Knackly_Writer.section()` calls `begin()` before each section and `end()` after each section that was built, and
+    `Knackly_Writer.create()` calls `start()` once. Without a previous revision, the tracker only records.
+    """
+
+    def __init__(self, document: dict = None, snapshot: dict = None) -> None:
+        """
+        Args:
+            document (dict, optional): The output of the previous revision. The sections that are copied from it are moved into the
+                new document rather than copied, so it shouldn't be used afterwards. Defaults to None.
+            snapshot (dict, optional): The snapshot written along with `document`, see `snapshot()`. Defaults to None, in which case
+                every section is built, and only the ids of `document` are reused.
+        """
+        self.document = document
+        self.previous = {}  # The previous revision's record of each section that can be copied
+        if document is not None and snapshot is not None and snapshot.get("version") == converter_version():
+            self.previous = snapshot["sections"]
+        self.previous_id_seed = None if snapshot is None else snapshot.get("id_seed")
+        self.id_seed = None  # The writer's seed for deterministic ids, if any. See `object_ids.Id_Allocator`.
+        self.sections = {}  # This conversion's record of each section, see `snapshot()`
+        self.reused = []  # The sections that were copied from `document`
+        self.fingerprints = {}  # answer name -> fingerprint, see `fingerprint()`
+        self.ids_read = None  # While a section is being built, the ids of each `uuid_map` category it read, see `category_ids()`
+        self.known_ids = None  # While a section is being built, the keys that were already in each `uuid_map` category
+
+    def fingerprint(self, anx, name: str) -> str | None:
+        if name not in self.fingerprints:
+            self.fingerprints[name] = answer_fingerprint(anx.answer_index.get(name))
+        return self.fingerprints[name]
+
+    def start(self, writer) -> None:
+        """Give the document the id it had in the previous revision.
+
+        With deterministic ids, the ids of an unchanged section only match the previous ones if the seed is the same, and otherwise
+        nothing is copied. Built sections get the ids of their place in the document, rather than the ids of matching objects.
+        """
+        self.id_seed = writer.ids.seed
+        if self.id_seed != self.previous_id_seed:
+            self.previous = {}
+        if self.id_seed is None and self.document is not None and isinstance(self.document.get("id$"), str):
+            writer.json["id$"].value = self.document["id$"]
+
+    def begin(self, writer, name: str, keys: tuple[str, ...]) -> bool:
+        """Start a section of `writer.create()`.
+
+        Returns:
+            bool: True if the section was copied from the previous output, in which case it must not be built.
+        """
+        self.ids_read = None
+        if not keys:  # Nothing to copy, for example `clean_up`
+            return False
+
+        record = self.previous.get(name)
+        if record is not None and self.unchanged(writer, record):
+            self.reuse(writer, name, keys, record)
+            return True
+
+        writer.anx.requested = set()
+        self.ids_read = {}
+        self.known_ids = {category: set(ids) for category, ids in writer.uuid_map.items()}
+        return False
+
+    def unchanged(self, writer, record: dict) -> bool:
+        """Whether every answer and `uuid_map` category a section read in the previous revision is the same in this one."""
+        for name, fingerprint in record["answers"].items():
+            if self.fingerprint(writer.anx, name) != fingerprint:
+                return False
+        return all(category_ids(writer.uuid_map[category]) == ids for category, ids in record["ids"].items())
+
+    def reuse(self, writer, name: str, keys: tuple[str, ...], record: dict) -> None:
+        """Fill in a section from the previous output, along with the `uuid_map` entries it added, and mark its answers as used."""
+        for key in keys:
+            if key in self.document:
+                writer.json[key] = self.document[key]
+
+        for category, entries in record["writes"].items():
+            for key, value in entries:
+                placeholder = writer.uuid_map[category][key] = Lazy_Id()
+                placeholder.value = value
+
+        anx = writer.anx
+        anx.coverage.touch_many(answer for answer in record["used"] if answer in anx.answer_index)
+        self.sections[name] = record
+        self.reused.append(name)
+
+    def read_ids(self, category: str, ids: dict) -> None:
+        """Record that the section being built read a `uuid_map` category. See `Knackly_Writer.referenced_ids()`."""
+        if self.ids_read is not None and category not in self.ids_read:
+            self.ids_read[category] = category_ids(ids)
+
+    def end(self, writer, name: str, keys: tuple[str, ...]) -> None:
+        """Finish a section that was built: clean it up, give its unchanged objects their previous ids, and record it."""
+        anx = writer.anx
+        requested, anx.requested = anx.requested, None
+        writer.clean_keys(keys)
+        if self.document is not None and self.id_seed is None:
+            self.restore_ids(writer, keys)
+        if self.ids_read is None:
+            return
+
+        # The ids of the objects added to `uuid_map`, or None for the ones that didn't make it into the section's output
+        writes = {}
+        for category, ids in writer.uuid_map.items():
+            added = [[key, value.value] for key, value in ids.items() if key not in self.known_ids[category]]
+            if added:
+                writes[category] = added
+        touched = anx.coverage.touched
+        requested.discard(None)
+        self.sections[name] = {
+            "keys": list(keys),
+            "answers": {answer: self.fingerprint(anx, answer) for answer in sorted(requested)},
+            "ids": self.ids_read,
+            "used": sorted(answer for answer in requested if name in touched.get(answer, ())),
+            "writes": writes,
+        }
+        self.ids_read = None
+
+    def restore_ids(self, writer, keys: tuple[str, ...]) -> None:
+        """Give the objects of a built section that are unchanged since the previous output their previous ids, including the
+        `uuid_map` entries pointing at them."""
+        shapes = {}
+        mapping = {}
+        for key in keys:
+            if key in writer.json and key in self.document:
+                shape(writer.json[key], shapes)
+                shape(self.document[key], shapes)
+                match_ids(writer.json[key], self.document[key], shapes, mapping)
+        if not mapping:
+            return
+
+        for key in keys:
+            if key in writer.json:
+                writer.json[key] = rewrite_ids(writer.json[key], mapping)
+        for ids in writer.uuid_map.values():
+            for value in ids.values():
+                if isinstance(value, Lazy_Id) and value.value in mapping:
+                    value.value = mapping[value.value]
+
+    def snapshot(self) -> dict:
+        """Get the snapshot of the conversion, to save next to its output for the next revision (see `save()`)."""
+        return {"version": converter_version(), "id_seed": self.id_seed, "sections": copy.deepcopy(self.sections)}
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="UTF-8") as f:
+            json.dump(self.snapshot(), f)
+
+    @classmethod
+    def load(cls, document_path: str, snapshot_path: str = None) -> "Revision_Tracker":
+        """Load the output of the previous revision, and the snapshot written along with it if there is one."""
+        with open(document_path, "r", encoding="UTF-8") as f:
+            document = json.load(f)
+        snapshot = None
+        if snapshot_path is not None:
+            with open(snapshot_path, "r", encoding="UTF-8") as f:
+                snapshot = json.load(f)
+        return cls(document, snapshot)
+
+    @classmethod
+    def from_conversion(cls, document: dict, converted: dict, recorded: "Revision_Tracker") -> "Revision_Tracker":
+        """Make up for a missing snapshot, from converting the previous revision's answer file again.
+
+        That conversion handed out new ids, so they are matched to the ids in `document` first. A section whose output doesn't match
+        `document` apart from ids (because `document` was written by an older version of the converter, say) is always rebuilt.
+
+        Args:
+            document (dict): The output of the previous revision.
+            converted (dict): The output of converting the previous revision's answer file again.
+            recorded (Revision_Tracker): The tracker that recorded that conversion.
+
+        Returns:
+            Revision_Tracker: A tracker for converting the new revision against `document`.
+        """
+        mapping = {}
+        for key, value in converted.items():
+            if key != "id$" and key in document:
+                # Rewritten before matching as well, since a key can refer to the objects of an earlier one
+                value = converted[key] = rewrite_ids(value, mapping)
+                shapes = {}
+                shape(value, shapes)
+                shape(document[key], shapes)
+                match_ids(value, document[key], shapes, mapping)
+                converted[key] = rewrite_ids(value, mapping)
+
+        snapshot = recorded.snapshot()
+        for record in snapshot["sections"].values():
+            for entries in (*record["ids"].values(), *record["writes"].values()):
+                for entry in entries:
+                    entry[1] = mapping.get(entry[1], entry[1])
+        # Once the ids are matched, a key that is the same apart from ids is the same, full stop
+        snapshot["sections"] = {
+            name: record
+            for name, record in snapshot["sections"].items()
+            if all(converted.get(key) == document.get(key) for key in record["keys"])
+        }
+        return cls(document, snapshot)
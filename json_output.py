@@ -0,0 +1,128 @@
+"""Writing the converted document as JSON.
+
+The document can be written indented (the default, matching `json.dump(..., indent=2)`) or compact, and encoded with the standard
+library's `json` or with orjson, which is several times faster and is used when it's installed. It can be written all at once with
+`write_json()`, or one top level key at a time through an `Object_Stream`, which `Knackly_Writer.create()` fills in as each section
+finishes.
+
+The two encoders don't write exactly the same bytes:
+
+- `json` escapes non-ASCII characters (`"\\u00e9"`), where orjson writes them as UTF-8
+- floats with an exponent are written as `1e+16` / `1.5e-07` by `json`, and as `1e16` / `1.5e-7` by orjson (the same numbers)
+- NaN and infinity, which JSON has no literal for, are written as `NaN` / `Infinity` by `json`, and as `null` by orjson
+- orjson can't encode integers beyond 64 bits, so a value holding one is encoded with `json` instead, even if orjson was asked for
+"""
+
+import json
+from functools import cache
+from typing import Any, NamedTuple
+
+ENCODERS = ("auto", "orjson", "json")
+
+
+class Output_Format(NamedTuple):
+    compact: bool = False  # Leave out the indentation and the spaces after separators
+    encoder: str = "auto"  # One of `ENCODERS`
+    stream: bool = False  # Write each top level key as soon as its section of `create()` has finished
+
+
+@cache
+def load_orjson():
+    """Import orjson, or get None if it isn't installed.
+
+    orjson is optional, the standard library's json is used without it. It is only imported the first time something is encoded (or an
+    encoder is resolved), since `main.py` imports this module up front, and `--help` or an argument error shouldn't pay for orjson.
+    """
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def resolve_encoder(encoder: str) -> str:
+    """Check an encoder name, and turn "auto" into the encoder that will actually be used.
+
+    Raises:
+        ValueError: If `encoder` isn't one of `ENCODERS`.
+        ImportError: If "orjson" was asked for, but orjson isn't installed.
+    """
+    if encoder not in ENCODERS:
+        raise ValueError(f"Unknown encoder '{encoder}', expecting one of: {', '.join(ENCODERS)}")
+    if encoder == "auto":
+        return "json" if load_orjson() is None else "orjson"
+    if encoder == "orjson" and load_orjson() is None:
+        raise ImportError("The orjson encoder was requested, but orjson isn't installed. Install it with `pip install orjson`.")
+    return encoder
+
+
+def encode(data: Any, compact: bool = False, encoder: str = "auto") -> bytes:
+    """Encode `data` as UTF-8 JSON, falling back to `json` if orjson can't encode it.
+
+    Args:
+        data (Any): The value to encode.
+        compact (bool, optional): Whether to leave out whitespace. Defaults to False, which indents by 2 spaces.
+        encoder (str, optional): One of `ENCODERS`. Defaults to "auto".
+
+    Returns:
+        bytes: The encoded JSON.
+    """
+    if resolve_encoder(encoder) == "orjson":
+        orjson = load_orjson()
+        try:
+            return orjson.dumps(data) if compact else orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # `orjson.JSONEncodeError` is a TypeError. A NumValue can hold an integer beyond 64 bits, which only `json` can encode.
+            pass
+    if compact:
+        return json.dumps(data, separators=(",", ":")).encode()
+    return json.dumps(data, indent=2).encode()
+
+
+def binary_output(outfile):
+    """Get the binary stream to write encoded JSON to, which is the one underneath a file opened in text mode (including stdout)."""
+    if hasattr(outfile, "buffer"):
+        outfile.flush()
+        return outfile.buffer
+    return outfile
+
+
+def write_json(data: Any, outfile, output_format: Output_Format = Output_Format()) -> None:
+    """Write a whole document to `outfile`, which may be opened in text or binary mode."""
+    output = binary_output(outfile)
+    output.write(encode(data, output_format.compact, output_format.encoder))
+    output.flush()
+
+
+class Object_Stream:
+    """Writes a JSON object to a file one member at a time, producing the same bytes as encoding the whole object at once.
+
+    Call `write()` for each key in order, then `close()` to finish the object (which doesn't close the file).
+    """
+
+    def __init__(self, outfile, output_format: Output_Format = Output_Format()) -> None:
+        self.output = binary_output(outfile)
+        self.compact = output_format.compact
+        self.encoder = resolve_encoder(output_format.encoder)
+        self.members = 0
+
+    def write(self, key: str, value: Any) -> None:
+        """Encode and write one member of the object."""
+        member = encode(value, self.compact, self.encoder)
+        key = encode(key, True, self.encoder)
+        if self.compact:
+            self.output.write(b"{" if self.members == 0 else b",")
+            self.output.write(key + b":" + member)
+        else:
+            self.output.write(b"{\n  " if self.members == 0 else b",\n  ")
+            # Members sit one level deep. Newlines only ever appear as indentation, since they are escaped inside strings.
+            self.output.write(key + b": " + member.replace(b"\n", b"\n  "))
+        self.members += 1
+
+    def close(self) -> None:
+        """Finish the object."""
+        if self.members == 0:
+            self.output.write(b"{}")
+        else:
+            self.output.write(b"}" if self.compact else b"\n}")
+        self.output.flush()
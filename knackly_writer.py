@@ -1,14 +1,91 @@
+import json
+import time
+from collections.abc import Callable, Hashable
+from contextlib import contextmanager
+from functools import cache
 from itertools import zip_longest
-
-from bson import ObjectId
+from typing import Any
 
 from anx_parser import ANX_Parser
+from field_mapping import EXTRACTION_PLAN, WRITER_ANSWER_NAMES
+from incremental import Revision_Tracker
+from json_output import Object_Stream
+from object_ids import Id_Allocator, Lazy_Id, child_path
+
+# Every answer each gated sub-builder reads, keyed by the name passed to `Knackly_Writer.is_gate_open()`
+GATED_ANSWERS = {
+    "interestStepSpreadsheet": ("Interest Step Rate NU", "Interest Step Duration NU"),
+    "lineOfCredit": EXTRACTION_PLAN.section_answer_names("lineOfCredit"),
+    "construction": EXTRACTION_PLAN.section_answer_names("construction")
+    + (
+        "Contractor Street Address TE",
+        "Contractor City TE",
+        "Contractor State MC",
+        "Contractor Zip TE",
+        "Construction Contract Percent NU",
+        "Construction Contract Days NU",
+        "Designer Street Address TE",
+        "Designer City TE",
+        "Designer State MC",
+        "Designer Zip TE",
+    ),
+    "impounds": EXTRACTION_PLAN.section_answer_names("impounds"),
+}
+
+# The kinds of fees on the settlement statement. Each one has its own group of repeated answers, see `fee_answer_names()`.
+FEE_TYPES = ("Broker", "Lender", "Other")
+
+
+def fee_answer_names(fee_type: str) -> list[str]:
+    """Get the names of the answers that make up a single type of settlement fee.
+
+    Args:
+        fee_type (str): Either `Broker`, `Lender`, or `Other`.
+
+    Returns:
+        list[str]: The answer names for the amount, description, delivery comment (and paid to, for `Other` fees).
+    """
+    names = [
+        f"{fee_type} Fee NU",
+        f"{fee_type} Fee Description TE",
+        f"{fee_type} Delivery Fee Comment MC",
+    ]
+
+    if fee_type == "Other":
+        names.append(f"{fee_type} Paid To Fee TE")
+
+    return names
+
+
+def count_ids(data: Any) -> int:
+    """Count the "id$" keys in a tree of dictionaries and lists."""
+    if isinstance(data, dict):
+        return ("id$" in data) + sum(count_ids(value) for value in data.values())
+    elif isinstance(data, list):
+        return sum(count_ids(item) for item in data)
+    return 0
 
 
 class Knackly_Writer:
-    def __init__(self, anx_parser: ANX_Parser):
+    def __init__(self, anx_parser: ANX_Parser, profile: bool = False, revision: Revision_Tracker = None, id_seed: str = None):
         self.anx = anx_parser
-        self.json = {"id$": str(ObjectId())}
+        # Records the snapshot of the conversion, and copies unchanged sections from the previous revision's output. See `incremental`.
+        self.revision = revision
+        # Filled in by `self.section()` during `create()` if profiling was asked for. See `profile_report()`.
+        self.profile = [] if profile else None
+        # Every "id$" starts out as a placeholder, and only the ones that survive `clean_up()` are turned into real ids. With `id_seed`,
+        # those are derived from the seed and where each object ends up in the document, so the same input always gives the same ids.
+        self.ids = Id_Allocator(id_seed)
+        self.json = {"id$": self.ids.new()}
+        self.extraction = None  # Filled in by `mapped_section()` the first time it is needed
+        self.section_values = {}  # The values of each section `mapped_section()` has decoded so far
+        self.output = None  # Where `create()` streams the document to, if anywhere. See `flush_output()`.
+        self.written = {}  # When profiling a streamed document, the top level keys that were written, for `profile_report()`
+        self.skipped_builders = []  # The gated sub-builders that `is_gate_open()` decided not to run
+        # Per-file facts (client name, transactional flag, ...) that several sections need. See `remember()`.
+        self.facts = {}
+        self.fact_requests = {}  # When `self.anx.requested` is being recorded, the answers each fact was computed from
+        self.fact_lookups_avoided = 0  # How many times a fact was reused instead of being looked up again
         self.uuid_map = {
             "Borrowers": {},
             "Signers": {},
@@ -26,22 +103,69 @@ class Knackly_Writer:
         #     }
         # }
 
-    def remove_none_values(self, dictionary: dict) -> dict:
-        """Recursively removes all occurrences of "None" within a dictionary
-        This is moreso a helper function to make sure that self.json is kept clean.
+    def has_only_keys(self, dictionary: dict, *keys: str) -> bool:
+        """Check whether `keys` are exactly the keys of a dictionary whose values aren't `None`.
+
+        Lets the builders decide whether an object is worth keeping without making a cleaned copy of it first. Everything is cleaned
+        once, at the end, by `clean_up()`.
 
         Args:
-            dictionary (dict): The dictionary to which "None" values will be removed.
+            dictionary (dict): The dictionary to check.
+            *keys (str): The keys that should be the only ones with a value, usually just "id$".
 
         Returns:
-            dict: The new dictionary, without any "None" values
+            bool: `True` if every key with a value is one of `keys`, and every one of `keys` has a value.
         """
-        if isinstance(dictionary, dict):
-            return {key: self.remove_none_values(value) for key, value in dictionary.items() if value is not None}
-        elif isinstance(dictionary, list):
-            return [self.remove_none_values(item) for item in dictionary if item is not None]
-        else:
-            return dictionary
+        present = 0
+        for key, value in dictionary.items():
+            if value is not None:
+                if key not in keys:
+                    return False
+                present += 1
+        return present == len(keys)
+
+    def mapped_section(self, section: str) -> dict:
+        """Get the values of one of the flat sections described in `field_mapping.SECTIONS`.
+
+        The first call finds the answers of the whole extraction plan in a single pass over the answer set. Each section's answers are
+        only parsed the first time that section is built, so answers left over in a section that is gated off never fail the conversion.
+
+        Args:
+            section (str): The name of the section, for example "loanFeatures".
+
+        Returns:
+            dict: The section's Knackly keys and parsed values, in table order. Placeholder keys (and answers not found) are `None`.
+        """
+        if self.extraction is None:
+            self.extraction = self.anx.extract(EXTRACTION_PLAN)
+
+        if self.anx.requested is not None:
+            self.anx.requested.update(EXTRACTION_PLAN.section_answer_names(section))
+        values = self.section_values.get(section)
+        if values is None:
+            values = self.section_values[section] = self.anx.decode_section(EXTRACTION_PLAN, section, self.extraction[section])
+        return dict(values)
+
+    def is_gate_open(self, builder: str, gate: Any) -> bool:
+        """Decide whether a gated sub-builder (line of credit, construction, ...) has to run.
+
+        A sub-builder runs if its gate answer is true. It also runs if any of its answers are in the file anyway, since answers that were
+        filled in before the gate was switched off still end up in the output. Otherwise everything it would build is `None`, and
+        `clean_up()` would remove it, so it is skipped along with its lookups.
+
+        Args:
+            builder (str): The name of the sub-builder, a key of `GATED_ANSWERS`.
+            gate (Any): The parsed value of the gate answer.
+
+        Returns:
+            bool: True if the sub-builder has to run.
+        """
+        if self.anx.requested is not None:
+            self.anx.requested.update(GATED_ANSWERS[builder])
+        if gate or any(name in self.anx.answer_index for name in GATED_ANSWERS[builder]):
+            return True
+        self.skipped_builders.append(builder)
+        return False
 
     def is_all_args_none(self, args: dict | list | tuple) -> bool:
         """Helper function to check if all of the arguments provided to it were `None`.
@@ -63,14 +187,76 @@ class Knackly_Writer:
             # This should never run
             raise TypeError(f"Expected a dictionary or a list, but got {type(args).__name__}")
 
+    def remember(self, fact: Hashable, compute: Callable[[], Any]) -> Any:
+        """Compute a per-file fact the first time it is asked for, and reuse it afterwards.
+
+        Every reuse is counted in `self.fact_lookups_avoided`. When the answers asked for are being recorded (see `self.revision`), a
+        reused fact counts as asking for the answers it was computed from again.
+
+        Args:
+            fact (Hashable): The name of the fact, for example "is_transactional".
+            compute (Callable[[], Any]): Produces the value of the fact from the .anx file.
+
+        Returns:
+            Any: The value of the fact.
+        """
+        requested = self.anx.requested
+        if fact in self.facts:
+            self.fact_lookups_avoided += 1
+            if requested is not None:
+                requested.update(self.fact_requests.get(fact, ()))
+            return self.facts[fact]
+
+        if requested is None:
+            value = self.facts[fact] = compute()
+            return value
+
+        self.anx.requested = set()
+        try:
+            value = self.facts[fact] = compute()
+        finally:
+            self.fact_requests[fact] = self.anx.requested
+            requested.update(self.anx.requested)
+            self.anx.requested = requested
+        return value
+
+    def referenced_ids(self, category: str) -> dict:
+        """Get one category of `self.uuid_map`, to refer to the objects of an earlier section.
+
+        Args:
+            category (str): The category, for example "Properties".
+
+        Returns:
+            dict: The category's keys and the `Lazy_Id` of each of their objects.
+        """
+        ids = self.uuid_map[category]
+        if self.revision is not None:
+            self.revision.read_ids(category, ids)
+        return ids
+
+    def client_name(self) -> str | None:
+        """Returns the client password from the .anx file, exactly as it was entered
+
+        Returns:
+            str | None: The client password if present, otherwise None
+        """
+        return self.remember("client_name", lambda: self.anx.parse_field("Client Specific Pass Store TX"))
+
+    def client_mc(self) -> str | None:
+        """Returns the client selected from the client dropdown in the .anx file
+
+        Returns:
+            str | None: The selected client if present, otherwise None
+        """
+        return self.remember("client_mc", lambda: self.anx.parse_field("Client MC"))
+
     def is_transactional(self) -> bool:
         """Returns whether or not the anx file came from Transactional
 
         Returns:
             bool: True if the anx file came from Transactional, otherwise False
         """
-        client_name = self.anx.parse_field("Client Specific Pass Store TX")
-        return client_name.lower() == "trans"
+        return self.remember("is_transactional", lambda: self.client_name().lower() == "trans")
 
     def product_mc(self, client: str) -> str | None:
         """Gets the name of the selected product from the .anx file.
@@ -81,14 +267,18 @@ class Knackly_Writer:
         Returns:
             str | None: The name of the selected product if one was found, otherwise None
         """
-        if client == "Archwest" or client == "DLP" or client == "Oaktree":
-            return self.anx.parse_field("DLP Product MC")
-        elif client == "Churchill":
-            return self.anx.parse_field("Churchill Product MC")
-        elif client.lower() == "housemax":
-            return self.anx.parse_field("DLP Loan Purpose MC")
-        else:
-            return None
+
+        def find_product() -> str | None:
+            if client == "Archwest" or client == "DLP" or client == "Oaktree":
+                return self.anx.parse_field("DLP Product MC")
+            elif client == "Churchill":
+                return self.anx.parse_field("Churchill Product MC")
+            elif client.lower() == "housemax":
+                return self.anx.parse_field("DLP Loan Purpose MC")
+            else:
+                return None
+
+        return self.remember(("product_mc", client), find_product)
 
     def address(
         self,
@@ -111,7 +301,7 @@ class Knackly_Writer:
             dict: The Knackly "Address" dictionary, if at least one field was present, otherwise None.
         """
         result = {
-            "id$": str(ObjectId()),
+            "id$": self.ids.new(),
             "street": street,
             "city": city,
             "state": state,
@@ -122,10 +312,8 @@ class Knackly_Writer:
         if county is not None:
             result["selectCounty"] = f"{state}-{county[:-2]}"
 
-        result = self.remove_none_values(result)
-
         # If `id$` is the only key in result, return None instead.
-        if len(result) == 1 and "id$" in result:
+        if self.has_only_keys(result, "id$"):
             return None
 
         return result
@@ -167,7 +355,7 @@ class Knackly_Writer:
         ) = landing_page_components
 
         borrower_page = {
-            "id$": str(ObjectId()),
+            "id$": self.ids.new(),
             "Borrowers": None,  # This will be replaced with the list of Borrower objects
             "BorrowerNoticeSentTo": notice_sent_to,
             "Notice": self.address(street, city, state, zip_code),
@@ -178,7 +366,7 @@ class Knackly_Writer:
         borrowers = []
 
         non_borrower_page = {
-            "id$": str(ObjectId()),
+            "id$": self.ids.new(),
             "nonborrowers": None,  # This will be replaced with the list of third party borrowers
         }
         non_borrowers = []
@@ -283,7 +471,7 @@ class Knackly_Writer:
                 o1o2_titles,
             ) = borrower
             temp_borrower = {
-                "id$": str(ObjectId()),
+                "id$": self.ids.new(),
                 "BorrowerName": name,
                 "BorrowerEntityType": entity_type,
                 "BorrowerOrgState": org_state,
@@ -293,14 +481,16 @@ class Knackly_Writer:
             # Trusts / Joint Ventures
             if entity_type in ["trust", "joint venture"]:
                 if entity_type == "trust":
-                    names = self.remove_none_values(trustees)
+                    names = trustees
                     temp_borrower["BorrowerName"] = trust_name
                     temp_borrower["TrustVestingName"] = name
                 else:
-                    names = self.remove_none_values(venturers)
+                    names = venturers
                 temp_peoples = []
                 for name in names:
-                    temp_peoples.append({"id$": str(ObjectId()), "Signer1Name": name})
+                    if name is None:
+                        continue
+                    temp_peoples.append({"id$": self.ids.new(), "Signer1Name": name})
                 temp_borrower["VenturersOrTrustees"] = temp_peoples
 
             # Other entity types
@@ -357,7 +547,7 @@ class Knackly_Writer:
                     # print(f"{idx_i}:{idx_ii} {name=}, {type_=}, {state=}, {title=}")
 
                     knackly_s1 = {
-                        "id$": str(ObjectId()),
+                        "id$": self.ids.new(),
                         "Signer1Name": name,
                         "Signer1Title": title,
                         "Signer1EntityType": type_,
@@ -407,7 +597,7 @@ class Knackly_Writer:
 
                         # Build a single element of the Signer1Signers list (or Signer1VenturersOrTrustees)
                         knackly_s1s2 = {
-                            "id$": str(ObjectId()),
+                            "id$": self.ids.new(),
                             "Signer2Name": name,
                             "Signer2Title": title,
                             "Signer2EntityType": type_,
@@ -430,14 +620,13 @@ class Knackly_Writer:
 
                             # Build a single element of the Signer2Signers list
                             knackly_s1s2s3 = {
-                                "id$": str(ObjectId()),
+                                "id$": self.ids.new(),
                                 "Signer3Name": name,
                                 "Signer3Title": title,
                             }
 
                             # Add it to the list if it is relevant
-                            knackly_s1s2s3 = self.remove_none_values(knackly_s1s2s3)
-                            if len(knackly_s1s2s3) == 1 and "id$" in knackly_s1s2s3:
+                            if self.has_only_keys(knackly_s1s2s3, "id$"):
                                 continue
                             knackly_s1s2["Signer2Signers"].append(knackly_s1s2s3)
 
@@ -455,14 +644,13 @@ class Knackly_Writer:
 
                             # Build a single element of the Signer3Owners list
                             knackly_s1s2o1 = {
-                                "id$": str(ObjectId()),
+                                "id$": self.ids.new(),
                                 "Signer3Name": name,
                                 "Signer3Title": title,
                             }
 
                             # Add it to the list if it is relevant
-                            knackly_s1s2o1 = self.remove_none_values(knackly_s1s2o1)
-                            if len(knackly_s1s2o1) == 1 and "id$" in knackly_s1s2o1:
+                            if self.has_only_keys(knackly_s1s2o1, "id$"):
                                 continue
                             if self.is_transactional():
                                 knackly_s1s2["Signer2Owners"].append(knackly_s1s2o1)
@@ -472,14 +660,13 @@ class Knackly_Writer:
                             del knackly_s1s2["Signer2Name"]
                             del knackly_s1s2["Signer2Title"]
                             knackly_s1s2.update({"Signer1Name": name})
-                        knackly_s1s2 = self.remove_none_values(knackly_s1s2)
                         if len(knackly_s1s2["Signer2Signers"]) == 0:
                             del knackly_s1s2["Signer2Signers"]
                         if len(knackly_s1s2["Signer2Owners"]) == 0:
                             del knackly_s1s2["Signer2Owners"]
 
                         # Add it to the list if it is relevant
-                        if (len(knackly_s1s2) == 1 and "id$" in knackly_s1s2) or (name is None and type_ is None and state is None):
+                        if self.has_only_keys(knackly_s1s2, "id$") or (name is None and type_ is None and state is None):
                             continue
 
                         if parent_type not in ["trust", "joint venture"]:
@@ -514,7 +701,7 @@ class Knackly_Writer:
 
                         # Build a single element of the Signer1Owners list
                         knackly_s1o1 = {
-                            "id$": str(ObjectId()),
+                            "id$": self.ids.new(),
                             "Signer2Name": name,
                             "Signer2Title": title,
                             "Signer2EntityType": type_,
@@ -535,21 +722,19 @@ class Knackly_Writer:
 
                             # Build a single element of the Signer2Signers list
                             knackly_s1o1o2 = {
-                                "id$": str(ObjectId()),
+                                "id$": self.ids.new(),
                                 "Signer3Name": name,
                                 "Signer3Title": title,
                             }
 
                             # Add it to the list if it is relevant
-                            knackly_s1o1o2 = self.remove_none_values(knackly_s1o1o2)
-                            if len(knackly_s1o1o2) == 1 and "id$" in knackly_s1o1o2:
+                            if self.has_only_keys(knackly_s1o1o2, "id$"):
                                 continue
                             if self.is_transactional():
                                 knackly_s1o1["Signer2Signers"].append(knackly_s1o1o2)
 
                         # Add it to the list if it is relevant
-                        knackly_s1o1 = self.remove_none_values(knackly_s1o1)
-                        if len(knackly_s1o1) == 1 and "id$" in knackly_s1o1:
+                        if self.has_only_keys(knackly_s1o1, "id$"):
                             continue
                         if self.is_transactional():
                             knackly_s1["Signer1Owners"].append(knackly_s1o1)
@@ -559,7 +744,6 @@ class Knackly_Writer:
                             del knackly_s1o1["Signer2Signers"]
 
                     # Clean up s1
-                    knackly_s1 = self.remove_none_values(knackly_s1)
                     # # Deal with potentially empty s1s2 and s1o1 lists
                     if len(knackly_s1["Signer1Signers"]) == 0:
                         del knackly_s1["Signer1Signers"]
@@ -568,7 +752,7 @@ class Knackly_Writer:
                     if len(knackly_s1["Signer1VenturersOrTrustees"]) == 0:
                         del knackly_s1["Signer1VenturersOrTrustees"]
 
-                    if len(knackly_s1) > 1:
+                    if not self.has_only_keys(knackly_s1, "id$"):
                         borrower_signers.append(knackly_s1)
 
                 if borrower_signers:
@@ -595,7 +779,7 @@ class Knackly_Writer:
                     (name, type_, state, title, o1o2_names, o1o2_titles) = o1
 
                     knackly_o1 = {
-                        "id$": str(ObjectId()),
+                        "id$": self.ids.new(),
                         "Signer1Name": name,
                         "Signer1Title": title,
                         "Signer1EntityType": type_,
@@ -620,32 +804,29 @@ class Knackly_Writer:
 
                         # Build a single element of the Signer1Signers list
                         knackly_o1o2 = {
-                            "id$": str(ObjectId()),
+                            "id$": self.ids.new(),
                             "Signer2Name": name,
                             "Signer2Title": title,
                         }
-                        knackly_o1o2 = self.remove_none_values(knackly_o1o2)
 
                         # Add the element to the list if it is relevant
-                        if len(knackly_o1o2) == 1 and "id$" in knackly_o1o2:
+                        if self.has_only_keys(knackly_o1o2, "id$"):
                             continue
                         knackly_o1["Signer1Signers"].append(knackly_o1o2)
 
                     # Clean up o1
-                    knackly_o1 = self.remove_none_values(knackly_o1)
                     # # Deal with potentially empty o1o2 lists
                     if len(knackly_o1["Signer1Signers"]) == 0:
                         del knackly_o1["Signer1Signers"]
 
-                    if len(knackly_o1) > 1:
+                    if not self.has_only_keys(knackly_o1, "id$"):
                         borrower_owners.append(knackly_o1)
 
                 if borrower_owners:
                     temp_borrower["BorrowerOwners"] = borrower_owners
 
             # Clean up each temporary borrower before committing to adding it
-            temp_borrower = self.remove_none_values(temp_borrower)
-            if len(temp_borrower) == 1 and "id$" in temp_borrower:
+            if self.has_only_keys(temp_borrower, "id$"):
                 continue
 
             # Add to either borrowers or non_borrowers
@@ -662,8 +843,8 @@ class Knackly_Writer:
             non_borrower_page["nonborrowers"] = non_borrowers
         # pprint(borrower_page)
         return (
-            self.remove_none_values(borrower_page),
-            self.remove_none_values(non_borrower_page),
+            borrower_page,
+            non_borrower_page,
         )
 
     def non_borrower_property_owners(self) -> dict:
@@ -690,7 +871,7 @@ class Knackly_Writer:
                 dict: A dictionary containing the passed parameters structured in the way Knackly expects.
             """
             result = {
-                "id$": str(ObjectId()),
+                "id$": self.ids.new(),
                 "lenderName": name,
                 "recordingDate": date,
                 "instrumentNumber": instrument,
@@ -698,9 +879,7 @@ class Knackly_Writer:
                 "trustee": trustee,
             }
 
-            result = self.remove_none_values(result)
-
-            if len(result) == 1 and "id$" in result:
+            if self.has_only_keys(result, "id$"):
                 return None
 
             return result
@@ -731,7 +910,7 @@ class Knackly_Writer:
         ) = parsed_components
 
         result = {
-            "id$": str(ObjectId()),
+            "id$": self.ids.new(),
             "isScheduleOfProperties": schedule_of_props,
             "partialReleaseExpert": partial_release,
             "properties": _,
@@ -819,7 +998,7 @@ class Knackly_Writer:
             ) = hotdocs_property_info
 
             collateral_property = {
-                "id$": str(ObjectId()),
+                "id$": self.ids.new(),
                 "minimumReleasePrice": min_release_price,
                 "PropertyAddress": self.address(street, city, state, zip_code, county),
                 "APN": tax_id_num,
@@ -865,8 +1044,8 @@ class Knackly_Writer:
                     vesting = [None]
                 collateral_property["PropertyOwners"] = [
                     {
-                        "id$": str(ObjectId()),
-                        "PropertyOwner": self.uuid_map["Borrowers"][hd_borrower_key],
+                        "id$": self.ids.new(),
+                        "PropertyOwner": self.referenced_ids("Borrowers")[hd_borrower_key],
                         "Vesting": (hd_vesting if hd_vesting != "married" else "married [vested with next borrower]"),
                     }
                     for hd_borrower_key, hd_vesting in zip_longest([prop_borrower_dmc], vesting)
@@ -897,19 +1076,18 @@ class Knackly_Writer:
                 ]
 
             # If the property object only contains an id, don't include it.
-            collateral_property = self.remove_none_values(collateral_property)
-            if len(collateral_property) == 1 and "id$" in collateral_property:
+            if self.has_only_keys(collateral_property, "id$"):
                 continue
             # Another edge case to exclude
-            elif len(collateral_property) == 2 and "id$" in collateral_property and "isRental" in collateral_property:
+            elif self.has_only_keys(collateral_property, "id$", "isRental"):
                 continue
 
             # Add property data to temp_result as well as the Knackly_Writer's uuid_map
             self.uuid_map["Properties"].update({property_key: collateral_property["id$"]})
-            properties.append(self.remove_none_values(collateral_property))
+            properties.append(collateral_property)
 
         result["properties"] = properties
-        return self.remove_none_values(result)
+        return result
 
     def equity_pledge_agreements(self) -> list[dict]:
         """Creates a list of Knackly equity pledge agreement objects
@@ -934,14 +1112,14 @@ class Knackly_Writer:
                 continue
 
             knackly_epa = {
-                "id$": str(ObjectId()),
+                "id$": self.ids.new(),
                 "entitySelection": "otherSelection",
                 "otherCollateral": pledgor_name,
                 "otherState": state,
-                "otherSigners": {"id$": str(ObjectId()), "signerName": signer_name, "signerTitle": signer_title},
+                "otherSigners": {"id$": self.ids.new(), "signerName": signer_name, "signerTitle": signer_title},
             }
 
-            results.append(self.remove_none_values(knackly_epa))
+            results.append(knackly_epa)
 
         return results
 
@@ -963,19 +1141,19 @@ class Knackly_Writer:
                     continue
 
                 knackly_csa = {
-                    "id$": str(ObjectId()),
+                    "id$": self.ids.new(),
                     "debtorSelection": "otherSelection",
                     "otherType": ("individual" if is_individual else None),
                     "otherName": debtor_name,
                     "otherState": state,
-                    "otherSigners": {"id$": str(ObjectId()), "signerName": signer_name, "signerTitle": signer_title},
+                    "otherSigners": {"id$": self.ids.new(), "signerName": signer_name, "signerTitle": signer_title},
                     "csaSelectionVariable": ("blanket" if is_blanket else None),
                 }
 
-                results.append(self.remove_none_values(knackly_csa))
+                results.append(knackly_csa)
         else:
-            single_csa = {"id$": str(ObjectId()), "csaSelectionVariable": ("blanket" if is_blanket else None)}
-            results.append(self.remove_none_values(single_csa))
+            single_csa = {"id$": self.ids.new(), "csaSelectionVariable": ("blanket" if is_blanket else None)}
+            results.append(single_csa)
 
         return results
 
@@ -992,20 +1170,9 @@ class Knackly_Writer:
             Returns:
                 dict: The full variableRate object. For any values that were `None`, they are removed before returning.
             """
-            result = {
-                "id$": str(ObjectId()),
-                "margin": self.anx.parse_NumValue(self.anx.find_answer("Variable Margin NM")),
-                "isDailyFloatingRate": self.anx.parse_TFValue(self.anx.find_answer("Rate Adjust Daily TF")),
-                "changeDate": self.anx.parse_NumValue(self.anx.find_answer("Variable Change Date NU")),
-                "armAdjustmentPeriod": self.anx.parse_NumValue(self.anx.find_answer("Variable ARM Adjustment Period NM")),
-                "firstInterestCap": self.anx.parse_NumValue(self.anx.find_answer("Variable First Interest Cap NM")),
-                "subsequentInterestCap": self.anx.parse_NumValue(self.anx.find_answer("Variable Subsequent Interest Cap NM")),
-                "floorRate": self.anx.parse_NumValue(self.anx.find_answer("Variable Floor Rate NM")),
-                "maximumInterestRateCap": self.anx.parse_NumValue(self.anx.find_answer("Variable Maximum interest Rate Cap NM")),
-                "interestRateIndex": self.anx.parse_MCValue(self.anx.find_answer("Variable Interest Rate Index MC")),
-            }
+            result = {"id$": self.ids.new(), **self.mapped_section("variableRate")}
 
-            return self.remove_none_values(result)
+            return result
 
         def interest_step_spreadsheet_setup() -> list[dict]:
             """Produces the entire interestStepSpreadsheet object for the Knackly json.
@@ -1022,12 +1189,12 @@ class Knackly_Writer:
                     duration (int): The number of months
 
                 Returns:
-                    dict: A dictionary containing the rate, duration, and a bson uuid. If both rate and duration are `None`, then returns `None`.
+                    dict: A dictionary containing the rate, duration, and an id. If both rate and duration are `None`, then returns `None`.
                 """
                 if rate is None and duration is None:
                     return None
-                result = {"id$": str(ObjectId()), "rate": rate, "duration": duration}
-                return self.remove_none_values(result)
+                result = {"id$": self.ids.new(), "rate": rate, "duration": duration}
+                return result
 
             interest_step_rate_nu = self.anx.parse_RptValue(self.anx.find_answer("Interest Step Rate NU"))
             interest_step_duration_nu = self.anx.parse_RptValue(self.anx.find_answer("Interest Step Duration NU"))
@@ -1045,35 +1212,15 @@ class Knackly_Writer:
             ]
             return result
 
-        result = {
-            "id$": str(ObjectId()),
-            "closingDate": self.anx.parse_DateValue(self.anx.find_answer("Document Date DT")),
-            "loanNumber": self.anx.parse_TextValue(self.anx.find_answer("Loan Number TE")),
-            "loanTerm": self.anx.parse_NumValue(self.anx.find_answer("Loan Term NU")),
-            "loanAmount1": self.anx.parse_NumValue(self.anx.find_answer("Loan Amount NU")),
-            "firstPaymentDate": self.anx.parse_DateValue(self.anx.find_answer("First Payment DT")),
-            "isInterestOnly": self.anx.parse_TFValue(self.anx.find_answer("Loan Type Interest Only TF")),
-            "interestOnlyMonths": self.anx.parse_NumValue(self.anx.find_answer("Variable Interest Rate Interest Only Period NM")),
-            "amortizationMonths": self.anx.parse_NumValue(self.anx.find_answer("Amortization Period NU")),
-            # ---
-            "interestRate": self.anx.parse_NumValue(self.anx.find_answer("Interest Rate NU")),
-            "defaultInterestRate": self.anx.parse_NumValue(self.anx.find_answer("Default Interest Rate NU")),
-            "interestCalcType": self.anx.parse_MCValue(self.anx.find_answer("Interest Calc Type MC")),
-            "isVariableRate": self.anx.parse_TFValue(self.anx.find_answer("Loan Type Variable TF")),
-            "isInterestStep": self.anx.parse_TFValue(self.anx.find_answer("Interest Step TF")),
-            "interestStepSpreadsheet": interest_step_spreadsheet_setup(),
-            "isMERSLoan": self.anx.parse_TFValue(self.anx.find_answer("MERS TF")),
-            "mersNumber": self.anx.parse_TextValue(self.anx.find_answer("MERS Number TE")),
-            "MaturityDate": self.anx.parse_DateValue(self.anx.find_answer("Maturity DT")),
-            "paymentInAdvance": self.anx.parse_TFValue(self.anx.find_answer("Payment in Advance TF")),
-        }
+        result = {"id$": self.ids.new(), **self.mapped_section("loanTerms")}
+        # The spreadsheet is kept even if "Interest Step TF" is false, as long as its answers are in the file
+        if self.is_gate_open("interestStepSpreadsheet", result.get("isInterestStep")):
+            result["interestStepSpreadsheet"] = interest_step_spreadsheet_setup()
 
         if result.get("isVariableRate"):
             result["variableRate"] = variable_rate_setup()
-        if result.get("isInterestStep"):
-            result["interestStepSpreadsheet"] = interest_step_spreadsheet_setup()
 
-        return self.remove_none_values(result)
+        return result
 
     def special_loan_features(self) -> dict:
         """Create the `features` top level object.
@@ -1094,16 +1241,9 @@ class Knackly_Writer:
             Returns:
                 dict: the `line of credit` dictionary object.
             """
-            result = {
-                "id$": str(ObjectId()),
-                "isRevolving": self.anx.parse_TFValue(self.anx.find_answer("Credit Line Revolving TF")),
-                "minAdvanceRequest": self.anx.parse_NumValue(self.anx.find_answer("Credit Line Minimum Request NU")),
-                "advanceRequestFee": self.anx.parse_NumValue(self.anx.find_answer("Credit Line Request Fee NU")),
-                "maxDrawsPerMonth": self.anx.parse_NumValue(self.anx.find_answer("Credit Line Maximum Draws NU")),
-                "minOutstandingPrincipalBal": self.anx.parse_NumValue(self.anx.find_answer("Credit Line Minimum Balance NU")),
-            }
+            result = {"id$": self.ids.new(), **self.mapped_section("lineOfCredit")}
 
-            return self.remove_none_values(result)
+            return result
 
         def penalties_setup() -> dict:
             """Responsible for creating the `penalties` object.
@@ -1122,23 +1262,12 @@ class Knackly_Writer:
                 if number is None:
                     return None
 
-                return [{"id$": str(ObjectId()), "Percent": n} for n in number if n is not None]
+                return [{"id$": self.ids.new(), "Percent": n} for n in number if n is not None]
 
-            result = {
-                "id$": str(ObjectId()),
-                "PrepaymentPenalty": self.anx.parse_MCValue(self.anx.find_answer("Prepay MC")),
-                "PrepayTerm": self.anx.parse_NumValue(self.anx.find_answer("Prepay Term NU")),
-                "IsPrepay20Percent": self.anx.parse_TFValue(self.anx.find_answer("Prepay 20 Percent TF")),
-                "PenatlyCalculatedFrom": self.anx.parse_MCValue(self.anx.find_answer("Prepay Lock Penalty MC")),
-                "IsPrepayLockYield": self.anx.parse_TFValue(self.anx.find_answer("Prepay Lock Yield TF")),
-                "PrepayNonlinear": prepay_non_linear_setup(),
-                "PrepayLockDollars": self.anx.parse_NumValue(self.anx.find_answer("Prepay Lock Dollars NU")),
-                "PrepayLockMonths": self.anx.parse_NumValue(self.anx.find_answer("Prepay Lock Months NU")),
-                "PrepayLockPercent": self.anx.parse_NumValue(self.anx.find_answer("Prepay Lock Percent NU")),
-                "prepaymentPremiumMonths": self.anx.parse_NumValue(self.anx.find_answer("Prepayment Premium Months NU")),
-            }
+            result = {"id$": self.ids.new(), **self.mapped_section("penalties")}
+            result["PrepayNonlinear"] = prepay_non_linear_setup()
 
-            return self.remove_none_values(result)
+            return result
 
         def construction_setup() -> dict:
             """Sets up the `construction1` object."""
@@ -1163,34 +1292,15 @@ class Knackly_Writer:
                 for percent, day in zip_longest(percents, days):
                     if self.is_all_args_none([percent, day]):
                         continue
-                    temp = {"id$": str(ObjectId()), "Percent": percent, "Deadline": day}
+                    temp = {"id$": self.ids.new(), "Percent": percent, "Deadline": day}
                     result.append(temp)
 
-                return self.remove_none_values(result)
+                return result
 
-            result = {
-                "id$": str(ObjectId()),
-                "reserve": self.anx.parse_NumValue(self.anx.find_answer("Holdback Amount NU")),
-                "IsNonDutch": self.anx.parse_TFValue(self.anx.find_answer("Non Dutch TF")),
-                "Type": self.anx.parse_MCValue(self.anx.find_answer("Construction Type MC")),
-                "IsExcludeSchedule": self.anx.parse_TFValue(self.anx.find_answer("Exclude Disbursement Schedule TF")),
-                "IsRetainageRequired": self.anx.parse_TFValue(self.anx.find_answer("Retainage Required TF")),
-                "IsThirdPartyFCA": self.anx.parse_TFValue(self.anx.find_answer("Construction Fund Control TF")),
-                "isAssignmentOfPermits": self.anx.parse_TFValue(self.anx.find_answer("Assignment of Permits TF")),
-                "isInspectionFee": self.anx.parse_TFValue(self.anx.find_answer("seth_Inspection Fee TF")),
-                "inspectionFee": self.anx.parse_NumValue(self.anx.find_answer("Inspection Fee NU")),
-                "IsConstructionContract": self.anx.parse_TFValue(self.anx.find_answer("Construction Contract TF")),
-                "ContractorName": self.anx.parse_TextValue(self.anx.find_answer("Construction Contractor TE")),
-                "IsDesignContract": self.anx.parse_TFValue(self.anx.find_answer("Construction Design Contract TF")),
-                "DesignerName": self.anx.parse_TextValue(self.anx.find_answer("Construction Designer TE")),
-                "isThirdPartyConstructionGuaranty": self.anx.parse_TFValue(self.anx.find_answer("Guaranty of Completion TF")),
-                "completionGuarantors": self.anx.parse_RptValue(self.anx.find_answer("Construction Guaranty Name TX")),
-                "doesConstructionBorrowerContribute": self.anx.parse_TFValue(self.anx.find_answer("Construction Borrower Contribution TF")),
-                "constructionBorrowerContribution": self.anx.parse_NumValue(self.anx.find_answer("Construction Borrower Contribution NU")),
-            }
+            result = {"id$": self.ids.new(), **self.mapped_section("construction")}
 
             if result.get("isAssignmentOfPermits"):
-                result["assignmentOfPermitProperties"] = list(self.uuid_map["Properties"].values())
+                result["assignmentOfPermitProperties"] = list(self.referenced_ids("Properties").values())
             if result.get("IsConstructionContract"):
                 result.update(
                     {
@@ -1215,7 +1325,7 @@ class Knackly_Writer:
                     }
                 )
 
-            return self.remove_none_values(result)
+            return result
 
         def loan_features_setup() -> dict:
             """Sets up the "loanFeatures" object."""
@@ -1244,52 +1354,10 @@ class Knackly_Writer:
                 else:
                     return "Dollar Amount"
 
-            result = {
-                "id$": str(ObjectId()),
-                "insurancePayment": self.anx.parse_NumValue(self.anx.find_answer("Insurance Payment NU")),
-                "isSBALoan": self.anx.parse_TFValue(self.anx.find_answer("SBA Loan TF")),
-                "sba_ApprovalDate": self.anx.parse_DateValue(self.anx.find_answer("SBA Approval DT")),
-                "sba_LoanNumber": self.anx.parse_TextValue(self.anx.find_answer("SBA Loan Number TX")),
-                "isCannabisLoan": self.anx.parse_TFValue(self.anx.find_answer("Cannabis Loan TF")),
-                "isAffiliateLoan": self.anx.parse_TFValue(self.anx.find_answer("Affiliate Loan TF")),
-                "isSpecialPurposeEntity": self.anx.parse_TFValue(self.anx.find_answer("Special Purpose Entity TF")),
-                "isRecycledSPE": self.anx.parse_TFValue(self.anx.find_answer("SPE Recycled TF")),
-                "isDebtServiceCoverageRatio": self.anx.parse_TFValue(self.anx.find_answer("DSCR TF")),
-                "ratio": self.anx.parse_NumValue(self.anx.find_answer("DSCR NU")),
-                "isAutoExtension": self.anx.parse_TFValue(self.anx.find_answer("Auto Extension TF")),
-                "isExtension": self.anx.parse_TFValue(self.anx.find_answer("Extension TF")),
-                "extensionNum": self.anx.parse_NumValue(self.anx.find_answer("Extension Number NU")),
-                "extensionMonths": self.anx.parse_NumValue(self.anx.find_answer("Extension Months NU")),
-                "extensionType": self.anx.parse_MCValue(self.anx.find_answer("Extension Fee Type MC")),
-                "extensionFeePercent": self.anx.parse_NumValue(self.anx.find_answer("Extension Fee NU")),
-                "extensionFeeAmount": self.anx.parse_NumValue(self.anx.find_answer("Extension Fee Amount NU")),
-                "isLockbox": self.anx.parse_TFValue(self.anx.find_answer("Rental Income LockBox TF")),
-                "lockbox_Type": self.anx.parse_MCValue(self.anx.find_answer("Rental Income Lockbox MC")),
-                "lockbox_Bank": self.anx.parse_TextValue(self.anx.find_answer("Rental Income Lockbox Bank TE")),
-                "lockbox_FirstRentDate": self.anx.parse_DateValue(self.anx.find_answer("Rental Income Lockbox DT")),
-                "isServicingFees": self.anx.parse_TFValue(self.anx.find_answer("Servicing Fees TF")),
-                "servicingFee": self.anx.parse_NumValue(self.anx.find_answer("Servicing Fees Amount NU")),
-                "isExit": self.anx.parse_TFValue(self.anx.find_answer("Exit Fee TF")),
-                "exitDollars": self.anx.parse_NumValue(self.anx.find_answer("Exit Fee Amount NU")),
-                "isTermination": self.anx.parse_TFValue(self.anx.find_answer("Termination Fee TF")),
-                "terminationDollars": self.anx.parse_NumValue(self.anx.find_answer("Termination Fee AMT NU")),
-                "deferredBrokerType": deferred_broker_type_setup(),
-                "deferredBrokerDollars": self.anx.parse_NumValue(self.anx.find_answer("Deferred Broker Fee NU")),
-                "deferredBrokerPercent": self.anx.parse_NumValue(self.anx.find_answer("Deferred Broker Fee Percent NU")),
-                "deferredOriginationType": self.anx.parse_MCValue(self.anx.find_answer("Deferred Origination Fees MC")),
-                "deferredOriginationDollars": self.anx.parse_NumValue(self.anx.find_answer("Deferred Origination Fee NU")),
-                "deferredOriginationPercent": self.anx.parse_NumValue(self.anx.find_answer("Deferred Origination Fee Percent NU")),
-                "isDefaultFee": self.anx.parse_TFValue(self.anx.find_answer("Default Fee TF")),
-                "defaultFeeAMT": self.anx.parse_NumValue(self.anx.find_answer("Default Fee AMT NU")),
-                "iseResiLoan": self.anx.parse_TFValue(self.anx.find_answer("eResi Loan TF")),
-                "isFStreetLoan": self.anx.parse_TFValue(self.anx.find_answer("F Street Loan TF")),
-                "plDirectOriginationFeeNU": self.anx.parse_NumValue(self.anx.find_answer("PLDirect Origination Fee NU")),
-                "plDirectOriginationFee": self.anx.parse_TFValue(self.anx.find_answer("PLDirect Origination Fee TF")),
-                "isWallisLife": self.anx.parse_TFValue(self.anx.find_answer("Wallis Life Insurance TF")),
-                "silverHillDeferredLoan": self.anx.parse_TFValue(self.anx.find_answer("Silver Hill Deferred Loan TF")),
-            }
+            result = {"id$": self.ids.new(), **self.mapped_section("loanFeatures")}
+            result["deferredBrokerType"] = deferred_broker_type_setup()
 
-            return self.remove_none_values(result)
+            return result
 
         def reserves_setup() -> dict:
             """Create and populate the `reserves` object.
@@ -1314,31 +1382,10 @@ class Knackly_Writer:
                 else:
                     return "Dollar Amount"
 
-            result = {
-                "id$": str(ObjectId()),
-                "IsLender": self.anx.parse_TFValue(self.anx.find_answer("Lender Holdback TF")),
-                "LenderDollars": self.anx.parse_NumValue(self.anx.find_answer("Lender Holdback NU")),
-                "isPropertyTax": self.anx.parse_TFValue(self.anx.find_answer("Real Property Tax Holdback TF")),
-                "PropertyTaxDollars": self.anx.parse_NumValue(self.anx.find_answer("Real Property Tax Holdback NU")),
-                "isPropertyInsurance": self.anx.parse_TFValue(self.anx.find_answer("Insurance Holdback TF")),
-                "PropertyInsuranceDollars": self.anx.parse_NumValue(self.anx.find_answer("Insurance Holdback NU")),
-                "IsCapEx": self.anx.parse_TFValue(self.anx.find_answer("Capex Holdback TF")),
-                "CapExDollars": self.anx.parse_NumValue(self.anx.find_answer("Capex Holdback NU")),
-                "IsAppraisal": self.anx.parse_TFValue(self.anx.find_answer("Appraisal Reserve TF")),
-                "AppraisalDollars": self.anx.parse_NumValue(self.anx.find_answer("Appraisal Reserve Amount NU")),
-                "appraisalARV": self.anx.parse_NumValue(self.anx.find_answer("Appraisal ARV NU")),
-                "DefaultType": self.anx.parse_MCValue(self.anx.find_answer("Default Reserve MC")),
-                "DefaultDollars": self.anx.parse_NumValue(self.anx.find_answer("Default Reserve Dollars NU")),
-                "DefaultMonths": self.anx.parse_NumValue(self.anx.find_answer("Default Reserve Months NU")),
-                "isOccupancy": self.anx.parse_TFValue(self.anx.find_answer("Damage Reserve TF")),
-                "occupancyAmount": self.anx.parse_NumValue(self.anx.find_answer("Damage Reserve Amount NU")),
-                "occupancyDeadline": self.anx.parse_DateValue(self.anx.find_answer("Damage Deadline DT")),
-                "DebtServiceType": debt_service_type_setup(),
-                "DebtServiceDollars": self.anx.parse_NumValue(self.anx.find_answer("Interest Reserve Amount NU")),
-                "DebtServiceMonths": self.anx.parse_NumValue(self.anx.find_answer("Interest Reserve Months NU")),
-            }
+            result = {"id$": self.ids.new(), **self.mapped_section("reserves")}
+            result["DebtServiceType"] = debt_service_type_setup()
 
-            return self.remove_none_values(result)
+            return result
 
         def impounds_setup() -> dict:
             """Set up the `impounds` object.
@@ -1346,38 +1393,27 @@ class Knackly_Writer:
             Returns:
                 dict: The actual value of the `impounds` object.
             """
-            result = {
-                "id$": str(ObjectId()),
-                "initialTax": self.anx.parse_NumValue(self.anx.find_answer("Impound Tax NU")),
-                "initialInsurance": self.anx.parse_NumValue(self.anx.find_answer("Impound Insurance NU")),
-                "initialFloodInsurance": self.anx.parse_NumValue(self.anx.find_answer("Impound Flood NU")),
-                "monthlyTax": self.anx.parse_NumValue(self.anx.find_answer("Tax Payment NU")),
-                "monthlyPropertyInsurance": self.anx.parse_NumValue(self.anx.find_answer("Insurance Payment NU")),
-                "monthlyFloodInsurance": self.anx.parse_NumValue(self.anx.find_answer("First Payment Letter Flood NU")),
-                "monthlyCapEx": self.anx.parse_NumValue(self.anx.find_answer("CapEx Impound NU")),
-            }
+            result = {"id$": self.ids.new(), **self.mapped_section("impounds")}
 
-            return self.remove_none_values(result)
+            return result
 
-        result = {
-            "id$": str(ObjectId()),
-            "isLineOfCredit": self.anx.parse_TFValue(self.anx.find_answer("Credit Line TF")),
-            "lineOfCreditPage": line_of_credit_setup(),
-            "penalties": penalties_setup(),
-            "isConstructionReserve": self.anx.parse_TFValue(self.anx.find_answer("Construction Holdback TF")),
-            "construction1": construction_setup(),
-            "loanFeatures": loan_features_setup(),
-            "reserves": reserves_setup(),
-            "isImpounds1": self.anx.parse_TFValue(self.anx.find_answer("Impound Accounts TF")),
-            "impounds1": impounds_setup(),
-        }
+        result = {"id$": self.ids.new(), **self.mapped_section("features")}
+        if self.is_gate_open("lineOfCredit", result.get("isLineOfCredit")):
+            result["lineOfCreditPage"] = line_of_credit_setup()
+        result["penalties"] = penalties_setup()
+        if self.is_gate_open("construction", result.get("isConstructionReserve")):
+            result["construction1"] = construction_setup()
+        result["loanFeatures"] = loan_features_setup()
+        result["reserves"] = reserves_setup()
+        if self.is_gate_open("impounds", result.get("isImpounds1")):
+            result["impounds1"] = impounds_setup()
 
         if result.get("construction1"):
             if result["construction1"].get("isAssignmentOfPermits"):
                 if result.get("loanFeatures") and result["loanFeatures"].get("isCannabisLoan"):
-                    result["loanFeatures"]["cannabisAssignmentPermitProperties"] = list(self.uuid_map["Properties"].values())
+                    result["loanFeatures"]["cannabisAssignmentPermitProperties"] = list(self.referenced_ids("Properties").values())
 
-        return self.remove_none_values(result)
+        return result
 
     def membership_pledge_and_ucc_docs(self):
         raise NotImplementedError
@@ -1396,11 +1432,11 @@ class Knackly_Writer:
                 str | None: The name of the sole lender. If there were multiple lenders, return None.
             """
             lender_name_rpt = self.anx.parse_RptValue(self.anx.find_answer("Lender Name TE"))
-            lender_name_rpt = self.remove_none_values(lender_name_rpt)
             # print(lender_name_rpt)
 
             if lender_name_rpt is None:
                 return None
+            lender_name_rpt = [name for name in lender_name_rpt if name is not None]
 
             if len(lender_name_rpt) == 1:
                 return lender_name_rpt[0]
@@ -1428,9 +1464,9 @@ class Knackly_Writer:
             for name, amount in zip_longest(lender_name_rpt, lender_amount_rpt):
                 if self.is_all_args_none([name, amount]):
                     continue
-                temp = {"id$": str(ObjectId()), "Name": name, "Amount": amount}
+                temp = {"id$": self.ids.new(), "Name": name, "Amount": amount}
 
-                result.append(self.remove_none_values(temp))
+                result.append(temp)
 
             if len(result) > 1:
                 # If there was only one lender, then `lender_setup()` will take care of it.
@@ -1458,7 +1494,7 @@ class Knackly_Writer:
                 return finme_email
 
         result = {
-            "id$": str(ObjectId()),
+            "id$": self.ids.new(),
             "isExhibitALenders": self.anx.parse_RptValue(self.anx.find_answer("Exhibit A Lender List TF"))[
                 0
             ],  # We only care about the answer to the first iteration
@@ -1478,7 +1514,7 @@ class Knackly_Writer:
             "noticeEmail": notice_email_setup(),
         }
 
-        return self.remove_none_values(result)
+        return result
 
     def guarantor_information(
         self,
@@ -1502,14 +1538,14 @@ class Knackly_Writer:
                 dict: _description_
             """
             result = {
-                "id$": str(ObjectId()),
+                "id$": self.ids.new(),
                 "GuarantorName": name,
                 "GuarantorEntityType": entity_type,
                 "Type": guaranty_type,
                 "GuarantorAddress": address,
             }
 
-            return self.remove_none_values(result)
+            return result
 
         guarantors = []
 
@@ -1549,11 +1585,11 @@ class Knackly_Writer:
         if not guarantors:
             return None
 
-        return {"id$": str(ObjectId()), "Guarantors": guarantors}
+        return {"id$": self.ids.new(), "Guarantors": guarantors}
 
     def guarantor_information_2(self) -> dict:
         result = {
-            "id$": str(ObjectId()),
+            "id$": self.ids.new(),
             "Guarantors": None,  # This will be replaced with the list of 'guarantor' objects
         }
 
@@ -1636,7 +1672,7 @@ class Knackly_Writer:
                 o1s1_titles,
             ) = guarantor
             temp_guarantor = {
-                "id$": str(ObjectId()),
+                "id$": self.ids.new(),
                 "GuarantorName": name,
                 "GuarantorEntityType": entity_type,
                 "Type": guaranty_type,
@@ -1659,7 +1695,7 @@ class Knackly_Writer:
             elif entity_type == "trust":
                 temp_guarantor["GuarantorName"] = trust_name
                 temp_guarantor["GuarantorVenturersOrTrustees"] = [
-                    {"id$": str(ObjectId()), "Signer1Name": trustee} for trustee in trustees if trustee is not None
+                    {"id$": self.ids.new(), "Signer1Name": trustee} for trustee in trustees if trustee is not None
                 ]
 
             # Other entity types
@@ -1686,7 +1722,7 @@ class Knackly_Writer:
                     name, type_, state, title, s1s2_names, s1s2_roles, s1s2_titles = s1
 
                     knackly_s1 = {
-                        "id$": str(ObjectId()),
+                        "id$": self.ids.new(),
                         "Signer1Name": name,
                         "Signer1Title": title,
                         "Signer1EntityType": type_,
@@ -1709,27 +1745,24 @@ class Knackly_Writer:
 
                         # Build a single element of the Signer1Signers list
                         knackly_s1s2 = {
-                            "id$": str(ObjectId()),
+                            "id$": self.ids.new(),
                             "Signer2Name": name,
                             "Signer2Title": title,
                         }
 
-                        knackly_s1s2 = self.remove_none_values(knackly_s1s2)
-
                         # Add it to the list if it is relevant
-                        if len(knackly_s1s2) == 1 and "id$" in knackly_s1s2:
+                        if self.has_only_keys(knackly_s1s2, "id$"):
                             continue
                         knackly_s1["Signer1Signers"].append(knackly_s1s2)
 
                     # Clean up s1
-                    knackly_s1 = self.remove_none_values(knackly_s1)
                     # # Deal with potentially empty s1s2 and s1o1 lists
                     if len(knackly_s1["Signer1Signers"]) == 0:
                         del knackly_s1["Signer1Signers"]
                     if len(knackly_s1["Signer1Owners"]) == 0:
                         del knackly_s1["Signer1Owners"]
 
-                    if len(knackly_s1) > 1:
+                    if not self.has_only_keys(knackly_s1, "id$"):
                         guarantor_signers.append(knackly_s1)
 
                 # print(guarantor_signers)
@@ -1757,7 +1790,7 @@ class Knackly_Writer:
                     name, type_, state, title, o1s1_names, o1s1_titles = o1
 
                     knackly_o1 = {
-                        "id$": str(ObjectId()),
+                        "id$": self.ids.new(),
                         "Signer1Name": name,
                         "Signer1Title": title,
                         "Signer1EntityType": type_,
@@ -1779,32 +1812,29 @@ class Knackly_Writer:
 
                         # Build a single element of the Signer1Signers list
                         knackly_o1s1 = {
-                            "id$": str(ObjectId()),
+                            "id$": self.ids.new(),
                             "Signer2Name": name,
                             "Signer2Title": title,
                         }
-                        knackly_o1s1 = self.remove_none_values(knackly_o1s1)
 
                         # Add the element to the list if it is relevant
-                        if len(knackly_o1s1) == 1 and "id$" in knackly_o1s1:
+                        if self.has_only_keys(knackly_o1s1, "id$"):
                             continue
                         knackly_o1["Signer1Signers"].append(knackly_o1s1)
 
                     # Clean up o1
-                    knackly_o1 = self.remove_none_values(knackly_o1)
                     # # Deal with potentially empty o1s1 lists
                     if len(knackly_o1["Signer1Signers"]) == 0:
                         del knackly_o1["Signer1Signers"]
 
-                    if len(knackly_o1) > 1:
+                    if not self.has_only_keys(knackly_o1, "id$"):
                         guarantor_owners.append(knackly_o1)
 
                 if guarantor_owners:
                     temp_guarantor["GuarantorOwners"] = guarantor_owners
 
             # Clean up each temporary guarantor before committing to adding it
-            temp_guarantor = self.remove_none_values(temp_guarantor)
-            if len(temp_guarantor) == 1 and "id$" in temp_guarantor:
+            if self.has_only_keys(temp_guarantor, "id$"):
                 continue
             guarantors.append(temp_guarantor)
             # self.uuid_map["Guarantors"].update({"SOMETHING GOES HERE": temp_guarantor["id$"]}) # This isn't ready... guarantor key isn't used anywhere
@@ -1813,8 +1843,7 @@ class Knackly_Writer:
         if guarantors:
             result["Guarantors"] = guarantors
 
-        result = self.remove_none_values(result)
-        if len(result) == 1 and "id$" in result:
+        if self.has_only_keys(result, "id$"):
             return None
         return result
 
@@ -1838,12 +1867,12 @@ class Knackly_Writer:
         name, street, city, state, zip_code = parsed_components
 
         result = {
-            "id$": str(ObjectId()),
+            "id$": self.ids.new(),
             "name": name,
             "contact": self.address(street, city, state, zip_code),
         }
 
-        return self.remove_none_values(result)
+        return result
 
     def broker(self) -> dict:
         """Responsible for creating the top level `broker` object.
@@ -1866,13 +1895,13 @@ class Knackly_Writer:
         name, license_number, street, city, state, zip_code = parsed_components
 
         result = {
-            "id$": str(ObjectId()),
+            "id$": self.ids.new(),
             "name": name,
             "licenseNumber": license_number,
             "address": self.address(street, city, state, zip_code),
         }
 
-        return self.remove_none_values(result)
+        return result
 
     def title_policy(self) -> dict:
         """Responsible for creating the top level `titlePolicy` object.
@@ -1894,14 +1923,14 @@ class Knackly_Writer:
                 dict: A dictionary representating the above attributes.
             """
             result = {
-                "id$": str(ObjectId()),
+                "id$": self.ids.new(),
                 "companyName": company_name,
                 "officerContactName": contact_name,
                 "address": address,
                 "officerContactEmail": contact_email,
             }
 
-            return self.remove_none_values(result)
+            return result
 
         parsed_components = self.anx.parse_multiple(
             "Title Company Name TE",
@@ -1948,7 +1977,7 @@ class Knackly_Writer:
         ) = parsed_components
 
         result = {
-            "id$": str(ObjectId()),
+            "id$": self.ids.new(),
             "titleCompany": company,
             "orderNumber": order_number,
             "effectiveDate": effective_date,
@@ -1959,7 +1988,7 @@ class Knackly_Writer:
             "version": version,
         }
 
-        return self.remove_none_values(result)
+        return result
 
     def create_escrow_company(self) -> dict:
         """Responsible for creating the top level `escrowCompany` object.
@@ -1993,7 +2022,7 @@ class Knackly_Writer:
         ) = parsed_components
 
         result = {
-            "id$": str(ObjectId()),
+            "id$": self.ids.new(),
             "companyName": c_name,
             "officerContactName": o_name,
             "address": self.address(street, city, state, zip_code),
@@ -2001,7 +2030,7 @@ class Knackly_Writer:
             "isKassSchuler": is_kass,
         }
 
-        return self.remove_none_values(result)
+        return result
 
     def settlement(self) -> dict:
         """Responsible for creating the top level `settlementFees` object.
@@ -2052,14 +2081,14 @@ class Knackly_Writer:
                     comment = "Deliver to Loan Servicer"
 
                 temp = {
-                    "id$": str(ObjectId()),
+                    "id$": self.ids.new(),
                     "amount": amount,
                     "description": description,
                     "comment": comment,
                     "paidTo": paid_to,
                 }
 
-                result.append(self.remove_none_values(temp))
+                result.append(temp)
 
             return result
 
@@ -2072,16 +2101,7 @@ class Knackly_Writer:
             Returns:
                 list[dict]: A list of dictionaries, where each dictionary contains at most the amount, description, comment, and paid to.
             """
-            fee_components = [
-                f"{fee_type} Fee NU",
-                f"{fee_type} Fee Description TE",
-                f"{fee_type} Delivery Fee Comment MC",
-            ]
-
-            if fee_type == "Other":
-                fee_components.append(f"{fee_type} Paid To Fee TE")
-
-            fee_components = self.anx.parse_multiple(*fee_components)
+            fee_components = self.anx.parse_multiple(*fee_answer_names(fee_type))
             fee_components = [x if x is not None else [None] for x in fee_components]
             if self.is_all_args_none(fee_components):
                 return None
@@ -2091,8 +2111,8 @@ class Knackly_Writer:
                 return fees
 
         # Broker, Lender, and Other fees
-        result = {"id$": str(ObjectId())}
-        for fee_type in ["Broker", "Lender", "Other"]:
+        result = {"id$": self.ids.new()}
+        for fee_type in FEE_TYPES:
             result[fee_type.lower() + "Fees"] = process_fee_components(fee_type)
 
         # Geraci fees
@@ -2115,7 +2135,7 @@ class Knackly_Writer:
         if len(result) == 1 and "id$" in result:
             return None
         else:
-            return self.remove_none_values(result)
+            return result
 
     def docs_add(self) -> dict:
         """Responsible for creating the top level `docs_add` object.
@@ -2145,7 +2165,7 @@ class Knackly_Writer:
             when_sold, assignee, date, street, city_state_zip, name = parsed_components
 
             result = {
-                "id$": str(ObjectId()),
+                "id$": self.ids.new(),
                 "whenSold": when_sold,
                 "Assignee": assignee,
                 "collateralAssigneeDate": date,
@@ -2156,9 +2176,7 @@ class Knackly_Writer:
                 city, state, zip_code = city_state_zip.split(", ")
                 result["assigneeAddress"] = self.address(street, city, state, zip_code)
 
-            result = self.remove_none_values(result)
-
-            if len(result) == 1 and "id$" in result:
+            if self.has_only_keys(result, "id$"):
                 return None
 
             return result
@@ -2189,8 +2207,8 @@ class Knackly_Writer:
                 if self.is_all_args_none([property_, manager, date, street, city, state, zip_code]):
                     continue  # Skip this iteration if everything is None
                 temp = {
-                    "id$": str(ObjectId()),
-                    "property": self.uuid_map["Properties"][property_],
+                    "id$": self.ids.new(),
+                    "property": self.referenced_ids("Properties")[property_],
                     "propertyManager": manager,
                     "agreementDate": date,
                     "address": self.address(street, city, state, zip_code),
@@ -2234,9 +2252,9 @@ class Knackly_Writer:
                 ) = subordination_info
 
                 temp = {
-                    "id$": str(ObjectId()),
+                    "id$": self.ids.new(),
                     "documentType": doc_types,
-                    "property": self.uuid_map["Properties"].get(property_),
+                    "property": self.referenced_ids("Properties").get(property_),
                     "postClosing": post_closing,
                     "documentName": doc_name,
                     "documentDate": doc_date,
@@ -2248,11 +2266,9 @@ class Knackly_Writer:
                 #     temp["documentType"] = temp["documentType"][0]
                 # Knackly only supports a single selection for documentType, so if there were multiple selected in HotDocs, just pick the first one
 
-                temp = self.remove_none_values(temp)
-
-                if len(temp) == 2 and "id$" in temp and "tenantNames" in temp and len(temp["tenantNames"]) == 0:
+                if self.has_only_keys(temp, "id$", "tenantNames") and all(name is None for name in temp["tenantNames"]):
                     continue  # Skip this iteration if its really empty
-                elif len(temp) == 3 and "id$" in temp and "property" in temp and "tenantNames" in temp and temp["tenantNames"] == []:
+                elif self.has_only_keys(temp, "id$", "property", "tenantNames") and isinstance(temp["tenantNames"], list) and self.is_all_args_none(temp["tenantNames"]):
                     continue  # Skip this iteration for weird edge case
 
                 result.append(temp)
@@ -2283,11 +2299,11 @@ class Knackly_Writer:
                     if self.is_all_args_none([name, amount]):
                         continue  # Skip if this iteration is all None
                     temp = {
-                        "id$": str(ObjectId()),
+                        "id$": self.ids.new(),
                         "name": name,
                         "investedAmount": amount,
                     }
-                    result.append(self.remove_none_values(temp))
+                    result.append(temp)
 
                 if len(result) == 0:
                     return None
@@ -2345,11 +2361,11 @@ class Knackly_Writer:
                 # print(f"{sub_lenders=}, {type(sub_lenders)=}")
                 # print(f"{invested_amounts=}, {type(invested_amounts)=}")
                 temp = {
-                    "id$": str(ObjectId()),
+                    "id$": self.ids.new(),
                     "repOptions": rep,
                     "documentType": doc_type,
                     "documentRecording": doc_recording,
-                    "property": self.uuid_map["Properties"].get(property_),
+                    "property": self.referenced_ids("Properties").get(property_),
                     "debtAmount": amount,
                     "recordingDate": recording_date,
                     "signingDate": signing_date,
@@ -2361,7 +2377,7 @@ class Knackly_Writer:
                     "subordinateInterestRate": interest_rate,
                 }
 
-                result.append(self.remove_none_values(temp))
+                result.append(temp)
 
             if len(result) == 0:
                 return None
@@ -2389,7 +2405,7 @@ class Knackly_Writer:
                     continue
 
                 temp_aka = {
-                    "id$": str(ObjectId()),
+                    "id$": self.ids.new(),
                     "SelectIndividual": party_name,
                     "AKAList": [name for name in alternate_names if name is not None],
                 }
@@ -2399,32 +2415,9 @@ class Knackly_Writer:
 
             return result
 
-        result = {
-            "id$": str(ObjectId()),
-            "isAssignmentOfPropertyManagement": self.anx.parse_field("Assignment of Property Management TF"),
-            "assignment_Spreadsheet_list": assignment_spreadsheet(),
-            "isW9": self.anx.parse_field("W9 TF"),
-            "isFirstPaymentLetter": self.anx.parse_field("First Payment Letter TF"),
-            "firstPaymentAmount": self.anx.parse_field("First Payment Letter Payment AMT NU"),
-            "isFirstPaymentLetterUseAmount": self.anx.parse_field("First Payment Letter Use Amount TF"),
-            "isFirstPaymentIncludeEscrow": self.anx.parse_field("Fay Escrow Reserves TF"),
-            "isForSale": self.anx.parse_field("seth_isForSale"),
-            "loanSaleInformation": loan_sale_information(),
-            "isCollateralAssignment": self.anx.parse_field("Collateral Assignment TF"),
-            "isSubordinations": self.anx.parse_field("seth_isSubordinations"),
-            "isIntercreditor": self.anx.parse_field("seth_isIntercreditor"),
-            "isLoanAdministrationAgreement": self.anx.parse_field("Loan Administration Agreement TF"),
-            "impledServicingSpreadPercent": self.anx.parse_field("Implied Servicing Spread Percent NU"),
-            "investorRatePercent": self.anx.parse_field("Investor Rate Percent NU"),
-            "isPrincipalRepaymentAgreement": self.anx.parse_field("Principal Repayment Agreement TF"),
-            "isPrincipalRepaymentProportional": self.anx.parse_field("Principal Repayment Proportional TF"),
-            "principalRepaymentPercent": self.anx.parse_NumValue(self.anx.find_answer("Principal Repayment Percent NU")),
-            "isThirdPartyAffiliate": self.anx.parse_field("Renovo Third Party TF"),
-            "renovoThirdPartyName": self.anx.parse_field("Renovo Third Party Name TX"),
-            "housemaxCreditCardAuthorization": self.anx.parse_field("Housemax Credit Card Authorization TF"),
-            "akasRequired": self.anx.parse_field("Borrower AKA Required TF"),
-            "isBorrowerCertification": self.anx.parse_field("Borrower Certification TF"),
-        }
+        result = {"id$": self.ids.new(), **self.mapped_section("docsAdd")}
+        result["assignment_Spreadsheet_list"] = assignment_spreadsheet()
+        result["loanSaleInformation"] = loan_sale_information()
 
         if result["isSubordinations"]:
             result["subordinations_list"] = subordinations()
@@ -2433,9 +2426,7 @@ class Knackly_Writer:
         if result["akasRequired"]:
             result["akaList"] = aka_statements()
 
-        result = self.remove_none_values(result)
-
-        if len(result) == 1 and "id$" in result:
+        if self.has_only_keys(result, "id$"):
             return None
 
         return result
@@ -2446,176 +2437,352 @@ class Knackly_Writer:
         Returns:
             dict: A dictionary containing information about the document customizations.
         """
-        result = {
-            "id$": str(ObjectId()),
-            "isRemoveArbitrationProvisions": self.anx.parse_field("Remove Arbitration TF"),
-            "isRemoveLanguageCapacity": self.anx.parse_field("Remove Language Capacity TF"),
-            "isRemoveInitialLines": self.anx.parse_field("No Footer Initials TF"),
-            "isRemoveAllEntityCerts": self.anx.parse_field("No Entity Certificates TF"),
-            "isIncludeEntityDocs": self.anx.parse_field("Include Entity Documents TF"),
-            "isRemoveTitleInsurance": self.anx.parse_field("No Title Policy TF"),
-            "isCoverpage": self.anx.parse_field("Signing Instructions TF"),
-            "isMasterGuaranty": self.anx.parse_field("Master Guaranty TF"),
-            "masterGuarantyDate": self.anx.parse_field("Master Guaranty DT"),
-            "masterGuarantyName": self.anx.parse_field("Master Guaranty Name TX"),
-            "isNoFillNonOwner": self.anx.parse_field("No Fill Non Owner TF"),
-            "isNoFillBusinessPurpose": self.anx.parse_field("No Fill Business Purpose TF"),
-        }
-
-        result = self.remove_none_values(result)
+        result = {"id$": self.ids.new(), **self.mapped_section("docsCustomize")}
 
-        if len(result) == 1 and "id$" in result:
+        if self.has_only_keys(result, "id$"):
             return None
 
         return result
 
-    def create(self) -> None:
-        """Actually fill out `self.json` with all of the relevant information."""
-        client_name = self.anx.parse_field("Client Specific Pass Store TX")
-        if client_name:
-            # Convert the client password to use the dropdown if it's trans, otherwise the text field.
-            client_name = client_name.lower()
-            if client_name == "trans":
-                client_mc = self.anx.parse_field("Client MC")
-                if client_mc:
-                    self.json["clientMC"] = client_mc.lower()
-                    if client_mc.lower() == "housemax":
-                        self.json["clientMC"] = "HouseMax"
-            else:
-                self.json["clientName"] = client_name
-                if client_name.lower() == "housemax":
-                    self.json["clientName"] = "HouseMax"
-
-        if client_name.lower() == "housemax" or client_mc.lower() == "housemax":
-            self.json["Permissions"] = {
-                "id$": str(ObjectId()),
-                "IsPropertyTax": True,
-                "IsPropertyInsurance": True,
-                "isNo_fillCertification": True,
-                "isNo_fillBusinessPurpose": True,
-                "isLineOfCredit": True,
-                "isLegalDescription": True,
-                "isUCC": True,
-                "isInterestCalcType": True,
-                "isComplexEntityIntake": True,
-            }
+    def create(self, output: Object_Stream = None) -> None:
+        """Actually fill out `self.json` with all of the relevant information.
+
+        Each part of the document is built inside `self.section()`, which is what `profile_report()` reports on. With `self.revision`,
+        the parts that are unchanged since the previous revision are copied from its output instead of being built.
+
+        Args:
+            output (Object_Stream, optional): Stream the document to `output` instead of keeping it. Each top level key is cleaned up and
+                written as soon as its section has finished, then removed from `self.json`, which is left empty. The caller closes
+                `output` afterwards. Defaults to None.
+        """
+        self.output = output
+        if self.revision is not None:
+            self.revision.start(self)
+        with self.section("client", "clientMC", "clientName", "Permissions", "productMC_Wrap") as build:
+            if build:
+                client_name = self.client_name()
+                if client_name:
+                    # Convert the client password to use the dropdown if it's trans, otherwise the text field.
+                    client_name = client_name.lower()
+                    if client_name == "trans":
+                        client_mc = self.client_mc()
+                        if client_mc:
+                            self.json["clientMC"] = client_mc.lower()
+                            if client_mc.lower() == "housemax":
+                                self.json["clientMC"] = "HouseMax"
+                    else:
+                        self.json["clientName"] = client_name
+                        if client_name.lower() == "housemax":
+                            self.json["clientName"] = "HouseMax"
+
+                if client_name.lower() == "housemax" or client_mc.lower() == "housemax":
+                    self.json["Permissions"] = {
+                        "id$": self.ids.new(),
+                        "IsPropertyTax": True,
+                        "IsPropertyInsurance": True,
+                        "isNo_fillCertification": True,
+                        "isNo_fillBusinessPurpose": True,
+                        "isLineOfCredit": True,
+                        "isLegalDescription": True,
+                        "isUCC": True,
+                        "isInterestCalcType": True,
+                        "isComplexEntityIntake": True,
+                    }
 
-        # Product dropdown
-        client_mc = self.anx.parse_field("Client MC")
-        if client_mc:
-            self.json["productMC_Wrap"] = self.product_mc(client_mc)
-        elif client_name:
-            self.json["productMC_Wrap"] = self.product_mc(client_name)
-
-        borrowers = self.borrower_information()
-        self.json["Borrower"] = borrowers[0]
-        self.json["TitleHolder2"] = borrowers[1]
-        # self.json["Borrower"] = self.borrower_information_page()
-        # self.json["TitleHolder2"] = self.non_borrower_property_owners()
-        self.json["propertyInformation"] = self.property_information_page()
-        self.json["isEquityPledgeAgreement"] = self.anx.parse_TFValue(self.anx.find_answer("Membership Pledge TF"))
-        if self.json.get("isEquityPledgeAgreement"):
-            self.json["equityPledgeAgreementsIntake"] = self.equity_pledge_agreements()
-        self.json["isCollateralSecurityAgreement"] = self.anx.parse_TFValue(self.anx.find_answer("Collateral Security Agreement TF"))
-        if self.json.get("isCollateralSecurityAgreement"):
-            self.json["collateralSecurityAgreementsIntake"] = self.collateral_security_agreements()
-        # self.json["loanTerms"] = self.standard_loan_terms()
-        self.json.update({"loanTerms": self.standard_loan_terms()})
-        self.json.update({"features": self.special_loan_features()})
-        self.json.update({"lenderInformation": self.lender_information()})
+                # Product dropdown
+                client_mc = self.client_mc()
+                if client_mc:
+                    self.json["productMC_Wrap"] = self.product_mc(client_mc)
+                elif client_name:
+                    self.json["productMC_Wrap"] = self.product_mc(client_name)
+
+        with self.section("borrower_information", "Borrower", "TitleHolder2") as build:
+            if build:
+                borrowers = self.borrower_information()
+                self.json["Borrower"] = borrowers[0]
+                self.json["TitleHolder2"] = borrowers[1]
+                # self.json["Borrower"] = self.borrower_information_page()
+                # self.json["TitleHolder2"] = self.non_borrower_property_owners()
+        with self.section("property_information_page", "propertyInformation") as build:
+            if build:
+                self.json["propertyInformation"] = self.property_information_page()
+        with self.section("equity_pledge_agreements", "isEquityPledgeAgreement", "equityPledgeAgreementsIntake") as build:
+            if build:
+                self.json["isEquityPledgeAgreement"] = self.anx.parse_TFValue(self.anx.find_answer("Membership Pledge TF"))
+                if self.json.get("isEquityPledgeAgreement"):
+                    self.json["equityPledgeAgreementsIntake"] = self.equity_pledge_agreements()
+        with self.section("collateral_security_agreements", "isCollateralSecurityAgreement", "collateralSecurityAgreementsIntake") as build:
+            if build:
+                is_collateral_security_agreement = self.anx.parse_TFValue(self.anx.find_answer("Collateral Security Agreement TF"))
+                self.json["isCollateralSecurityAgreement"] = is_collateral_security_agreement
+                if self.json.get("isCollateralSecurityAgreement"):
+                    self.json["collateralSecurityAgreementsIntake"] = self.collateral_security_agreements()
+        with self.section("standard_loan_terms", "loanTerms") as build:
+            if build:
+                # self.json["loanTerms"] = self.standard_loan_terms()
+                self.json.update({"loanTerms": self.standard_loan_terms()})
+        with self.section("special_loan_features", "features") as build:
+            if build:
+                self.json.update({"features": self.special_loan_features()})
+        with self.section("lender_information", "lenderInformation") as build:
+            if build:
+                self.json.update({"lenderInformation": self.lender_information()})
         # Guaranty stuff below
-        self.json.update({"IsGuaranty": self.anx.parse_TFValue(self.anx.find_answer("Guarantor TF"))})
-        self.json.update({"Guarantor": self.guarantor_information_2()})
+        with self.section("guarantor_information", "IsGuaranty", "Guarantor") as build:
+            if build:
+                self.json.update({"IsGuaranty": self.anx.parse_TFValue(self.anx.find_answer("Guarantor TF"))})
+                self.json.update({"Guarantor": self.guarantor_information_2()})
         # Servicer stuff below
-        self.json.update({"isACH": self.anx.parse_field("ACH Delivery of Payments TF")})
-        self.json.update({"isACHRemove": self.anx.parse_field("Remove ACH TF")})
-        self.json.update({"SelectServicer": self.anx.parse_field("Loan Servicer MC")})
-        if self.json.get("SelectServicer") == "Other":
-            self.json.update({"servicer": self.servicer()})
-        self.json.update({"fciDisbursementAgreement": self.anx.parse_field("FCI Disbursement Agreement TF")})
+        with self.section("servicer", "isACH", "isACHRemove", "SelectServicer", "servicer", "fciDisbursementAgreement") as build:
+            if build:
+                self.json.update({"isACH": self.anx.parse_field("ACH Delivery of Payments TF")})
+                self.json.update({"isACHRemove": self.anx.parse_field("Remove ACH TF")})
+                self.json.update({"SelectServicer": self.anx.parse_field("Loan Servicer MC")})
+                if self.json.get("SelectServicer") == "Other":
+                    self.json.update({"servicer": self.servicer()})
+                self.json.update({"fciDisbursementAgreement": self.anx.parse_field("FCI Disbursement Agreement TF")})
         # Broker stuff below
-        self.json.update({"isBroker": self.anx.parse_field("CA Broker TF")})
-        self.json.update({"broker": self.broker()})
+        with self.section("broker", "isBroker", "broker") as build:
+            if build:
+                self.json.update({"isBroker": self.anx.parse_field("CA Broker TF")})
+                self.json.update({"broker": self.broker()})
         # Title Policy stuff below
-        self.json.update({"titlePolicy": self.title_policy()})
+        with self.section("title_policy", "titlePolicy") as build:
+            if build:
+                self.json.update({"titlePolicy": self.title_policy()})
         # Escrow / Settlement stuff below
-        escrow_title_select = self.anx.parse_field("Escrow and Title Select MC")
-        is_escrow = True if escrow_title_select == "Escrow and Title" else False
-        self.json.update({"isEscrow": is_escrow})
-        if self.json.get("isEscrow") is True:
-            self.json.update({"escrowCompany": self.create_escrow_company()})
-        self.json.update({"settlementFees": self.settlement()})
+        with self.section("escrow", "isEscrow", "escrowCompany") as build:
+            if build:
+                escrow_title_select = self.anx.parse_field("Escrow and Title Select MC")
+                is_escrow = True if escrow_title_select == "Escrow and Title" else False
+                self.json.update({"isEscrow": is_escrow})
+                if self.json.get("isEscrow") is True:
+                    self.json.update({"escrowCompany": self.create_escrow_company()})
+        with self.section("settlement", "settlementFees") as build:
+            if build:
+                self.json.update({"settlementFees": self.settlement()})
         # Preparer stuff below
-        self.json.update(
-            {
-                "preparerName": self.anx.parse_field("Loan Prepared By TE"),
-                "preparerEmail": self.anx.parse_field("Loan Prepared By Email TE"),
-                "PreparerAddress": self.anx.parse_field("Preparer Address MC"),
-            }
-        )
-        if self.json.get("PreparerAddress") == "Other":
-            preparer_address_components = self.anx.parse_multiple(
-                "Loan Prepared By Street Address TE",
-                "Loan Prepared By City TE",
-                "Loan Prepared By State MC",
-                "Loan Prepared By Zip Code TE",
-            )
-            self.json.update({"Preparer": self.address(*preparer_address_components)})
+        with self.section("preparer", "preparerName", "preparerEmail", "PreparerAddress", "Preparer") as build:
+            if build:
+                self.json.update(
+                    {
+                        "preparerName": self.anx.parse_field("Loan Prepared By TE"),
+                        "preparerEmail": self.anx.parse_field("Loan Prepared By Email TE"),
+                        "PreparerAddress": self.anx.parse_field("Preparer Address MC"),
+                    }
+                )
+                if self.json.get("PreparerAddress") == "Other":
+                    preparer_address_components = self.anx.parse_multiple(
+                        "Loan Prepared By Street Address TE",
+                        "Loan Prepared By City TE",
+                        "Loan Prepared By State MC",
+                        "Loan Prepared By Zip Code TE",
+                    )
+                    self.json.update({"Preparer": self.address(*preparer_address_components)})
         # Closing Contact stuff below
-        self.json["closingName"] = self.anx.parse_field("Closing Contact Name TE")
-        self.json["closingEmail"] = self.anx.parse_field("Closing Contact Email Address TX")
+        with self.section("closing_contact", "closingName", "closingEmail") as build:
+            if build:
+                self.json["closingName"] = self.anx.parse_field("Closing Contact Name TE")
+                self.json["closingEmail"] = self.anx.parse_field("Closing Contact Email Address TX")
         # Docs Add / Customize
-        self.json["docsAdd"] = self.docs_add()
-        self.json["docsCustomize"] = self.docs_customize()
+        with self.section("docs_add", "docsAdd") as build:
+            if build:
+                self.json["docsAdd"] = self.docs_add()
+        with self.section("docs_customize", "docsCustomize") as build:
+            if build:
+                self.json["docsCustomize"] = self.docs_customize()
 
         # Documents to Produce
-        self.json["LoanDocuments"] = self.anx.parse_field("Loan Documents MC")
-        if not isinstance(self.json["LoanDocuments"], list):
-            self.json["LoanDocuments"] = [self.json["LoanDocuments"]]
+        with self.section("loan_documents", "LoanDocuments") as build:
+            if build:
+                self.json["LoanDocuments"] = self.anx.parse_field("Loan Documents MC")
+                if not isinstance(self.json["LoanDocuments"], list):
+                    self.json["LoanDocuments"] = [self.json["LoanDocuments"]]
 
         # Optional clean up
-        self.clean_up()
+        with self.section("clean_up"):
+            self.clean_up()
+
+    @contextmanager
+    def section(self, name: str, *keys: str):
+        """Wrap one named part of `create()`. Answers used inside it are attributed to it in `self.anx.coverage`. When profiling, also
+        records how long it took, how many answers it looked up, how many facts it reused and how many ids it asked for.
+
+        Yields whether the part has to be built. It doesn't if `self.revision` copied it from the previous revision's output instead,
+        so the body of every section is `if build:`.
+
+        Args:
+            name (str): The name of the section, usually the method that builds it.
+            *keys (str): The top level keys of `self.json` that the section fills in. Used to measure its share of the output, and to
+                copy it from the previous revision.
+        """
+        coverage = self.anx.coverage
+        previous_section = coverage.section
+        coverage.section = name
+        lookups = self.anx.answer_lookups
+        facts_reused = self.fact_lookups_avoided
+        ids_requested = self.ids.requested
+        ids_allocated = self.ids.allocated
+        start = time.perf_counter()
+        build = True
+        try:
+            build = self.revision is None or not self.revision.begin(self, name, keys)
+            yield build
+            if build and self.revision is not None:
+                self.revision.end(self, name, keys)
+            self.flush_output()
+        finally:
+            coverage.section = previous_section
+            if self.profile is not None:
+                entry = {
+                    "section": name,
+                    "keys": keys,
+                    "wall_ms": round((time.perf_counter() - start) * 1000, 3),
+                    "answer_lookups": self.anx.answer_lookups - lookups,
+                    "fact_lookups_avoided": self.fact_lookups_avoided - facts_reused,
+                    "ids_requested": self.ids.requested - ids_requested,
+                    "ids_allocated": self.ids.allocated - ids_allocated,
+                }
+                if self.revision is not None:
+                    entry["reused"] = not build
+                self.profile.append(entry)
+
+    def clean_keys(self, keys: tuple[str, ...]) -> None:
+        """Clean up some of the top level keys of `self.json` ahead of `clean_up()`, which leaves them as they are."""
+        for key in keys:
+            if key in self.json:
+                cleaned = self._recursive_clean({key: self.json[key]}, self.ids.root_path())
+                if key in cleaned:
+                    self.json[key] = cleaned[key]
+                else:
+                    del self.json[key]
+
+    def flush_output(self) -> None:
+        """When streaming (see `create()`), clean up every top level key that is in `self.json` so far and write it to `self.output`.
+
+        Sections never go back to a key that an earlier section filled in, so every key is finished by the time its section ends. The
+        document's own "id$" is written just before the first key that survives clean up, and not at all if none do, the same as
+        `clean_up()` would leave it.
+        """
+        if self.output is None:
+            return
+
+        for key in [key for key in self.json if key != "id$"]:
+            cleaned = self._recursive_clean({key: self.json.pop(key)}, self.ids.root_path())
+            if key not in cleaned:
+                continue
+            if self.output.members == 0:
+                self.output.write("id$", self.ids.resolve(self.json["id$"], self.ids.root_path()))
+            self.output.write(key, cleaned[key])
+            if self.profile is not None:
+                self.written[key] = cleaned[key]
+
+    def profile_report(self) -> dict:
+        """Summarize the profile recorded during `create()`. Only available if the writer was created with `profile=True`.
+
+        Returns:
+            dict: One entry per section, in the order they ran, with:
+                - `wall_ms`: time spent in the section
+                - `answer_lookups`: answers read, through `find_answer()` or the extraction plan
+                - `answers_used`: distinct answers the section read (an answer read by several sections counts towards each of them)
+                - `fact_lookups_avoided`: per-file facts (see `remember()`) the section reused instead of looking them up again
+                - `ids_requested`: "id$" placeholders handed out (ids are only generated for the ones that survive clean up, so these
+                  all show up under `clean_up` as `ids_allocated`)
+                - `ids_in_output`: "id$" values in the section's part of the finished document
+                - `output_bytes`: size of the section's part of the finished document, as indented JSON
+                - `reused`: with `self.revision`, whether the section was copied from the previous revision's output
+            plus the totals of each of those, and the gated sub-builders that were skipped (see `is_gate_open()`).
+        """
+        if self.profile is None:
+            raise ValueError("This Knackly_Writer wasn't created with profile=True")
+
+        answers_used = self.anx.coverage.by_section()
+        document = self.json if self.output is None else self.written
+        sections = []
+        for entry in self.profile:
+            output = {key: document[key] for key in entry["keys"] if key in document}
+            section = {key: value for key, value in entry.items() if key != "keys"}
+            section["answers_used"] = len(answers_used.get(entry["section"], ()))
+            section["ids_in_output"] = count_ids(output)
+            section["output_bytes"] = len(json.dumps(output, indent=2).encode()) if output else 0
+            sections.append(section)
+
+        totals = {
+            key: sum(section[key] for section in sections)
+            for key in ("wall_ms", "answer_lookups", "fact_lookups_avoided", "ids_requested", "ids_allocated", "ids_in_output", "output_bytes")
+        }
+        totals["wall_ms"] = round(totals["wall_ms"], 3)
+        return {"sections": sections, "totals": totals, "skipped_builders": self.skipped_builders}
 
     def clean_up(self) -> None:
-        """Clean up the self.json dictionary associated with the class instance by deleting any keys with a value of False or None"""
-        self.json = self._recursive_clean(self.json)
+        """Clean up the self.json dictionary associated with the class instance by deleting any keys with a value of False or None.
+
+        This is the only clean up pass over the document: the builders leave `None` values in place, and the ids of whatever survives
+        are generated during the same walk. With `self.revision`, every section has been cleaned as soon as it finished (see
+        `incremental.Revision_Tracker.end()`), so only the document itself is left.
+        """
+        if self.revision is not None:
+            if len(self.json) == 1 and "id$" in self.json:
+                self.json = {}
+            else:
+                self.json["id$"] = self.ids.resolve(self.json["id$"], self.ids.root_path())
+            return
+
+        self.json = self._recursive_clean(self.json, self.ids.root_path())
 
         if self.json is None:
             self.json = {}
 
-    def _recursive_clean(self, data: dict) -> dict | None:
+    def _recursive_clean(self, data: dict, path: str = None) -> dict | None:
         """Recursively delete keys in a dictionary that contain values of `False` or `None`. If the dictionary ends up with just one key, "id$", remove that key as well.
 
+        Children are cleaned before their parent, and every `Lazy_Id` left in the tree afterwards is replaced by a real id.
+
         Args:
             data (dict): A dictionary, optionally containing sub-dictionaries and lists.
+            path (str, optional): Where `data` ends up in the document, which deterministic ids are derived from (see
+                `Id_Allocator.root_path()`). Defaults to None, for random ids.
 
         Returns:
             dict | None: The cleaned up dictionary, or `None` if the entire dictionary is empty.
         """
         if isinstance(data, dict):
             # Process each key-value pair in the dictionary
-            for key in list(data.keys()):
-                if data[key] is False or data[key] is None:
+            for key, value in list(data.items()):
+                if value is False or value is None:
                     del data[key]
-                elif isinstance(data[key], (dict, list)):
-                    result = self._recursive_clean(data[key])
+                elif isinstance(value, (dict, list)):
+                    result = self._recursive_clean(value, None if path is None else child_path(path, key))
                     if result is None:
                         del data[key]
                     else:
                         data[key] = result
+                elif isinstance(value, Lazy_Id) and key != "id$":
+                    # A reference to another object's id (see `self.uuid_map`)
+                    data[key] = self.ids.resolve(value, None if path is None else child_path(path, key))
 
             # If the dictionary has only one key 'id$', remove the whole dictionary
             if len(data) == 1 and "id$" in data:
                 return None
+            # The dictionary is staying, so it needs a real id
+            if isinstance(data.get("id$"), Lazy_Id):
+                data["id$"] = self.ids.resolve(data["id$"], path)
             return data
 
         elif isinstance(data, list):
             # Process each item in the list
-            result = [self._recursive_clean(item) for item in data if item not in [False, None]]
+            items = [item for item in data if item not in [False, None]]
+            if path is None:
+                result = [self._recursive_clean(item) for item in items]
+            else:
+                result = [self._recursive_clean(item, child_path(path, i)) for i, item in enumerate(items)]
             if self.is_all_args_none(result):
                 return None
             return result
 
+        elif isinstance(data, Lazy_Id):
+            return self.ids.resolve(data, path)
+
         else:
             # Return the item if it's not a dictionary or list
             return data
@@ -2665,5 +2832,24 @@ class Knackly_Writer:
             raise ValueError(f"error, expecting either None or a list, received {type(element).__name__}: {element}")
 
 
+@cache
+def consumed_answer_names() -> frozenset[str]:
+    """Get the name of every .anx answer that `Knackly_Writer` can read.
+
+    These are the names written out in the source of this module (`field_mapping.WRITER_ANSWER_NAMES`), the settlement fee answers
+    built by `fee_answer_names()`, and the answers in `field_mapping`'s extraction plan. This is what `ANX_Parser`'s streaming mode
+    should be given.
+
+    Returns:
+        frozenset[str]: The answer names.
+    """
+    names = set(WRITER_ANSWER_NAMES)
+    for fee_type in FEE_TYPES:
+        names.update(fee_answer_names(fee_type))
+    names.update(EXTRACTION_PLAN.answer_names())
+
+    return frozenset(names)
+
+
 if __name__ == "__main__":
     pass
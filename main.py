@@ -1,10 +1,50 @@
+from __future__ import annotations
+
 import argparse
+import glob
 import json
 import os
-from pprint import pprint
+import sys
+import time
+from typing import TYPE_CHECKING, NamedTuple
+
+from answer_coverage import Batch_Coverage, Exclusions
+from json_output import ENCODERS, Object_Stream, Output_Format, write_json
+
+# The converter itself (and the process pool of batch mode) is only imported by the functions that use it, once the arguments have
+# been validated, so that --help and argument errors don't pay for it. See benchmarks/bench_startup.py.
+if TYPE_CHECKING:
+    from conversion_cache import Conversion_Cache
+    from incremental import Revision_Tracker
+    from knackly_writer import Knackly_Writer
+
+DEFAULT_CACHE_MB = 256  # The default of --cache-size, the same as `conversion_cache.DEFAULT_MAX_BYTES`
+
+
+def readable_file(value: str) -> str:
+    """Check the -i/--input path as argparse reads it, the way `argparse.FileType` would, without opening it as text.
+
+    The file is only opened by `ANX_Parser`, in binary, so that the XML declaration decides how it is decoded.
+    """
+    if value != "-":
+        try:
+            open(value, "rb").close()
+        except OSError as e:
+            raise argparse.ArgumentTypeError(f"can't open '{value}': {e}")
+    return value
 
-from anx_parser import ANX_Parser
-from knackly_writer import Knackly_Writer
+
+def writable_file(value: str) -> str:
+    """Check the -o/--output path as argparse reads it, without opening it the way `argparse.FileType("w")` would.
+
+    The output is only written once the conversion has finished, under a temporary name that is then renamed over it (see
+    `write_output()`), so that a failed conversion leaves an existing output file as it was.
+    """
+    if value != "-":
+        folder = os.path.dirname(os.path.abspath(value))
+        if os.path.isdir(value) or not os.access(folder, os.W_OK):
+            raise argparse.ArgumentTypeError(f"can't open '{value}': not a writable file path")
+    return value
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -16,22 +56,39 @@ def parse_arguments() -> argparse.Namespace:
         parser.add_argument(
             "-i",
             "--input",
-            required=True,
-            type=argparse.FileType("r", encoding="UTF-8"),
-            help="input file path",
+            type=readable_file,
+            help="input file path, or - to read from stdin",
         )
         parser.add_argument(
             "-o",
             "--output",
-            required=True,
-            type=argparse.FileType("w"),
-            help="output file path",
+            type=writable_file,
+            help="output file path, or - to write to stdout",
+        )
+        parser.add_argument(
+            "-b",
+            "--batch",
+            nargs="+",
+            help="convert many files at once instead of a single -i/-o pair. Each value is either a directory (every .anx file in it is "
+            "converted) or a glob pattern such as 'loans/*.anx'. Requires -d/--output-dir",
+        )
+        parser.add_argument(
+            "-d",
+            "--output-dir",
+            help="directory where batch mode writes one .json file per input (requires batch)",
+        )
+        parser.add_argument(
+            "-w",
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="number of worker processes used by batch mode. Defaults to the number of CPUs",
         )
         parser.add_argument(
             "-v",
             "--verbose",
             action="store_true",
-            help="print information about the conversion",
+            help="print information about the conversion. With -b/--batch, lists the answers left unused across the whole batch",
         )
         parser.add_argument(
             "-e",
@@ -40,17 +97,130 @@ def parse_arguments() -> argparse.Namespace:
             help="""specify which .anx answers should be excluded from verbose message (requires verbose). 
             This should be either:
                 - a path to a .txt file, where each line in the file is the name of an Answer element to be excluded, 
-                - multiple strings, where each string is the name of an Answer element""",
+                - multiple strings, where each string is the name of an Answer element.
+            Names are matched exactly. Names starting with 'glob:' are treated as glob patterns, and names starting with 're:' as regular
+            expressions""",
+        )
+        parser.add_argument(
+            "-p",
+            "--profile",
+            action="store_true",
+            help="also write a .profile.json report next to each output file, with the time, answer lookups, ids and output size of "
+            "each section of the conversion",
+        )
+        parser.add_argument(
+            "-c",
+            "--compact",
+            action="store_true",
+            help="write the output without indentation or spaces, which makes it roughly half the size",
+        )
+        parser.add_argument(
+            "--encoder",
+            choices=ENCODERS,
+            default="auto",
+            help="JSON encoder to write the output with. 'auto' (the default) uses orjson if it is installed, and the standard library's "
+            "json otherwise",
+        )
+        parser.add_argument(
+            "--stream-output",
+            action="store_true",
+            help="write each part of the output as soon as it has been converted, instead of building the whole document first",
+        )
+        parser.add_argument(
+            "-s",
+            "--stream",
+            action="store_true",
+            help="stream the input file and only keep the answers the converter reads, which keeps memory flat on very large .anx files",
+        )
+        parser.add_argument(
+            "--cache",
+            dest="cache_dir",
+            metavar="CACHE_DIR",
+            help="keep converted outputs in this folder, keyed by a hash of the input and the converter version, so a file converted "
+            "before is copied from there instead of being converted again. Not used for a single file with -v, or with stdin/stdout",
+        )
+        parser.add_argument(
+            "--cache-size",
+            type=int,
+            default=DEFAULT_CACHE_MB,
+            help="size limit of the --cache folder in MB, after which the least recently used outputs are deleted. Defaults to %(default)s",
+        )
+        parser.add_argument(
+            "--id-seed",
+            metavar="SEED",
+            help="derive every id$ from SEED and the place of its object in the output, instead of the time and random bytes, so that "
+            "converting the same file twice gives byte-identical output. Ids are then only unique within a document, unless each loan "
+            "gets its own seed",
+        )
+        parser.add_argument(
+            "--snapshot",
+            action="store_true",
+            help="also write a snapshot of the answers each part of the output was built from, next to the output file "
+            "(output.json -> output.snapshot.json), so that the next revision of the loan can be converted with --previous",
+        )
+        parser.add_argument(
+            "--previous",
+            metavar="PREVIOUS_JSON",
+            help="the output of an earlier revision of the same loan. The parts of the output whose answers haven't changed are copied "
+            "from it, and unchanged objects keep their ids. Reads the snapshot written next to it (see --snapshot), and writes a new one",
+        )
+        parser.add_argument(
+            "--previous-anx",
+            metavar="PREVIOUS_ANX",
+            help="the .anx file --previous was converted from, converted again to make up for a missing snapshot",
         )
         return parser
 
     parser = init_argparse()
     args = parser.parse_args()
 
+    # Validate that either a single input/output pair or a batch was provided, but not both
+    if args.batch is None:
+        if args.input is None or args.output is None:
+            parser.error("the following arguments are required: -i/--input, -o/--output (unless -b/--batch is provided)")
+        if args.output_dir is not None:
+            parser.error("argument -d/--output-dir: cannot appear unless argument -b/--batch is also provided")
+    else:
+        if args.input is not None or args.output is not None:
+            parser.error("argument -b/--batch: not allowed with arguments -i/--input or -o/--output")
+        if args.output_dir is None:
+            parser.error("argument -b/--batch: requires argument -d/--output-dir")
+    if args.workers < 1:
+        parser.error("argument -w/--workers: must be at least 1")
+
     # Validate that if exclude was provided, verbose must have also been provided
     if args.exclude is not None and args.verbose is False:
         parser.error("argument -e/--exclude: cannot appear unless argument -v/--verbose is also provided")
 
+    # Validate that stream and verbose weren't both provided, since streaming throws away the answers that verbose would report on
+    if args.stream and args.verbose:
+        parser.error("argument -s/--stream: not allowed with argument -v/--verbose")
+
+    # Validate that the cache isn't used while profiling, since a cached output has no conversion to profile
+    if args.cache_dir is not None and args.profile:
+        parser.error("argument --cache: not allowed with argument -p/--profile")
+    if args.cache_size < 1:
+        parser.error("argument --cache-size: must be at least 1")
+
+    # Validate that an incremental conversion is of a single file, and has what it needs from the previous revision
+    if args.previous_anx is not None and args.previous is None:
+        parser.error("argument --previous-anx: cannot appear unless argument --previous is also provided")
+    if args.previous is not None or args.snapshot:
+        option = "--snapshot" if args.previous is None else "--previous"
+        if args.batch is not None:
+            parser.error(f"argument {option}: not allowed with argument -b/--batch")
+        if args.cache_dir is not None:
+            parser.error(f"argument {option}: not allowed with argument --cache")
+    if args.previous is not None:
+        from incremental import snapshot_path
+
+        if not os.path.isfile(args.previous):
+            parser.error(f"argument --previous: can't open '{args.previous}'")
+        if os.path.abspath(args.previous) == os.path.abspath(args.output):
+            parser.error("argument --previous: must not be the -o/--output file")
+        if args.previous_anx is None and not os.path.isfile(snapshot_path(args.previous)):
+            parser.error(f"argument --previous: '{snapshot_path(args.previous)}' doesn't exist, so --previous-anx is required")
+
     # Validate that if exclude was a file path, the file exists and is a .txt file
     if args.exclude is not None and len(args.exclude) == 1:
         provided_file_path = args.exclude[0]
@@ -61,33 +231,378 @@ def parse_arguments() -> argparse.Namespace:
         # If it was a valid file, convert args.exclude to a list containing each line of the file as a string
         with open(provided_file_path, "r") as excludefile:
             args.exclude = [line.strip() for line in excludefile]
+    # Compiled now, so that a bad pattern is reported before converting anything rather than after
+    try:
+        args.exclusions = Exclusions(args.exclude)
+    except ValueError as e:
+        parser.error(f"argument -e/--exclude: {e}")
 
+    args.output_format = Output_Format(args.compact, args.encoder, args.stream_output)
+    args.cache = None
+    if args.cache_dir is not None:
+        from conversion_cache import Conversion_Cache
+
+        args.cache = Conversion_Cache(args.cache_dir, args.cache_size * 1024 * 1024)
     return args
 
 
 def main(args: argparse.Namespace):
-    writer = Knackly_Writer(ANX_Parser(args.input))
-    args.input.close()
-    writer.create()
+    from anx_parser import ANX_Parser
+    from incremental import Revision_Tracker, snapshot_path
+    from knackly_writer import Knackly_Writer, consumed_answer_names
+
+    if args.cache is not None and not args.verbose and args.input != "-" and args.output != "-":
+        # Converting by path, so the cache can copy a previous output over the output file instead
+        result = convert_file_with_coverage(
+            args.input,
+            args.output,
+            args.stream,
+            output_format=args.output_format,
+            coverage=False,
+            cache=args.cache,
+            id_seed=args.id_seed,
+        )
+        if result.error is not None:
+            raise SystemExit(f"Failed to convert {args.input}: {result.error}")
+        print(f"Success! Saved output to {output_name(args.output)}{' (from the cache)' if result.cached else ''}")
+        return
+
+    revision = None
+    if args.previous is not None:
+        revision = previous_revision(args.previous, args.previous_anx, args.id_seed)
+    elif args.snapshot:
+        revision = Revision_Tracker()
+
+    answer_names = consumed_answer_names() if args.stream else None
+    # stdin is read in binary too, for the same reason as -i/--input is
+    infile = sys.stdin.buffer if args.input == "-" else args.input
+    start = time.perf_counter()
+    writer = Knackly_Writer(ANX_Parser(infile, answer_names), profile=args.profile, revision=revision, id_seed=args.id_seed)
+    parsed = time.perf_counter()
+    timings = write_output(writer, args.output, args.output_format)
+    # With `-o -`, stdout holds the document, so that it can be piped into something that reads JSON. Everything else goes to stderr.
+    report = sys.stderr if args.output == "-" else sys.stdout
+    print(f"Success! Saved output to {output_name(args.output)}", file=report)
 
-    json.dump(writer.json, args.output, indent=2)
-    print(f"Success! Saved output to {os.path.abspath(args.output.name)}")
-    args.output.close()
+    if revision is not None:
+        revision.save(snapshot_path(args.output))
+        print(f"Saved snapshot to {os.path.abspath(snapshot_path(args.output))}", file=report)
+        if args.previous is not None:
+            print(f"Copied {len(revision.reused)} of {len(revision.sections)} sections from {args.previous}", file=report)
+
+    if args.profile:
+        timings = {"parse_ms": parsed - start, **timings}
+        report_path = write_profile(writer, args.input, args.output, timings)
+        print(f"Saved profile to {os.path.abspath(report_path)}", file=report)
 
     if args.verbose:
-        print("\n--- UNUSED ELEMENTS ---")
+        print("\n--- UNUSED ELEMENTS ---", file=report)
 
-        unvisited_elements = writer.anx.get_unvisited_elements(args.exclude)
+        unvisited_elements = writer.anx.get_unvisited_elements(args.exclusions)
         for idx, e in enumerate(unvisited_elements, start=1):
-            print(idx, e.get("name"))
+            print(idx, e.name, file=report)
+
+
+def previous_revision(previous_path: str, previous_anx_path: str = None, id_seed: str = None) -> Revision_Tracker:
+    """Load the output of an earlier revision of a loan, for converting the current revision against it.
+
+    Args:
+        previous_path (str): Path of the earlier revision's .json file.
+        previous_anx_path (str, optional): Path of the .anx file it was converted from. Only used if there is no snapshot next to
+            `previous_path`, in which case it is converted again to make one. Defaults to None.
+        id_seed (str, optional): The seed for deterministic ids that the current revision is converted with. Defaults to None.
+
+    Returns:
+        Revision_Tracker: The tracker to pass to `Knackly_Writer`.
+    """
+    from anx_parser import ANX_Parser
+    from incremental import Revision_Tracker, snapshot_path
+    from knackly_writer import Knackly_Writer
+
+    if os.path.isfile(snapshot_path(previous_path)) or previous_anx_path is None:
+        return Revision_Tracker.load(previous_path, snapshot_path(previous_path))
+
+    recorded = Revision_Tracker()
+    writer = Knackly_Writer(ANX_Parser(previous_anx_path), revision=recorded, id_seed=id_seed)
+    writer.create()
+    return Revision_Tracker.from_conversion(Revision_Tracker.load(previous_path).document, writer.json, recorded)
+
+
+def output_name(output_path: str) -> str:
+    """Describe where the output went, for the messages printed once it's saved."""
+    return "stdout" if output_path == "-" else os.path.abspath(output_path)
+
+
+def create_and_write(writer: Knackly_Writer, outfile, output_format: Output_Format) -> dict[str, float]:
+    """Run `writer.create()` and write the document to `outfile`, streaming it section by section if `output_format.stream` is set.
+
+    Returns:
+        dict[str, float]: Seconds spent in `create()` ("create_ms") and writing ("write_ms"). When streaming, most of the writing happens
+        inside `create()`.
+    """
+    start = time.perf_counter()
+    if output_format.stream:
+        output = Object_Stream(outfile, output_format)
+        writer.create(output)
+        created = time.perf_counter()
+        output.close()
+    else:
+        writer.create()
+        created = time.perf_counter()
+        write_json(writer.json, outfile, output_format)
+    return {"create_ms": created - start, "write_ms": time.perf_counter() - created}
+
+
+def write_output(writer: Knackly_Writer, output_path: str, output_format: Output_Format) -> dict[str, float]:
+    """Run `create_and_write()` to `output_path`, or to stdout if it is "-".
+
+    A file is written under a temporary name and only renamed over `output_path` once it's complete, since a streamed output is written
+    while the conversion is still running, and encoding can fail as well. A failed conversion leaves an existing output file as it was.
+
+    Returns:
+        dict[str, float]: The timings of `create_and_write()`.
+    """
+    if output_path == "-":
+        return create_and_write(writer, sys.stdout, output_format)
+
+    partial_path = f"{output_path}.part"
+    try:
+        with open(partial_path, "wb") as outfile:
+            timings = create_and_write(writer, outfile, output_format)
+        os.replace(partial_path, output_path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    return timings
+
+
+def profile_path(output_path: str) -> str:
+    """Get the path of the profile report written alongside an output file, e.g. `loan.json` -> `loan.profile.json`."""
+    if output_path == "-":
+        # Writing to stdout, so put the report in the current directory instead
+        return "anx2json.profile.json"
+    return f"{os.path.splitext(output_path)[0]}.profile.json"
+
+
+def write_profile(writer: Knackly_Writer, input_path: str, output_path: str, timings: dict[str, float]) -> str:
+    """Write the profile report of a conversion next to its output file.
+
+    Args:
+        writer (Knackly_Writer): The writer, created with `profile=True`, after `create()` has run.
+        input_path (str): Path of the .anx file.
+        output_path (str): Path of the .json file.
+        timings (dict[str, float]): Seconds spent in each stage of the conversion (reading, `create()`, writing), keyed by name.
+
+    Returns:
+        str: The path of the report.
+    """
+    report = {
+        "input": input_path,
+        "output": output_path,
+        **{stage: round(seconds * 1000, 3) for stage, seconds in timings.items()},
+        **writer.profile_report(),
+    }
+    report_path = profile_path(output_path)
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    return report_path
+
+
+class Conversion_Result(NamedTuple):
+    error: str | None  # A description of the error if the conversion failed, otherwise None
+    summary: dict | None  # The coverage summary (see `ANX_Parser.coverage_summary()`), if it was asked for and the conversion succeeded
+    cached: bool = False  # Whether the output was copied from the cache instead of being converted
+
+
+def convert_file(
+    input_path: str,
+    output_path: str,
+    stream: bool = False,
+    profile: bool = False,
+    output_format: Output_Format = Output_Format(),
+    cache: Conversion_Cache = None,
+    id_seed: str = None,
+) -> str | None:
+    """Convert a single .anx file to a Knackly .json file.
+
+    The output file is only written once the conversion has succeeded, so a failed file never leaves a partial .json behind.
+
+    Args:
+        input_path (str): Path to the .anx file.
+        output_path (str): Path where the .json file should be written.
+        stream (bool, optional): Whether to use `ANX_Parser`'s streaming mode. Defaults to False.
+        profile (bool, optional): Whether to also write a profile report next to the output, see `write_profile()`. Defaults to False.
+        output_format (Output_Format, optional): How to write the output. Defaults to indented JSON, written once it's complete.
+        cache (Conversion_Cache, optional): Where to look for the output of an identical earlier conversion, and to store this one.
+            Not used when profiling. Defaults to None.
+        id_seed (str, optional): Derive the ids from this seed and where each object is in the document, instead of generating them
+            (see `object_ids.Id_Allocator`). Defaults to None.
+
+    Returns:
+        str | None: A description of the error if the conversion failed, otherwise None.
+    """
+    return convert_file_with_coverage(
+        input_path, output_path, stream, profile, output_format, coverage=False, cache=cache, id_seed=id_seed
+    ).error
+
+
+def convert_file_with_coverage(
+    input_path: str,
+    output_path: str,
+    stream: bool = False,
+    profile: bool = False,
+    output_format: Output_Format = Output_Format(),
+    coverage: bool = True,
+    cache: Conversion_Cache = None,
+    id_seed: str = None,
+) -> Conversion_Result:
+    """Convert a single .anx file like `convert_file()`, and also summarize which of its answers were used. This is what each batch
+    worker runs.
+
+    Args:
+        coverage (bool, optional): Whether to summarize the answers, see `ANX_Parser.coverage_summary()`. Defaults to True.
+
+    Returns:
+        Conversion_Result: The error if the conversion failed, the coverage summary, and whether the output came from the cache.
+    """
+    from anx_parser import ANX_Parser
+    from knackly_writer import Knackly_Writer, consumed_answer_names
+
+    try:
+        key = None
+        if cache is not None and not profile:
+            key = cache.key(input_path, output_format, id_seed)
+            cached, summary = cache.fetch(key, output_path, coverage)
+            if cached:
+                return Conversion_Result(None, summary, cached=True)
+
+        answer_names = consumed_answer_names() if stream else None
+        start = time.perf_counter()
+        writer = Knackly_Writer(ANX_Parser(input_path, answer_names), profile=profile, id_seed=id_seed)
+        parsed = time.perf_counter()
+        timings = write_output(writer, output_path, output_format)
+
+        if profile:
+            write_profile(writer, input_path, output_path, {"parse_ms": parsed - start, **timings})
+    except Exception as e:
+        # Exceptions are turned into strings here, since not every exception survives being sent back from a worker process
+        return Conversion_Result(f"{type(e).__name__}: {e}", None)
+
+    summary = writer.anx.coverage_summary() if coverage or key is not None else None
+    if key is not None:
+        try:
+            # The summary is always stored, so that a later batch with -v can be served from the cache too
+            cache.store(key, output_path, summary)
+        except OSError as e:
+            # The output has been written, so a full or unwritable cache folder shouldn't fail the conversion
+            print(f"Couldn't add {output_path} to the cache: {e}")
+    return Conversion_Result(None, summary if coverage else None)
+
+
+def find_batch_inputs(patterns: list[str]) -> list[str]:
+    """Expand the values given to -b/--batch into a list of .anx file paths.
+
+    Args:
+        patterns (list[str]): Directories and/or glob patterns.
+
+    Returns:
+        list[str]: Every matching file, in sorted order within each pattern, without duplicates.
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "*.anx"))
+        else:
+            matches = glob.glob(pattern)
+        paths.extend(path for path in sorted(matches) if os.path.isfile(path))
+
+    return list(dict.fromkeys(paths))
+
+
+def batch(args: argparse.Namespace):
+    """Convert every file matched by `args.batch` across a pool of worker processes, writing one .json per input into `args.output_dir`.
+
+    A file that fails to convert is reported at the end, and does not stop the rest of the batch. With `args.verbose`, the answers left
+    unused are also reported, added up across every file that converted.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    input_paths = find_batch_inputs(args.batch)
+    if not input_paths:
+        print("No .anx files matched the provided -b/--batch values")
+        return
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    jobs = {}  # output path -> input path
+    failures = []  # (input path, error)
+    coverage = Batch_Coverage()
+    for input_path in input_paths:
+        base_name = os.path.splitext(os.path.basename(input_path))[0]
+        output_path = os.path.join(args.output_dir, f"{base_name}.json")
+        if output_path in jobs:
+            failures.append((input_path, f"Same output file as {jobs[output_path]}"))
+        else:
+            jobs[output_path] = input_path
+
+    workers = min(args.workers, len(jobs))
+    converted = 0
+    cached = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                convert_file_with_coverage,
+                input_path,
+                output_path,
+                args.stream,
+                args.profile,
+                args.output_format,
+                args.verbose,
+                args.cache,
+                args.id_seed,
+            ): input_path
+            for output_path, input_path in jobs.items()
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            if result.error is not None:
+                failures.append((futures[future], result.error))
+                continue
+            if result.summary is not None:
+                coverage.add(result.summary)
+            converted += 1
+            cached += result.cached
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"Converted {converted} of {len(input_paths)} files into {os.path.abspath(args.output_dir)} "
+        f"in {elapsed:.2f}s ({len(jobs) / elapsed:.1f} files/sec, {workers} workers)"
+    )
+    if args.cache is not None:
+        print(f"{cached} of them were copied from the cache in {os.path.abspath(args.cache.folder)}")
+    if failures:
+        print(f"\n--- FAILED FILES ({len(failures)}) ---")
+        for idx, (input_path, error) in enumerate(sorted(failures), start=1):
+            print(idx, input_path, error)
+
+    if args.verbose:
+        print(f"\n--- UNUSED ELEMENTS (across {coverage.files} files) ---")
+        for idx, (name, unused, present) in enumerate(coverage.unused_answers(args.exclusions), start=1):
+            print(idx, name, f"(unused in {unused} of {present} files)")
 
 
 def test(args: argparse.Namespace):
+    from anx_parser import ANX_Parser
+
     print(args)
     anx_parser = ANX_Parser(args.input)
 
 
 if __name__ == "__main__":
     args = parse_arguments()
-    main(args)
+    if args.batch is not None:
+        batch(args)
+    else:
+        main(args)
     # test(args)
@@ -0,0 +1,159 @@
+"""ObjectId-compatible ids for the "id$" keys of the Knackly output, without going through `bson`.
+
+An id is 24 hex characters, laid out the same way as a MongoDB ObjectId:
+
+- 4 bytes: seconds since the epoch
+- 5 bytes: random, picked once per process (and again in a forked child, so worker processes never share them)
+- 3 bytes: a counter, starting from a random value in each process and wrapping around at 2**24
+
+The counter is reserved in blocks, so producing thousands of ids only takes the lock a handful of times.
+
+An `Id_Allocator` with a seed derives every id from the seed and the path of its object in the document instead (see `path_id()`), so
+converting the same input twice gives the same ids, and byte-identical output. Those ids are still 24 hex characters, but their first
+4 bytes are not a timestamp.
+"""
+
+import hashlib
+import os
+import random
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+BLOCK_SIZE = 256  # How many counter values `Id_Allocator` reserves at a time
+
+_lock = threading.Lock()
+_process_hex = ""
+_counter = 0
+
+
+def _reseed() -> None:
+    global _lock, _process_hex, _counter
+    _process_hex = os.urandom(5).hex()
+    _counter = random.randint(0, 0xFFFFFF)
+    # A lock held by another thread at fork time would never be released in the child
+    _lock = threading.Lock()
+
+
+_reseed()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed)
+
+
+def new_object_ids(count: int) -> list[str]:
+    """Generate `count` new ids, all sharing the current timestamp.
+
+    Args:
+        count (int): How many ids to generate.
+
+    Returns:
+        list[str]: The ids, as 24 character hex strings.
+    """
+    global _counter
+    with _lock:
+        first = _counter
+        _counter = (_counter + count) & 0xFFFFFF
+        prefix = f"{int(time.time()) & 0xFFFFFFFF:08x}{_process_hex}"
+    return [f"{prefix}{(first + i) & 0xFFFFFF:06x}" for i in range(count)]
+
+
+def new_object_id() -> str:
+    """Generate a single new id. Equivalent to `str(bson.ObjectId())`."""
+    global _counter
+    with _lock:
+        value = _counter
+        _counter = (value + 1) & 0xFFFFFF
+    return f"{int(time.time()) & 0xFFFFFFFF:08x}{_process_hex}{value:06x}"
+
+
+def path_id(seed: str, path: str) -> str:
+    """Derive an id from a seed and the path of an object in the document, for example `/Borrower/0`.
+
+    Returns:
+        str: The first 12 bytes of a BLAKE2b hash of both, as 24 hex characters.
+    """
+    return hashlib.blake2b(f"{seed}\0{path}".encode(), digest_size=12).hexdigest()
+
+
+def child_path(path: str, key: str | int) -> str:
+    """Get the path of a key or list index under `path`, escaped like a JSON pointer so that no two places share a path."""
+    if isinstance(key, str):
+        key = key.replace("~", "~0").replace("/", "~1")
+    return f"{path}/{key}"
+
+
+class Lazy_Id:
+    """Placeholder for an id that is only generated if it makes it into the final output. See `Id_Allocator`."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = None
+
+    def __repr__(self) -> str:
+        return f"Lazy_Id({self.value!r})"
+
+
+class Id_Allocator:
+    """Hands out `Lazy_Id` placeholders while a document is being built, and turns the ones that survive clean up into real ids.
+
+    Most of the dictionaries built by `Knackly_Writer` are thrown away by clean up (an address nobody filled in is just an "id$"),
+    so ids are only generated for placeholders that are still in the tree when `resolve()` is called. The same placeholder can be
+    referenced from several places (see `Knackly_Writer.uuid_map`), and every reference ends up with the same id.
+
+    With a `seed`, a placeholder's id is derived from the seed and the path where it is resolved: the object's own path for its "id$",
+    or the path of the first reference to it if the object itself didn't survive clean up.
+    """
+
+    def __init__(self, seed: str = None):
+        self.seed = seed
+        self.requested = 0  # Placeholders handed out
+        self.allocated = 0  # Real ids generated for them
+        self.block: Iterator[str] = iter(())  # Ids reserved but not handed out yet
+
+    def new(self) -> Lazy_Id:
+        """Get a placeholder for a new id."""
+        self.requested += 1
+        return Lazy_Id()
+
+    def next_id(self) -> str:
+        """Generate a real id, reserving another block of them when the current one runs out."""
+        value = next(self.block, None)
+        if value is None:
+            self.block = iter(new_object_ids(BLOCK_SIZE))
+            value = next(self.block)
+        self.allocated += 1
+        return value
+
+    def root_path(self) -> str | None:
+        """Get the path of the document itself, to start resolving from. None if ids aren't derived from paths (there is no seed)."""
+        return None if self.seed is None else ""
+
+    def resolve(self, data: Any, path: str = None) -> Any:
+        """Replace every placeholder in a tree of dictionaries and lists with its id, in place.
+
+        Args:
+            data (Any): The tree, or a single value.
+            path (str, optional): Where `data` is in the document, see `root_path()`. Required with a seed. Defaults to None.
+
+        Returns:
+            Any: The same tree (or the id, if `data` was a placeholder).
+        """
+        if isinstance(data, Lazy_Id):
+            if data.value is None and self.seed is None:
+                data.value = self.next_id()
+            elif data.value is None:
+                self.allocated += 1
+                data.value = path_id(self.seed, path)
+            return data.value
+        elif isinstance(data, dict):
+            for key, value in data.items():
+                if isinstance(value, (dict, list, Lazy_Id)):
+                    # An object's own id belongs to the object's path
+                    data[key] = self.resolve(value, path if path is None or key == "id$" else child_path(path, key))
+        elif isinstance(data, list):
+            for i, value in enumerate(data):
+                if isinstance(value, (dict, list, Lazy_Id)):
+                    data[i] = self.resolve(value, None if path is None else child_path(path, i))
+        return data
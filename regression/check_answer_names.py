@@ -0,0 +1,81 @@
+"""Check that `field_mapping.WRITER_ANSWER_NAMES` lists every answer name written out in the source of `knackly_writer`.
+
+`ANX_Parser`'s streaming mode (-s) throws away every answer that isn't in `knackly_writer.consumed_answer_names()`, so a name that is
+read by the writer but missing from `WRITER_ANSWER_NAMES` is silently left out of the output. The names are collected from the string
+literals passed to `find_answer`, `parse_field` and `parse_multiple`. The script exits with status 1, listing the differences, when the
+constant doesn't match them. With `--update`, the constant in field_mapping.py is rewritten instead.
+
+Run it after changing which answers `Knackly_Writer` reads.
+
+Usage:
+    python regression/check_answer_names.py [--update]
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from field_mapping import WRITER_ANSWER_NAMES  # noqa: E402
+
+WRITER_PATH = os.path.join(ROOT, "knackly_writer.py")
+FIELD_MAPPING_PATH = os.path.join(ROOT, "field_mapping.py")
+LOOKUP_METHODS = {"find_answer", "parse_field", "parse_multiple"}
+# The constant, from its first line to its closing parenthesis
+CONSTANT = re.compile(r"^WRITER_ANSWER_NAMES = frozenset\(\n.*?^\)\n", re.DOTALL | re.MULTILINE)
+
+
+def source_answer_names(source: bytes) -> list[str]:
+    """Collect the answer names written out in the source of `knackly_writer`."""
+    names = set()
+
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr in LOOKUP_METHODS:
+            names.update(arg.value for arg in node.args if isinstance(arg, ast.Constant) and isinstance(arg.value, str))
+
+    return sorted(names)
+
+
+def constant_source(names: list[str]) -> str:
+    """Write out the constant, one name per line."""
+    return "WRITER_ANSWER_NAMES = frozenset(\n    (\n" + "".join(f"        {json.dumps(name)},\n" for name in names) + "    )\n)\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that field_mapping.WRITER_ANSWER_NAMES matches the source of knackly_writer.")
+    parser.add_argument("--update", action="store_true", help="rewrite the constant in field_mapping.py instead of checking it")
+    args = parser.parse_args()
+
+    with open(WRITER_PATH, "rb") as f:
+        names = source_answer_names(f.read())
+
+    if args.update:
+        with open(FIELD_MAPPING_PATH, "r", encoding="UTF-8") as f:
+            source = f.read()
+        source, replaced = CONSTANT.subn(lambda _: constant_source(names), source)
+        if replaced != 1:
+            sys.exit(f"Couldn't find WRITER_ANSWER_NAMES in {FIELD_MAPPING_PATH}")
+        with open(FIELD_MAPPING_PATH, "w", encoding="UTF-8") as f:
+            f.write(source)
+        print(f"Wrote {len(names)} answer names to field_mapping.WRITER_ANSWER_NAMES")
+        return
+
+    missing = sorted(set(names).difference(WRITER_ANSWER_NAMES))
+    unused = sorted(WRITER_ANSWER_NAMES.difference(names))
+    if missing or unused:
+        for name in missing:
+            print(f"Read by knackly_writer, but missing from WRITER_ANSWER_NAMES: {name}")
+        for name in unused:
+            print(f"In WRITER_ANSWER_NAMES, but no longer read by knackly_writer: {name}")
+        print("\nfield_mapping.WRITER_ANSWER_NAMES is out of date. Run `python regression/check_answer_names.py --update`.")
+        sys.exit(1)
+    print(f"field_mapping.WRITER_ANSWER_NAMES is up to date ({len(names)} answer names)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Check that the converter's output hasn't changed, against a corpus of .anx files and the JSON each one is expected to convert to.
+
+`regression/corpus` holds small answer sets of different shapes (one to six borrowers, no to three levels of signers, with and
+without properties, lenders and fees) generated with `benchmarks/anx_generator.py`, along with a few edge cases:
+
+- `gated_stray_answers.anx`: answers of the variable rate section that can't be parsed, left over on a fixed rate loan
+- `integer_beyond_64_bits.anx`: a NumValue that orjson can't encode
+- `utf16.anx`: `minimal.anx`, saved as UTF-16
+
+Each file is converted the way `main.py` converts it, with `--id-seed`, so that the ids are the same on every run, and with the
+standard library's json encoder (which is what the output looked like before orjson). It is converted three times: as is, with `-s`
+and with `--stream-output`, and all three have to be byte-identical to the expected .json file next to it. The expected files were
+checked against the converter as it was before the output cleanup was rewritten into a single pass, which gave the same documents
+apart from the ids.
+
+After a change that is meant to change the output, look at the differences this reports, then rewrite the expected files with
+`--update`.
+
+Usage:
+    python regression/check_outputs.py [--update]
+"""
+
+import argparse
+import difflib
+import glob
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from json_output import Output_Format  # noqa: E402
+from main import convert_file  # noqa: E402
+
+CORPUS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+ID_SEED = "regression"
+MODES = {
+    "default": {},
+    "-s": {"stream": True},
+    "--stream-output": {"output_format": Output_Format(encoder="json", stream=True)},
+}
+
+
+def convert(input_path: str, output_path: str, options: dict) -> bytes:
+    options = {"output_format": Output_Format(encoder="json"), **options}
+    error = convert_file(input_path, output_path, id_seed=ID_SEED, **options)
+    if error is not None:
+        raise RuntimeError(f"Failed to convert {input_path}: {error}")
+    with open(output_path, "rb") as f:
+        return f.read()
+
+
+def first_difference(expected: bytes, output: bytes) -> str:
+    """Describe the first lines that differ between two outputs."""
+    lines = difflib.unified_diff(
+        expected.decode().splitlines(), output.decode().splitlines(), "expected", "output", n=1, lineterm=""
+    )
+    return "\n".join(line for _, line in zip(range(12), lines))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the converter's output against the expected output of the regression corpus.")
+    parser.add_argument("--update", action="store_true", help="rewrite the expected .json files instead of comparing against them")
+    args = parser.parse_args()
+
+    input_paths = sorted(glob.glob(os.path.join(CORPUS_FOLDER, "*.anx")))
+    failures = 0
+    with tempfile.TemporaryDirectory() as folder:
+        for input_path in input_paths:
+            name = os.path.splitext(os.path.basename(input_path))[0]
+            expected_path = os.path.join(CORPUS_FOLDER, f"{name}.json")
+            output_path = os.path.join(folder, f"{name}.json")
+
+            if args.update:
+                with open(expected_path, "wb") as f:
+                    f.write(convert(input_path, output_path, MODES["default"]))
+                print(f"Updated {os.path.relpath(expected_path)}")
+                continue
+
+            with open(expected_path, "rb") as f:
+                expected = f.read()
+            for mode, options in MODES.items():
+                try:
+                    output = convert(input_path, output_path, options)
+                except RuntimeError as e:
+                    failures += 1
+                    print(f"FAIL {name} ({mode}): {e}")
+                    continue
+                if output != expected:
+                    failures += 1
+                    print(f"FAIL {name} ({mode}): the output is different\n{first_difference(expected, output)}")
+
+    if args.update:
+        return
+    if failures:
+        print(f"\n{failures} of {len(input_paths) * len(MODES)} conversions didn't give the expected output")
+        sys.exit(1)
+    print(f"All {len(input_paths)} files gave the expected output, in each of: {', '.join(MODES)}")
+
+
+if __name__ == "__main__":
+    main()